@@ -1,66 +1,107 @@
 import os
+import math
+import time
 import uuid
 import json
+import asyncio
 import logging
+from typing import Optional
+from contextlib import asynccontextmanager
 
 import google.cloud.logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Response
 from dotenv import load_dotenv
 from google.genai import types
+from google.adk.apps import App
 from google.adk.runners import Runner
-from fastapi.responses import JSONResponse
-from google.adk.sessions import InMemorySessionService
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from fastapi.responses import JSONResponse, StreamingResponse
 
 
 
-from src.schema import File_Inputs
-from src.agents import root_agent
+from src.schema import File_Inputs, Batch_Inputs, Job_Inputs
+from src.agents import root_agent, batch_jd_agent
+from src.tools import list_resume_files, iter_texts_from_gcs, SUPPORTED_RESUME_EXTENSIONS
+from src.session_store import BoundedSessionService
+from src.custom_agents import drain_pending_saves, parse_state_value, MERGE_CONTEXT_KEYS
+from src.cache import jd_cache, resume_cache
+from src.parser_pool import parser_pool, extract_text_from_file_async
+from src.bigquery_writer import bigquery_writer
+from src.sinks import result_sink
+from src.job_queue import JobQueue, JobRunner
+from src.instrumentation import pipeline_metrics
+from src.llm_cache import llm_response_cache, BYPASS_STATE_KEY
+from src.model_client import model_limiter, ModelUnavailableError, is_transient_error
+from src.triage import triage, TRIAGE_TOP_K, TRIAGE_MIN_SCORE
 
 
 
 
 # --- 1. Environment Setup & Logging ---
 load_dotenv()
-cloud_logging_client = google.cloud.logging.Client()
-cloud_logging_client.setup_logging()
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+try:
+    cloud_logging_client = google.cloud.logging.Client()
+    cloud_logging_client.setup_logging()
+except Exception as e:
+    # No GCP credentials (local runs, offline benchmarks): keep local logging.
+    logger.warning(f"Cloud Logging unavailable, using local logging: {e}")
+logging.basicConfig(level=logging.INFO)
 
 
 
-SESSION_FILE = "session_ids.json"
-
-
-
-def load_or_create_session_ids():
-    if os.path.exists(SESSION_FILE):
-        try:
-            with open(SESSION_FILE, "r") as f:
-                data = json.load(f)
-                logger.info("Loaded session IDs from file.")
-                return data["USER_ID"], data["SESSION_ID_TOOL_AGENT"]
-        except Exception as e:
-            logger.warning(f"Failed to load session IDs, generating new ones. Error: {e}")
-    # If file doesn't exist or fails to load, generate new IDs
-    user_id = str(uuid.uuid4())
-    session_id = str(uuid.uuid4())
-    with open(SESSION_FILE, "w") as f:
-        json.dump({"USER_ID": user_id, "SESSION_ID_TOOL_AGENT": session_id}, f)
-    logger.info("Generated new session IDs and saved to file.")
-    return user_id, session_id
-
 # --- 2. Constants ---
 APP_NAME = "HR_SYSTEM_AGENT"
-USER_ID, SESSION_ID_TOOL_AGENT = load_or_create_session_ids()
+USER_ID = os.getenv("USER_ID", "hr_api_user")
 MODEL_NAME = os.getenv("MODEL", "gemini-2.0-flash")
+MAX_CONCURRENT_PIPELINES = int(os.getenv("MAX_CONCURRENT_PIPELINES", "16"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+# State keys streamed by /multi_agent_call/stream, roughly in pipeline order.
+STREAM_STATE_KEYS = ["extracted_text", "jd_json", *MERGE_CONTEXT_KEYS, "save_context"]
 
 # --- 3. Session Management & Runner ---
-session_service = InMemorySessionService()
+session_service = BoundedSessionService()
+# pipeline_metrics times every agent, model and tool call (see src/instrumentation.py);
+# llm_response_cache replays temperature-0 model responses (see src/llm_cache.py).
 agent_runner = Runner(
-    agent=root_agent,
-    app_name=APP_NAME,
+    app=App(name=APP_NAME, root_agent=root_agent, plugins=[pipeline_metrics, llm_response_cache]),
+    session_service=session_service
+)
+jd_runner = Runner(
+    app=App(name=APP_NAME, root_agent=batch_jd_agent, plugins=[pipeline_metrics, llm_response_cache]),
     session_service=session_service
 )
+pipeline_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PIPELINES)
+
+
+@asynccontextmanager
+async def request_session(initial_state: dict):
+    """
+    Creates a short-lived session seeded with the request inputs and deletes it
+    once the caller is done, so concurrent requests never share state. The
+    session is exempt from eviction while the caller uses it.
+    """
+    session = await session_service.create_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        state=initial_state,
+        session_id=str(uuid.uuid4())
+    )
+    session_service.mark_active(APP_NAME, USER_ID, session.id)
+    try:
+        yield session
+    finally:
+        session_service.mark_idle(APP_NAME, USER_ID, session.id)
+        try:
+            await session_service.delete_session(
+                app_name=APP_NAME,
+                user_id=USER_ID,
+                session_id=session.id
+            )
+        except Exception:
+            logger.exception(f"Failed to delete session {session.id}")
+
 
 # --- 4. Utility Functions ---
 def extract_json_from_code_block(text: str) -> str:
@@ -72,6 +113,27 @@ def extract_json_from_code_block(text: str) -> str:
         return text
     return text.replace("```json", "").replace("```", "")
 
+
+def llm_cache_state(llm_cache: Optional[str]) -> dict:
+    """
+    Session state for the X-LLM-Cache request header: "bypass" skips cached
+    model responses (fresh ones still replace them).
+    """
+    return {BYPASS_STATE_KEY: True} if (llm_cache or "").strip().lower() == "bypass" else {}
+
+
+def model_unavailable_response(error: ModelUnavailableError) -> JSONResponse:
+    """
+    503 with Retry-After for quota exhaustion or an open model circuit, so
+    clients back off instead of treating it as a server bug.
+    """
+    retry_after = math.ceil(error.retry_after)
+    return JSONResponse(
+        content={"error": str(error), "retry_after": retry_after},
+        status_code=503,
+        headers={"Retry-After": str(retry_after)},
+    )
+
 # --- 5. FastAPI App Setup ---
 app = FastAPI(
     title="HR Resume Multi-Agent API",
@@ -79,70 +141,413 @@ app = FastAPI(
     version="1.0.0"
 )
 
+async def run_screening_job(payload: dict) -> dict:
+    """
+    Job queue handler: runs one queued screening request through the pipeline.
+    """
+    response, _stored_output, _timings = await run_pipeline(payload)
+    return parse_agent_response(response)
+
+
+# Opened on startup so importing the app does not create the queue database.
+job_queue: Optional[JobQueue] = None
+job_runner: Optional[JobRunner] = None
+
+
 @app.on_event("startup")
 async def startup_event():
-    await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        session_id=SESSION_ID_TOOL_AGENT
-    )
-    logger.info("Session created on startup.")
+    global job_queue, job_runner
+    job_queue = JobQueue()
+    job_runner = JobRunner(job_queue, run_screening_job, is_transient=is_transient_error)
+    job_runner.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Jobs still running go back to the queue and resume on the next start.
+    await job_runner.stop()
+    await asyncio.to_thread(job_queue.close)
+    await drain_pending_saves()
+    await asyncio.to_thread(result_sink.close)
+    await asyncio.to_thread(bigquery_writer.close)
+    if llm_response_cache.store is not None:
+        await asyncio.to_thread(llm_response_cache.store.close)
+    parser_pool.shutdown()
+
+
+async def pipeline_events(inputs: dict, state: Optional[dict] = None):
+    """
+    Runs the multi-agent pipeline for one request in its own session and
+    yields every ADK event as it is produced.
+    Extra state (e.g. a pre-parsed jd_json) is seeded alongside the inputs.
+    """
+    query_json = json.dumps(inputs)
+    user_content = types.Content(role='user', parts=[types.Part(text=query_json)])
+
+    async with pipeline_semaphore:
+        async with request_session({**inputs, **(state or {})}) as session:
+            try:
+                async for event in agent_runner.run_async(
+                    user_id=USER_ID,
+                    session_id=session.id,
+                    new_message=user_content
+                ):
+                    yield event
+            except ModelUnavailableError as e:
+                logger.warning(f"Model unavailable during agent run_async: {e}")
+                raise
+            except Exception as e:
+                logger.exception("Error during agent run_async")
+                raise RuntimeError(f"Agent execution failed: {e}")
+            logger.info("Agent run completed.")
+
+
+async def run_pipeline(inputs: dict, state: Optional[dict] = None):
+    """
+    Runs the multi-agent pipeline for one request in its own session.
+    Returns the final response text, the stored root agent output and the
+    per-agent timing breakdown.
+    """
+    final_response_content = "No final response received."
+    stored_output = None
+    invocation_id = None
+    async for event in pipeline_events(inputs, state):
+        invocation_id = event.invocation_id
+        if event.is_final_response() and event.content and event.content.parts:
+            final_response_content = event.content.parts[0].text
+        if event.actions and root_agent.output_key in event.actions.state_delta:
+            stored_output = event.actions.state_delta[root_agent.output_key]
+    timings = pipeline_metrics.pop_timings(invocation_id) if invocation_id else None
+    return final_response_content, stored_output, timings
+
+
+def sse_event(event: str, data) -> str:
+    """
+    Formats one server-sent event; data is JSON-encoded on a single line.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def parse_agent_response(response: str) -> dict:
+    """
+    Parses the final pipeline response and returns the saved context.
+    Falls back to escaping stray backslashes for hand-written model output.
+    """
+    response2 = extract_json_from_code_block(response)
+    try:
+        response_1 = json.loads(response2)
+    except ValueError:
+        response_1 = json.loads(response2.replace('\\', '\\\\'))
+    logger.info("Agent response parsed successfully.")
+    return response_1.get("save_context_to_json_response", {})
+
+
+async def parse_job_description(job_description: dict, state: Optional[dict] = None):
+    """
+    Parses a job description once with the standalone JD agent and returns jd_json.
+    """
+    user_content = types.Content(role='user', parts=[types.Part(text=json.dumps({"job_description": job_description}))])
+    async with request_session({"job_description": job_description, **(state or {})}) as session:
+        async for _event in jd_runner.run_async(
+            user_id=USER_ID,
+            session_id=session.id,
+            new_message=user_content
+        ):
+            pass
+        current_session = await session_service.get_session(
+            app_name=APP_NAME,
+            user_id=USER_ID,
+            session_id=session.id
+        )
+        return current_session.state.get(batch_jd_agent.output_key)
+
+
+async def resolve_profile_paths(request: Batch_Inputs):
+    """
+    Collects resume paths from the explicit list, a local directory and a GCS
+    prefix. Returns (profile_paths, texts): GCS resumes are downloaded and
+    extracted concurrently in memory (iter_texts_from_gcs), listed as
+    gs://bucket/name and their text is returned in texts; blobs that failed
+    keep an "Error: ..." text.
+    """
+    profile_paths = list(request.profile_paths)
+    if request.profile_dir:
+        profile_paths.extend(list_resume_files(request.profile_dir))
+    texts = {}
+    if request.gcs_bucket:
+        blobs = await asyncio.to_thread(lambda: list(iter_texts_from_gcs(
+            request.gcs_bucket,
+            request.gcs_prefix or "",
+            os.getenv("GCS_SERVICE_ACCOUNT_JSON"),
+            archive_prefix=None,
+            extensions=SUPPORTED_RESUME_EXTENSIONS,
+        )))
+        for name, text in blobs:
+            path = f"gs://{request.gcs_bucket}/{name}"
+            profile_paths.append(path)
+            texts[path] = text
+    return profile_paths, texts
+
 
 @app.post("/multi_agent_call", summary="Process resume using multi-agent workflow")
-async def process_resume_multi_agent(request: File_Inputs):
-    query_json = json.dumps(request.dict())
-    result = {}
+async def process_resume_multi_agent(
+    request: File_Inputs,
+    debug: bool = False,
+    llm_cache: Optional[str] = Header(None, alias="X-LLM-Cache"),
+):
+    """
+    Runs the pipeline for one resume. With ?debug=true the response also holds
+    a per-agent breakdown of wall time, model calls, tokens and tool durations.
+    The header X-LLM-Cache: bypass re-runs every model call instead of
+    replaying cached responses.
+    """
+    try:
+        response, _stored_output, timings = await run_pipeline(request.dict(), state=llm_cache_state(llm_cache))
+        try:
+            content = {"response": parse_agent_response(response)}
+            if debug:
+                content["debug"] = {"timings": timings}
+            return JSONResponse(content=content)
+        except Exception as e:
+            logger.exception("Error parsing agent response")
+            return JSONResponse(content={"error": f"Response parsing error: {e}"}, status_code=500)
+
+    except ModelUnavailableError as e:
+        return model_unavailable_response(e)
+    except Exception as e:
+        logger.exception("Unhandled error in /multi_agent_call endpoint")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@app.post("/multi_agent_call/stream", summary="Process resume and stream each agent output as server-sent events")
+async def process_resume_multi_agent_stream(
+    request: File_Inputs,
+    llm_cache: Optional[str] = Header(None, alias="X-LLM-Cache"),
+):
+    """
+    Runs the same pipeline as /multi_agent_call, but sends each agent output
+    (jd_json, attribute_scores, final_ranking, ...) as a server-sent event as
+    soon as it lands in session state. The stream ends with a "result" event,
+    or an "error" event. Comment lines keep idle connections alive.
+    """
+    inputs = request.dict()
+    cache_state = llm_cache_state(llm_cache)
+    queue: asyncio.Queue = asyncio.Queue()
+    started = time.perf_counter()
 
-    async def run():
-        user_content = types.Content(role='user', parts=[types.Part(text=query_json)])
-        final_response_content = "No final response received."
+    def elapsed_ms() -> int:
+        return int((time.perf_counter() - started) * 1000)
+
+    async def produce():
+        final_response = "No final response received."
+        sent = set()
         try:
-            async for event in agent_runner.run_async(
-                user_id=USER_ID,
-                session_id=SESSION_ID_TOOL_AGENT,
-                new_message=user_content
-            ):
+            async for event in pipeline_events(inputs, cache_state):
                 if event.is_final_response() and event.content and event.content.parts:
-                    final_response_content = event.content.parts[0].text
+                    final_response = event.content.parts[0].text
+                state_delta = event.actions.state_delta if event.actions else {}
+                for key in STREAM_STATE_KEYS:
+                    if key not in state_delta or key in sent:
+                        continue
+                    sent.add(key)
+                    value = state_delta[key]
+                    if key == "extracted_text":
+                        # The raw resume text can be large; report its size only.
+                        value = {"chars": len(value or "")}
+                    else:
+                        value = parse_state_value(value)
+                    await queue.put((key, {"author": event.author, "elapsed_ms": elapsed_ms(), "value": value}))
+            await queue.put(("result", {"elapsed_ms": elapsed_ms(), "response": parse_agent_response(final_response)}))
+        except ModelUnavailableError as e:
+            await queue.put(("error", {"elapsed_ms": elapsed_ms(), "error": str(e), "retry_after": math.ceil(e.retry_after)}))
         except Exception as e:
-            logger.exception("Error during agent run_async")
-            raise RuntimeError(f"Agent execution failed: {e}")
-        return final_response_content
+            logger.exception("Error in /multi_agent_call/stream")
+            await queue.put(("error", {"elapsed_ms": elapsed_ms(), "error": str(e)}))
+        finally:
+            await queue.put(None)
 
-    try:
-        response = await run()
-        logger.info("Agent run completed.")
+    async def stream_events():
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield sse_event(*item)
+        finally:
+            # Client disconnected or stream finished: stop the pipeline run.
+            producer.cancel()
 
-        # Get session state
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def extract_texts(profile_paths: list) -> dict:
+    """
+    Extracts every resume in the parser pool; failures are kept as "Error: ..." text.
+    """
+    async def extract(profile_path: str) -> str:
         try:
-            current_session = await session_service.get_session(
-                app_name=APP_NAME,
-                user_id=USER_ID,
-                session_id=SESSION_ID_TOOL_AGENT
-            )
-            stored_output = current_session.state.get(root_agent.output_key)
-            try:
-                parsed_output = json.loads(stored_output)
-                result["session_state"] = parsed_output
-            except Exception:
-                result["session_state"] = stored_output
-            logger.info("Session state retrieved.")
+            return await extract_text_from_file_async(profile_path)
         except Exception as e:
-            logger.exception("Error retrieving session state")
-            result["session_state"] = f"Session retrieval error: {e}"
+            logger.warning(f"Triage could not extract {profile_path}: {e}")
+            return f"Error: {e}"
+
+    texts = await asyncio.gather(*[extract(path) for path in profile_paths])
+    return dict(zip(profile_paths, texts))
+
+
+@app.post("/multi_agent_batch", summary="Screen many resumes against one job description")
+async def process_resume_batch(
+    request: Batch_Inputs,
+    llm_cache: Optional[str] = Header(None, alias="X-LLM-Cache"),
+):
+    """
+    Parses the job description once, screens every resume through a bounded
+    worker pool and streams one JSON line per candidate as each one finishes.
+    With triage_top_k / triage_min_score, resumes are first scored without a
+    model (src/triage.py) and only the best go through the pipeline; the
+    others are streamed first, with the reason they were filtered.
+    """
+    top_k = TRIAGE_TOP_K if request.triage_top_k is None else request.triage_top_k
+    min_score = TRIAGE_MIN_SCORE if request.triage_min_score is None else request.triage_min_score
+    cache_state = llm_cache_state(llm_cache)
+    try:
+        profile_paths, texts = await resolve_profile_paths(request)
+        jd_json = await parse_job_description(request.job_description, cache_state)
+        report = {}
+        if top_k or min_score:
+            texts.update(await extract_texts([path for path in profile_paths if path not in texts]))
+            jd = parse_state_value(jd_json)
+            profile_paths, report = await asyncio.to_thread(triage, texts, jd if isinstance(jd, dict) else {}, top_k, min_score)
+    except ModelUnavailableError as e:
+        return model_unavailable_response(e)
+    except Exception as e:
+        logger.exception("Error preparing batch")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+    logger.info(f"Batch of {len(profile_paths)} resumes queued.")
+
+    batch_semaphore = asyncio.Semaphore(request.max_concurrency or BATCH_MAX_CONCURRENCY)
 
+    async def screen(profile_path: str) -> dict:
+        async with batch_semaphore:
+            inputs = {"profile_path": profile_path, "job_description": request.job_description}
+            if profile_path.startswith("gs://") and texts[profile_path].startswith("Error"):
+                return {"profile_path": profile_path, "error": texts[profile_path]}
+            # Triage or GCS ingestion already extracted the text; the pipeline reuses it.
+            state = {"jd_json": jd_json, **cache_state, **({"extracted_text": texts[profile_path]} if profile_path in texts else {})}
+            result = {"profile_path": profile_path, **({"triage": report[profile_path]} if profile_path in report else {})}
+            try:
+                response, _stored_output, _timings = await run_pipeline(inputs, state=state)
+                return {**result, "response": parse_agent_response(response)}
+            except Exception as e:
+                logger.exception(f"Error screening {profile_path}")
+                return {**result, "error": str(e)}
+
+    async def stream_results():
+        for path, entry in report.items():
+            if not entry["selected"]:
+                yield json.dumps({"profile_path": path, "filtered": True, "triage": entry}) + "\n"
+        tasks = [asyncio.create_task(screen(path)) for path in profile_paths]
         try:
-            response2 = extract_json_from_code_block(response)
-            safe_response2 = response2.replace('\\', '\\\\')
-            response_json_str = json.dumps(json.loads(safe_response2), indent=4)
-            result["response"] = response2
-            response_1 = json.loads(response_json_str)
-            logger.info("Agent response parsed successfully.")
-            return JSONResponse(content={"response": response_1.get("save_context_to_json_response", {})})
-        except Exception as e:
-            logger.exception("Error parsing agent response")
-            return JSONResponse(content={"error": f"Response parsing error: {e}"}, status_code=500)
+            for next_result in asyncio.as_completed(tasks):
+                yield json.dumps(await next_result) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
 
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", summary="Queue a resume screening job", status_code=202)
+async def submit_job(request: Job_Inputs):
+    """
+    Queues a screening request and returns its job id at once. Poll
+    GET /jobs/{job_id} for status and GET /jobs/{job_id}/result for the result.
+    """
+    payload = request.dict(exclude={"priority"})
+    try:
+        job_id = await job_runner.submit(payload, request.priority)
     except Exception as e:
-        logger.exception("Unhandled error in /multi_agent_call endpoint")
+        logger.exception("Error queueing job")
         return JSONResponse(content={"error": str(e)}, status_code=500)
+    return JSONResponse(content={"job_id": job_id, "status": "queued", "priority": request.priority}, status_code=202)
+
+
+@app.get("/jobs/stats", summary="Job counts by status and priority lane")
+async def job_stats():
+    return JSONResponse(content=await asyncio.to_thread(job_queue.stats))
+
+
+@app.get("/jobs/{job_id}", summary="Job status")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(content={"error": f"Unknown job: {job_id}"}, status_code=404)
+    job.pop("result")
+    return JSONResponse(content=job)
+
+
+@app.get("/jobs/{job_id}/result", summary="Job result")
+async def get_job_result(job_id: str):
+    """
+    Returns the screening response once the job has succeeded; 202 while it is
+    queued or running.
+    """
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(content={"error": f"Unknown job: {job_id}"}, status_code=404)
+    if job["status"] in ("queued", "running"):
+        return JSONResponse(content={"job_id": job_id, "status": job["status"]}, status_code=202)
+    if job["status"] == "succeeded":
+        return JSONResponse(content={"job_id": job_id, "status": "succeeded", "response": job["result"]})
+    return JSONResponse(content={"job_id": job_id, "status": job["status"], "error": job["error"]}, status_code=409)
+
+
+@app.delete("/jobs/{job_id}", summary="Cancel a queued job")
+async def cancel_job(job_id: str):
+    if await asyncio.to_thread(job_queue.cancel, job_id):
+        return JSONResponse(content={"job_id": job_id, "status": "cancelled"})
+    return JSONResponse(content={"error": f"Job {job_id} is unknown or already started."}, status_code=409)
+
+
+@app.get("/metrics", summary="Prometheus metrics")
+async def prometheus_metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/sessions/metrics", summary="Resident session and memory metrics")
+async def session_metrics():
+    return JSONResponse(content=session_service.metrics())
+
+
+@app.get("/cache/stats", summary="Cache hit/miss counters")
+async def cache_stats():
+    return JSONResponse(content={"jd": jd_cache.stats(), "resume": resume_cache.stats()})
+
+
+@app.get("/llm_cache/stats", summary="LLM response cache counters")
+async def llm_cache_stats():
+    return JSONResponse(content=await asyncio.to_thread(llm_response_cache.stats))
+
+
+@app.get("/model/stats", summary="Model call rate limit, retry and circuit breaker counters")
+async def model_stats():
+    return JSONResponse(content=model_limiter.stats())
+
+
+@app.get("/bigquery/stats", summary="Batched BigQuery writer counters")
+async def bigquery_stats():
+    return JSONResponse(content=bigquery_writer.stats())
+
+
+@app.get("/sink/stats", summary="Result sink counters")
+async def sink_stats():
+    return JSONResponse(content=result_sink.stats())
@@ -0,0 +1,77 @@
+"""
+Benchmark: batched BigQuery writer vs. one insert_rows_json call (and one new
+client) per resume, against a recording stub with a fixed per-call latency.
+
+    python -m benchmarks.bench_bigquery_writer --resumes 1000 --batch-size 100 --latency 0.05
+"""
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from src.bigquery_writer import BigQueryBatchWriter
+
+
+def make_row(i: int) -> dict:
+    return {"name": f"Candidate {i}", "email": f"candidate{i}@example.com", "skills": "MIG welding, TIG welding", "overall_score": i % 100}
+
+
+def legacy_write(resumes: int, latency: float, client_setup: float, concurrency: int) -> tuple:
+    clients = []
+
+    def write_one(i):
+        time.sleep(client_setup)  # bigquery.Client() per call
+        client = FakeBigQueryClient(latency=latency)
+        clients.append(client)
+        return client.insert_rows_json("candidate_cv.welder_profile_v1", [make_row(i)])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(write_one, range(resumes)))
+    return time.perf_counter() - start, sum(client.calls for client in clients)
+
+
+def main(resumes: int, batch_size: int, latency: float, client_setup: float, concurrency: int) -> None:
+    legacy_time, legacy_calls = legacy_write(resumes, latency, client_setup, concurrency)
+
+    client = FakeBigQueryClient(latency=latency)
+    dead_letter = os.path.join(tempfile.mkdtemp(), "dead_letter.jsonl")
+    writer = BigQueryBatchWriter(
+        max_rows=batch_size, flush_interval=0.5, dead_letter_path=dead_letter, client_factory=lambda: client
+    )
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda i: writer.enqueue(make_row(i)), range(resumes)))
+    writer.close()
+    batched_time = time.perf_counter() - start
+    written = sum(len(batch) for batch in client.batches)
+
+    print(f"{resumes} resumes, {latency * 1000:.0f} ms per insert call, {client_setup * 1000:.0f} ms client setup")
+    print(f"per-row inserts   calls={legacy_calls:>6}  total={legacy_time:7.2f} s")
+    print(f"batched writer    calls={client.calls:>6}  total={batched_time:7.2f} s  rows written={written}  expected calls~{-(-resumes // batch_size)}")
+
+    # Transient failures and a rejected row: retries, then the dead-letter file.
+    client = FakeBigQueryClient(fail_first_calls=2, reject=lambda row: row["overall_score"] == 7)
+    writer = BigQueryBatchWriter(
+        max_rows=batch_size, retry_base_seconds=0.01, dead_letter_path=dead_letter, client_factory=lambda: client
+    )
+    for i in range(batch_size):
+        writer.enqueue(make_row(i))
+    writer.close()
+    stats = writer.stats()
+    with open(dead_letter) as f:
+        dead_lines = sum(1 for _ in f)
+    print(f"failure run       calls={client.calls}  retries={stats['retries']}  written={stats['rows_written']}  dead-lettered={dead_lines}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated insert_rows_json latency in seconds.")
+    parser.add_argument("--client-setup", type=float, default=0.02, help="Simulated bigquery.Client() setup in seconds.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    main(args.resumes, args.batch_size, args.latency, args.client_setup, args.concurrency)
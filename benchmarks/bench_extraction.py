@@ -0,0 +1,68 @@
+"""
+Benchmark: extract_text_from_file vs. the previous string-concatenating
+implementation, over synthetic 1-200 page PDFs and DOCX files.
+
+    python -m benchmarks.bench_extraction --pages 1 10 50 100 200 --repeat 3
+"""
+import os
+import time
+import argparse
+import tempfile
+
+from benchmarks.corpus import build_corpus
+from src.tools import extract_text_from_file, iter_text_chunks
+
+
+def legacy_extract_text_from_file(file_path: str):
+    """
+    The pre-rewrite extractor: per-call imports and text += in a loop.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    text = ""
+    if ext == ".pdf":
+        import PyPDF2
+        with open(file_path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            for page in reader.pages:
+                text += page.extract_text() or ""
+    elif ext == ".docx":
+        from docx import Document
+        doc = Document(file_path)
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+    return text
+
+
+def best_of(func, path: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_to_first_chunk(path: str) -> float:
+    start = time.perf_counter()
+    next(iter_text_chunks(path))
+    return time.perf_counter() - start
+
+
+def main(pages: list, repeat: int, corpus_dir: str) -> None:
+    paths = build_corpus(corpus_dir, pages)
+    print(f"{'file':<28}{'chars':>10}{'legacy ms':>12}{'new ms':>10}{'first chunk ms':>16}")
+    for path in paths:
+        chars = len(extract_text_from_file(path, max_pages=0, max_chars=0))
+        legacy = best_of(legacy_extract_text_from_file, path, repeat)
+        new = best_of(lambda p: extract_text_from_file(p, max_pages=0, max_chars=0), path, repeat)
+        first = time_to_first_chunk(path)
+        print(f"{os.path.basename(path):<28}{chars:>10}{legacy * 1000:>12.1f}{new * 1000:>10.1f}{first * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "hr_bench_corpus"))
+    args = parser.parse_args()
+    main(args.pages, args.repeat, args.corpus_dir)
@@ -0,0 +1,70 @@
+"""
+Benchmark: persistent LLM response cache (src/llm_cache.py). Screens the same
+resume against the same JD three times through run_pipeline with FakeLlm
+models: cold (every model call runs; includes parser-pool startup), replay
+(every temperature-0 call is answered from the SQLite cache) and bypass (the
+X-LLM-Cache: bypass state, every call runs again and refreshes its entry).
+Reports wall time, model calls, rows written to the result sink and whether
+each run returned the same response.
+
+    python -m benchmarks.bench_llm_cache --latency 0.3
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+
+from benchmarks.bench_load import configure_offline_environment
+from benchmarks.corpus import build_corpus
+
+JOB_DESCRIPTION = {"title": "Welder", "skills": ["MIG welding", "TIG welding"], "experience": "2+ years"}
+
+
+def count_rows(results_dir: str) -> int:
+    rows = 0
+    for root, _dirs, files in os.walk(results_dir):
+        for name in files:
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                rows += sum(1 for line in f if line.strip())
+    return rows
+
+
+async def main(args) -> None:
+    work_dir = tempfile.mkdtemp(prefix="hr_bench_llm_cache_")
+    configure_offline_environment(work_dir)
+    os.environ["LLM_CACHE_ENABLED"] = "true"
+
+    import src.agents as agents
+    from benchmarks.fake_llm import install_fake_llm
+    fakes = install_fake_llm(agents.root_agent, args.latency)
+    import app as app_module
+    from src.llm_cache import llm_response_cache, BYPASS_STATE_KEY
+
+    paths = build_corpus(work_dir, [args.pages], formats=("pdf",))
+    inputs = {"profile_path": paths[0], "job_description": JOB_DESCRIPTION}
+
+    print(f"latency={args.latency}s per model call, db={llm_response_cache.store.db_path}")
+    results_dir = os.environ["RESULT_SINK_DIR"]
+    print(f"{'run':<8}{'ms':>10}{'model calls':>13}{'sink rows':>11}  same response")
+    first = None
+    for run, state in (("cold", None), ("replay", None), ("bypass", {BYPASS_STATE_KEY: True})):
+        calls = sum(fake.calls for fake in fakes)
+        start = time.perf_counter()
+        response, _stored, _timings = await app_module.run_pipeline(inputs, state=state)
+        seconds = time.perf_counter() - start
+        parsed = app_module.parse_agent_response(response)
+        first = first if first is not None else parsed
+        app_module.result_sink.flush()
+        print(f"{run:<8}{seconds * 1000:>10.1f}{sum(fake.calls for fake in fakes) - calls:>13}{count_rows(results_dir):>11}  {parsed == first}")
+
+    print(f"cache: {llm_response_cache.stats()}")
+    app_module.parser_pool.shutdown()
+    app_module.result_sink.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model latency per call in seconds.")
+    parser.add_argument("--pages", type=int, default=2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,179 @@
+"""
+Offline load benchmark: drives POST /multi_agent_call (in-process ASGI, no
+network) or run_pipeline directly at several concurrency levels over a
+synthetic resume corpus, with every agent's model replaced by FakeLlm.
+
+Reports throughput, p50/p95/p99 latency, model tokens per request and
+process memory per level. Use --json to save results and compare changes.
+
+    python -m benchmarks.bench_load --mode api --concurrency 1 4 16 --requests 32 --latency 0.2
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import statistics
+
+from benchmarks.corpus import build_corpus
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def configure_offline_environment(work_dir: str) -> None:
+    """
+    Points every side effect at a scratch directory before the app is imported:
+    results go to a local JSONL sink, the job queue and LLM response cache to
+    scratch databases, and the JD/resume caches stay in memory.
+    """
+    os.environ.setdefault("MODEL", "fake-llm")
+    os.environ["RESULT_SINK"] = "jsonl"
+    os.environ["RESULT_SINK_DIR"] = os.path.join(work_dir, "results")
+    os.environ["JOB_QUEUE_DB"] = os.path.join(work_dir, "jobs.sqlite3")
+    os.environ["BQ_DEAD_LETTER_PATH"] = os.path.join(work_dir, "dead_letter.jsonl")
+    os.environ["JD_CACHE_DIR"] = ""
+    os.environ["RESUME_CACHE_DIR"] = ""
+    os.environ["LLM_CACHE_DB"] = os.path.join(work_dir, "llm_cache.sqlite3")
+
+
+async def run_level(send, paths: list, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, tokens, errors = [], [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        inputs = {
+            "profile_path": paths[i % len(paths)],
+            # A distinct JD per request keeps the JD cache cold.
+            "job_description": {"title": "Welder", "skills": ["MIG welding", "TIG welding"], "requisition": i},
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            ok, request_tokens = await send(inputs)
+            latencies.append(time.perf_counter() - start)
+        errors += 0 if ok else 1
+        if request_tokens is not None:
+            tokens.append(request_tokens)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    wall = time.perf_counter() - start
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2),
+        "p50_ms": round(statistics.median(latencies_ms), 1),
+        "p95_ms": round(percentile(latencies_ms, 95), 1),
+        "p99_ms": round(percentile(latencies_ms, 99), 1),
+        "tokens_per_request": round(statistics.mean(tokens)) if tokens else None,
+        "rss_mb": round(rss_mb(), 1),
+        "rss_delta_mb": round(rss_mb() - rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def main(args) -> None:
+    work_dir = tempfile.mkdtemp(prefix="hr_bench_load_")
+    configure_offline_environment(work_dir)
+
+    # Imported here so parser-pool workers (spawned, re-importing __main__) skip the app.
+    import httpx
+    import src.agents as agents
+    from benchmarks.fake_llm import install_fake_llm
+    fake_options = {"jitter": args.jitter, "prompt_tokens": args.prompt_tokens, "completion_tokens": args.completion_tokens}
+    fakes = install_fake_llm(agents.root_agent, args.latency, **fake_options)
+    fakes += install_fake_llm(agents.batch_jd_agent, args.latency, **fake_options)
+    import app as app_module
+    from src.cache import jd_cache, resume_cache
+    from src.llm_cache import llm_response_cache
+
+    paths = build_corpus(args.corpus_dir, [args.pages] * max(1, args.requests), formats=(args.format,))
+
+    if args.mode == "api":
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app_module.app), base_url="http://bench", timeout=None)
+
+        async def send(inputs):
+            response = await client.post("/multi_agent_call", params={"debug": "true"}, json=inputs)
+            body = response.json()
+            timings = (body.get("debug") or {}).get("timings") or {}
+            return response.status_code == 200 and "error" not in body, timings.get("total_prompt_tokens", 0) + timings.get("total_completion_tokens", 0)
+    else:
+        client = None
+
+        async def send(inputs):
+            try:
+                _response, _stored, timings = await app_module.run_pipeline(inputs)
+            except Exception:
+                return False, None
+            timings = timings or {}
+            return True, timings.get("total_prompt_tokens", 0) + timings.get("total_completion_tokens", 0)
+
+    print(
+        f"mode={args.mode} latency={args.latency}s jitter={args.jitter} requests/level={args.requests} "
+        f"corpus={len(paths)} x {args.pages}p {args.format} cache={'warm' if args.warm_cache else 'cold'}"
+    )
+    # Warm-up: start parser workers and import lazily loaded modules outside the timings.
+    await send({"profile_path": paths[0], "job_description": {"title": "warm-up"}})
+
+    header = f"{'conc':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'tokens/req':>12}{'rss MB':>9}{'peak MB':>9}{'errors':>8}"
+    print(header)
+    results = []
+    for concurrency in args.concurrency:
+        if not args.warm_cache:
+            jd_cache.clear()
+            resume_cache.clear()
+            if llm_response_cache.store is not None:
+                llm_response_cache.store.clear()
+        result = await run_level(send, paths, args.requests, concurrency)
+        results.append(result)
+        print(
+            f"{concurrency:>5}{result['throughput_rps']:>9.2f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{str(result['tokens_per_request']):>12}{result['rss_mb']:>9.1f}"
+            f"{result['peak_rss_mb']:>9.1f}{result['errors']:>8}"
+        )
+
+    print(f"model calls: {sum(fake.calls for fake in fakes)}")
+    if client is not None:
+        await client.aclose()
+    app_module.parser_pool.shutdown()
+    app_module.result_sink.close()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("api", "pipeline"), default="api")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="Requests per concurrency level.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake model latency per call in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency jitter as a fraction (deterministic).")
+    parser.add_argument("--prompt-tokens", type=int, default=0, help="Fixed prompt tokens per call (0 = estimate).")
+    parser.add_argument("--completion-tokens", type=int, default=0, help="Fixed completion tokens per call (0 = estimate).")
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--format", choices=("pdf", "docx"), default="pdf")
+    parser.add_argument("--warm-cache", action="store_true", help="Keep JD/resume/LLM response caches between levels.")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "hr_bench_load_corpus"))
+    parser.add_argument("--json", help="Write the results to this file.")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Microbenchmark: deterministic MergeContextAgent vs. the previous LLM merge step.
+
+The LLM step runs against FakeLlm with a configurable per-call latency, so the
+comparison is reproducible offline. Prompt size is reported because the LLM
+step has to read every context variable and re-emit them as output.
+
+    python -m benchmarks.bench_merge_context --iterations 200 --llm-latency 2.0
+"""
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from google.genai import types
+from google.adk.agents import LlmAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from benchmarks.fake_llm import CANNED_RESPONSES, FakeLlm
+from src.custom_agents import MergeContextAgent, MERGE_CONTEXT_KEYS
+
+LEGACY_MERGE_INSTRUCTION = """
+You will receive multiple context variables, each containing JSON data from previous agents:
+- {{int_profile_data_json}}
+- {{attribute_scores}}
+- {{semantic_match}}
+- {{final_ranking}}
+- {{enriched_profile_json}}
+- {{flagged_gaps_json}}
+- {{interview_questions_json}}
+
+Your task:
+- For each context variable, assign its variable name as the key and its JSON content as the value.
+- Merge all such key-value pairs into a single JSON object.
+- Return the merged JSON object.
+- If any context variable is missing or empty, skip it.
+"""
+
+STATE_SOURCES = {
+    "int_profile_data_json": "extraction_formatter",
+    "attribute_scores": "profile_jd_matcher",
+    "semantic_match": "semantic_scoring_agent",
+    "final_ranking": "final_ranking_agent",
+    "enriched_profile_json": "external_hr_enrichment_agent",
+    "flagged_gaps_json": "gap_flagging_agent",
+    "interview_questions_json": "interview_question_agent",
+}
+
+
+def build_state() -> dict:
+    state = {key: json.dumps(CANNED_RESPONSES[agent]) for key, agent in STATE_SOURCES.items()}
+    state["int_profile_data_json"] = CANNED_RESPONSES["extraction_formatter"]
+    # Written by skip_below_score in PIPELINE_MODE=conditional.
+    state["screening_status"] = "screened"
+    return state
+
+
+async def time_agent(agent, iterations: int) -> list:
+    session_service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text="merge")])
+    timings = []
+    for _ in range(iterations):
+        session = await session_service.create_session(app_name="bench", user_id="bench", state=build_state())
+        start = time.perf_counter()
+        async for _event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        timings.append(time.perf_counter() - start)
+        await session_service.delete_session(app_name="bench", user_id="bench", session_id=session.id)
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(timings_ms):9.3f} ms  p50={statistics.median(timings_ms):9.3f} ms  p95={p95:9.3f} ms")
+
+
+async def main(iterations: int, llm_latency: float) -> None:
+    deterministic = MergeContextAgent(name="merge_context_agent", output_key="merged_context_json")
+    legacy = LlmAgent(
+        name="merge_context_agent",
+        model=FakeLlm(model="fake-llm", agent_name="merge_context_agent", latency=llm_latency),
+        instruction=LEGACY_MERGE_INSTRUCTION,
+        generate_content_config=types.GenerateContentConfig(temperature=0),
+        output_key="merged_context_json",
+    )
+
+    state = build_state()
+    prompt_chars = len(LEGACY_MERGE_INSTRUCTION) + sum(len(str(state.get(k, ""))) for k in MERGE_CONTEXT_KEYS)
+    print(f"LLM merge prompt: ~{prompt_chars} chars (~{prompt_chars // 4} tokens) in, same again out")
+
+    report("MergeContextAgent", await time_agent(deterministic, iterations))
+    report(f"LlmAgent (latency={llm_latency}s)", await time_agent(legacy, iterations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated model latency in seconds.")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.llm_latency))
@@ -0,0 +1,103 @@
+"""
+Benchmark: shared rate-limited model client (src/model_client.py). Runs
+concurrent pipelines through run_pipeline with FakeLlm models that inject
+errors, under three scenarios:
+
+  quota:   a share of model calls fail with 429; without retries (as before)
+           vs with jittered exponential backoff.
+  rpm:     no errors, calls capped by the requests-per-minute bucket (with a
+           1 s burst so the steady rate shows); reports the achieved rate.
+  outage:  every call fails with 503; without vs with the circuit breaker,
+           which fails the remaining calls fast instead of retrying each one.
+
+    python -m benchmarks.bench_model_client --requests 16 --error-rate 0.2 --rpm 1200
+"""
+import time
+import asyncio
+import argparse
+import tempfile
+
+from benchmarks.bench_load import configure_offline_environment
+from benchmarks.corpus import build_corpus
+
+
+def use_limiter(agent, limiter) -> None:
+    from src.model_client import RateLimitedLlm
+    if isinstance(getattr(agent, "model", None), RateLimitedLlm):
+        agent.model.limiter = limiter
+    for sub_agent in agent.sub_agents:
+        use_limiter(sub_agent, limiter)
+
+
+async def run_scenario(app_module, root_agent, fakes, path: str, args, label: str, limiter, error_rate: float, error_code: int) -> None:
+    use_limiter(root_agent, limiter)
+    for fake in fakes:
+        fake.error_rate, fake.error_code = error_rate, error_code
+    calls_before = sum(fake.calls for fake in fakes)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int) -> bool:
+        # A distinct JD per request keeps the JD cache cold.
+        inputs = {"profile_path": path, "job_description": {"title": "Welder", "requisition": f"{label}-{i}"}}
+        async with semaphore:
+            try:
+                await app_module.run_pipeline(inputs)
+                return True
+            except Exception:
+                return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(i) for i in range(args.requests)])
+    seconds = time.perf_counter() - start
+    calls = sum(fake.calls for fake in fakes) - calls_before
+    stats = limiter.stats()
+    print(
+        f"{label:<22}{sum(results):>4}/{len(results):<4}{seconds:>9.2f}{calls:>8}{calls / seconds * 60:>10.0f}"
+        f"{stats['retries']:>9}{stats['throttled_seconds']['requests']:>11.2f}  {stats['circuit']['state']} (opened {stats['circuit']['opened']}x)"
+    )
+
+
+async def main(args) -> None:
+    work_dir = tempfile.mkdtemp(prefix="hr_bench_model_client_")
+    configure_offline_environment(work_dir)
+
+    import src.agents as agents
+    from benchmarks.fake_llm import install_fake_llm
+    fakes = install_fake_llm(agents.root_agent, args.latency, jitter=0.2)
+    import app as app_module
+    from src.llm_cache import llm_response_cache
+    from src.model_client import ModelCallLimiter
+
+    # Every request must reach the model.
+    llm_response_cache.store = None
+    path = build_corpus(work_dir, [1], formats=("pdf",))[0]
+    await app_module.run_pipeline({"profile_path": path, "job_description": {"title": "warm-up"}})
+
+    retry = {"retry_base_seconds": args.retry_base, "retry_max_seconds": args.retry_base * 8}
+    print(f"requests={args.requests} concurrency={args.concurrency} latency={args.latency}s")
+    print(f"{'scenario':<22}{'ok':>4} {'':<4}{'seconds':>9}{'calls':>8}{'calls/min':>10}{'retries':>9}{'waited s':>11}  circuit")
+    await run_scenario(app_module, agents.root_agent, fakes, path, args, "quota, no retries",
+                       ModelCallLimiter(rpm=0, tpm=0, max_retries=0, breaker_threshold=0), args.error_rate, 429)
+    await run_scenario(app_module, agents.root_agent, fakes, path, args, "quota, retries",
+                       ModelCallLimiter(rpm=0, tpm=0, max_retries=args.retries, breaker_threshold=0, **retry), args.error_rate, 429)
+    await run_scenario(app_module, agents.root_agent, fakes, path, args, f"rpm {args.rpm:g}",
+                       ModelCallLimiter(rpm=args.rpm, tpm=0, burst_seconds=1, max_retries=args.retries, breaker_threshold=0, **retry), 0.0, 429)
+    await run_scenario(app_module, agents.root_agent, fakes, path, args, "outage, no breaker",
+                       ModelCallLimiter(rpm=0, tpm=0, max_retries=args.retries, breaker_threshold=0, **retry), 1.0, 503)
+    await run_scenario(app_module, agents.root_agent, fakes, path, args, "outage, breaker",
+                       ModelCallLimiter(rpm=0, tpm=0, max_retries=args.retries, breaker_threshold=5, breaker_cooldown_seconds=30, **retry), 1.0, 503)
+
+    app_module.parser_pool.shutdown()
+    app_module.result_sink.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake model latency per call in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Share of calls failing with 429 in the quota scenarios.")
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--retry-base", type=float, default=0.2, help="Base backoff in seconds (production default 1).")
+    asyncio.run(main(parser.parse_args()))
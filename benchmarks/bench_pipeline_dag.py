@@ -0,0 +1,97 @@
+"""
+Benchmark: parallel DAG pipeline vs. the previous fully sequential layout.
+
+Every LLM agent is replaced by FakeLlm with a fixed per-call delay, so the
+wall-clock difference comes only from how the stages are arranged.
+
+    python -m benchmarks.bench_pipeline_dag --latency 0.5 --runs 5
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+from google.genai import types
+from google.adk.agents import SequentialAgent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from benchmarks.fake_llm import install_fake_llm
+
+# Agents need a model name at import time; every call goes to FakeLlm anyway.
+os.environ.setdefault("MODEL", "fake-llm")
+import src.agents as agents
+import src.custom_agents as custom_agents
+
+SAMPLE_INPUTS = {
+    "profile_path": "benchmark_resume.docx",
+    "job_description": {"job_title": "Welder", "skills": ["MIG welding", "TIG welding"]},
+}
+
+
+def build_sequential_pipeline() -> SequentialAgent:
+    """
+    Rebuilds the pre-DAG layout from clones of the current agents.
+    """
+    return SequentialAgent(
+        name="sequential_pipeline",
+        sub_agents=[
+            agents.parallel_agent.clone(),
+            agents.match_agent.clone(),
+            agents.semantic_scoring_agent.clone(),
+            agents.final_ranking_agent.clone(),
+            agents.external_hr_enrichment_agent.clone(),
+            agents.gap_flagging_agent.clone(),
+            agents.interview_question_agent.clone(),
+            agents.merge_context_agent.clone(),
+            agents.save_context_agent.clone(),
+        ],
+    )
+
+
+async def time_pipeline(pipeline, runs: int) -> list:
+    session_service = InMemorySessionService()
+    runner = Runner(agent=pipeline, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text=json.dumps(SAMPLE_INPUTS))])
+    timings = []
+    for _ in range(runs):
+        session = await session_service.create_session(app_name="bench", user_id="bench", state=dict(SAMPLE_INPUTS))
+        start = time.perf_counter()
+        async for _event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        timings.append(time.perf_counter() - start)
+        await session_service.delete_session(app_name="bench", user_id="bench", session_id=session.id)
+    return timings
+
+
+async def main(latency: float, runs: int) -> None:
+    # Keep the benchmark offline: no file reads, no warehouse writes.
+    async def fake_extract(path):
+        return "Jane Doe\nStructural Welder\nMIG, TIG welding"
+
+    custom_agents.extract_text_from_file_async = fake_extract
+    custom_agents.save_context_to_json = lambda context_data, output_key: {"status": "skipped"}
+
+    sequential = build_sequential_pipeline()
+    dag = agents.pipeline_agent.clone()
+    install_fake_llm(sequential, latency)
+    install_fake_llm(dag, latency)
+
+    sequential_timings = await time_pipeline(sequential, runs)
+    dag_timings = await time_pipeline(dag, runs)
+    sequential_mean = statistics.mean(sequential_timings)
+    dag_mean = statistics.mean(dag_timings)
+    print(f"Per-call model latency: {latency:.3f} s, runs: {runs}")
+    print(f"sequential pipeline  mean={sequential_mean:7.3f} s")
+    print(f"DAG pipeline         mean={dag_mean:7.3f} s")
+    print(f"speedup              {sequential_mean / dag_mean:7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated model latency per call in seconds.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.runs))
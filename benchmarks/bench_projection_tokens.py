@@ -0,0 +1,116 @@
+"""
+Prompt-size report: renders the scoring and review agents' instructions with
+the compact, field-projected views (src/projections.py) and with the full
+upstream JSON they used to interpolate, over a verbose synthetic resume, and
+reports estimated prompt tokens (chars / 4) per agent and per resume.
+
+    python -m benchmarks.bench_projection_tokens --experience 8 --description-words 120
+"""
+import os
+import re
+import json
+import argparse
+
+# src.agents needs a model name to build; no model is called here.
+os.environ.setdefault("MODEL", "fake-llm")
+from src import agents
+from src.projections import PROJECTED_VIEWS
+
+# Placeholders each view replaced in the instructions.
+LEGACY_PLACEHOLDERS = {
+    "profile_for_scoring": "int_profile_data_json",
+    "jd_for_scoring": "jd_json",
+    "profile_for_review": "enriched_profile_json",
+}
+PLACEHOLDER = re.compile(r"\{+([A-Za-z_][A-Za-z0-9_]*)\}+")
+
+
+def words(n: int, seed: str) -> str:
+    vocabulary = ["welding", "fabrication", "blueprints", "safety", "inspection", "team", "quality", "steel", "repair", "maintenance"]
+    return " ".join(f"{vocabulary[(i + len(seed)) % len(vocabulary)]}" for i in range(n))
+
+
+def build_state(experience: int, description_words: int) -> dict:
+    """
+    Session state as the pipeline leaves it before stage 2: the formatter's
+    profile (pretty-printed, as models tend to emit it), the JD JSON and a
+    LinkedIn enrichment result.
+    """
+    profile = {
+        "full_name": "Jordan Example",
+        "email": "jordan@example.com",
+        "phone": "+1 555 0100",
+        "location": "Houston, TX",
+        "linkedin": "https://linkedin.com/in/jordan-example",
+        "summary": words(description_words, "summary"),
+        "skills": ["MIG welding", "TIG welding", "Stick welding", "Blueprint reading", "OSHA 30", "Forklift"],
+        "education": [{"degree": "Diploma, Welding Technology", "institution": "Houston Community College", "start_year": "2008", "end_year": "2010", "grade": "A"}],
+        "experience": [
+            {
+                "job_title": f"Welder {i}",
+                "company": f"Fabricator {i} Inc.",
+                "location": "Houston, TX",
+                "start_year": str(2010 + i),
+                "end_year": str(2011 + i),
+                "description": words(description_words, f"role{i}"),
+            }
+            for i in range(experience)
+        ],
+        "certifications": [{"name": "AWS Certified Welder", "provider": "American Welding Society", "start_year": "2012", "end_year": "2025", "credential_id": "AWS-123456"}],
+        "languages": ["English", "Spanish"],
+        "projects": [{"name": f"Project {i}", "description": words(description_words // 2, f"project{i}")} for i in range(3)],
+        "hobbies": ["fishing", "woodworking"],
+    }
+    jd = {
+        "title": "Senior Welder",
+        "location": "Houston, TX",
+        "skills": ["MIG welding", "TIG welding", "Blueprint reading"],
+        "experience_years": 5,
+        "certifications": ["AWS Certified Welder"],
+        "description": words(description_words, "jd"),
+    }
+    enrichment = {"linkedin_profile": {"headline": "Senior Welder", "about": words(description_words, "about"), "endorsements": profile["skills"]}}
+    return {
+        "int_profile_data_json": "```json\n" + json.dumps(profile, indent=2) + "\n```",
+        "jd_json": json.dumps(jd, indent=2),
+        "enriched_profile_json": json.dumps(enrichment, indent=2),
+    }
+
+
+def render(instruction: str, state: dict) -> str:
+    return PLACEHOLDER.sub(lambda m: str(state.get(m.group(1), "")), instruction)
+
+
+def tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def main(args) -> None:
+    state = build_state(args.experience, args.description_words)
+    for view_key, builder in PROJECTED_VIEWS.items():
+        state[view_key] = builder(state)
+
+    projected_agents = [agents.match_agent, agents.semantic_scoring_agent, agents.gap_flagging_agent, agents.interview_question_agent]
+    print(f"{'agent':<28}{'before':>9}{'after':>9}{'saved':>8}")
+    total_before = total_after = 0
+    for agent in projected_agents:
+        legacy_instruction = agent.instruction
+        for view_key, legacy_key in LEGACY_PLACEHOLDERS.items():
+            legacy_instruction = legacy_instruction.replace(f"{{{{{view_key}}}}}", f"{{{{{legacy_key}}}}}")
+        before = tokens(render(legacy_instruction, state))
+        after = tokens(render(agent.instruction, state))
+        total_before += before
+        total_after += after
+        print(f"{agent.name:<28}{before:>9}{after:>9}{1 - after / before:>8.0%}")
+    print(f"{'per resume':<28}{total_before:>9}{total_after:>9}{1 - total_after / total_before:>8.0%}")
+    if args.show:
+        for view_key in PROJECTED_VIEWS:
+            print(f"\n{view_key}:\n{state[view_key]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--experience", type=int, default=8, help="Experience entries in the synthetic resume.")
+    parser.add_argument("--description-words", type=int, default=120, help="Words per free-text field.")
+    parser.add_argument("--show", action="store_true", help="Print the rendered views.")
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""
+Benchmark: writing final screening rows through each result sink (JSONL,
+Parquet, and BigQuery against a recording stub), reporting throughput and
+bytes on disk. The Parquet output is read back to check the row count.
+
+    python -m benchmarks.bench_result_sinks --rows 20000 --row-group-size 1000
+"""
+import os
+import time
+import argparse
+import tempfile
+
+from benchmarks.fake_bigquery import FakeBigQueryClient
+from src.bigquery_writer import BigQueryBatchWriter
+from src.sinks import BigQuerySink, JsonlSink, ParquetSink
+
+
+def make_row(i: int) -> dict:
+    return {
+        "name": f"Candidate {i}",
+        "email": f"candidate{i}@example.com",
+        "skills": "MIG welding, TIG welding, Blueprint reading",
+        "experience": [{"title": "Welder", "company": "AME Industries", "start_year": "2015", "end_year": "2020"}],
+        "attribute_match_score": i % 100,
+        # LLM output is not always typed consistently.
+        "semantic_match_score": str(i % 100) if i % 7 == 0 else (i % 100) / 100,
+        "ranking": "Strong" if i % 3 else "Weak",
+        "flagged_issue": None if i % 5 else "Certification expired",
+    }
+
+
+def directory_bytes(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def run(sink, rows: int) -> float:
+    start = time.perf_counter()
+    for i in range(rows):
+        sink.write(make_row(i))
+    sink.close()
+    return time.perf_counter() - start
+
+
+def main(rows: int, row_group_size: int) -> None:
+    print(f"{rows} rows")
+    jsonl_dir = tempfile.mkdtemp()
+    elapsed = run(JsonlSink(jsonl_dir), rows)
+    print(f"jsonl     {rows / elapsed:>10.0f} rows/s  {directory_bytes(jsonl_dir) / 1024:>8.0f} KiB")
+
+    parquet_dir = tempfile.mkdtemp()
+    sink = ParquetSink(parquet_dir, row_group_size=row_group_size)
+    elapsed = run(sink, rows)
+    import pyarrow.parquet as pq
+    read_back = sum(pq.read_metadata(path).num_rows for path in sink.files_written)
+    print(
+        f"parquet   {rows / elapsed:>10.0f} rows/s  {directory_bytes(parquet_dir) / 1024:>8.0f} KiB  "
+        f"files={len(sink.files_written)} row groups={sink.row_groups} rows read back={read_back}"
+    )
+
+    client = FakeBigQueryClient(latency=0.05)
+    writer = BigQueryBatchWriter(max_rows=500, dead_letter_path=None, client_factory=lambda: client)
+    elapsed = run(BigQuerySink(writer), rows)
+    print(f"bigquery  {rows / elapsed:>10.0f} rows/s  insert calls={client.calls} (stub, 50 ms per call)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--row-group-size", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.rows, args.row_group_size)
@@ -0,0 +1,56 @@
+"""
+Microbenchmark: rule-based attribute scoring (src/scoring.py) over synthetic
+profile/JD pairs. Reports time per candidate, the scores for each JD variant,
+and how often MATCH_ENGINE=hybrid would still call match_agent.
+
+    python -m benchmarks.bench_rule_scoring --iterations 2000
+"""
+import time
+import argparse
+import statistics
+
+from benchmarks.fake_llm import CANNED_RESPONSES
+from src.scoring import score_profile
+
+JD_VARIANTS = {
+    "canned": CANNED_RESPONSES["jd_parser"],
+    "structured": {
+        "job_title": "Senior Welder",
+        "required_skills": ["GMAW", "GTAW", "Reading blueprints", "Stick welding"],
+        "preferred_skills": ["Forklift"],
+        "requirements": ["3-5 years of structural welding experience", "AWS certification", "High school diploma or GED"],
+    },
+    "free_text": {
+        "job_title": "Fabricator",
+        "skills": ["Ability to work in confined spaces and at heights with minimal supervision"],
+        "experience": 5,
+    },
+    "unlisted_skills": {
+        "job_title": "Pipe Welder",
+        "skills": ["Orbital welding", "Pipe fitting", "Rigging", "MIG welding"],
+        "education": "Bachelor's degree in welding engineering",
+    },
+}
+
+
+def main(args) -> None:
+    profile = CANNED_RESPONSES["extraction_formatter"]
+    print(f"{'jd':<18}{'us/call':>9}{'skill':>7}{'exp':>6}{'edu':>6}{'cert':>6}{'fit':>6}  hybrid")
+    for name, jd in JD_VARIANTS.items():
+        timings = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            attribute_scores, details = score_profile(profile, jd)
+            timings.append(time.perf_counter() - start)
+        scores = attribute_scores["attribute_scores"]
+        verdict = "rules" if details["confident"] else "llm: " + "; ".join(details["fallback_reasons"])
+        print(
+            f"{name:<18}{statistics.median(timings) * 1e6:>9.0f}{scores['skill_match']:>7}{scores['experience_match']:>6}"
+            f"{scores['education_match']:>6}{scores['certification_match']:>6}{scores['overall_fit']:>6}  {verdict}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,64 @@
+"""
+Microbenchmark: local semantic scoring (src/semantic.py). Scores a synthetic
+pool of welder and software profiles against a welder JD, one candidate at a
+time (as the pipeline does) and in batches. It checks that both paths give
+identical scores, and reports candidates per second and the mean score of
+each group.
+
+    python -m benchmarks.bench_semantic --candidates 2000
+"""
+import time
+import argparse
+
+import numpy as np
+
+from benchmarks.fake_llm import CANNED_RESPONSES
+from src.semantic import semantic_match, semantic_scores
+
+SOFTWARE_PROFILE = {
+    "name": "Sam Developer",
+    "summary": "Backend engineer building REST APIs and data pipelines in Python.",
+    "skills": ["Python", "PostgreSQL", "Docker", "Kubernetes", "REST APIs"],
+    "experience": [
+        {"job_title": "Software Engineer", "company": "Acme Cloud", "start_year": "2018",
+         "description": "Built microservices and CI/CD pipelines on GCP."},
+    ],
+    "education": [{"degree": "BSc Computer Science", "institution": "State University"}],
+}
+
+
+def build_pool(candidates: int) -> tuple:
+    welder = CANNED_RESPONSES["extraction_formatter"]
+    profiles, groups = [], []
+    for i in range(candidates):
+        base = welder if i % 2 == 0 else SOFTWARE_PROFILE
+        profile = dict(base, summary=f"{base['summary']} Candidate {i}.")
+        profiles.append(profile)
+        groups.append("welder" if i % 2 == 0 else "software")
+    return profiles, np.array(groups)
+
+
+def main(args) -> None:
+    jd = CANNED_RESPONSES["jd_parser"]
+    profiles, groups = build_pool(args.candidates)
+
+    start = time.perf_counter()
+    single = np.array([semantic_match(profile, jd)["semantic_score"] for profile in profiles])
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = semantic_scores(profiles, jd)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"candidates:        {args.candidates}")
+    print(f"per candidate:     {args.candidates / single_seconds:,.0f}/s ({single_seconds / args.candidates * 1000:.2f} ms each)")
+    print(f"batched:           {args.candidates / batch_seconds:,.0f}/s")
+    print(f"identical scores:  {bool(np.array_equal(single, np.rint(batched).astype(int)))}")
+    for group in ("welder", "software"):
+        print(f"mean score {group + ':':<9} {single[groups == group].mean():.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,53 @@
+"""
+Benchmark: batch triage (src/triage.py) over a synthetic requisition. Scores
+every resume text against the JD in one pass, keeps the top K / above the
+threshold, and reports triage time, how many candidates reach the full
+pipeline and the model calls that saves.
+
+    python -m benchmarks.bench_triage --resumes 1000 --top-k 50
+"""
+import time
+import argparse
+from collections import Counter
+
+from benchmarks.corpus import resume_lines
+from src.triage import triage
+
+JOB_DESCRIPTION = {
+    "job_title": "Welder",
+    "skills": ["MIG welding", "TIG welding", "Blueprint reading"],
+    "preferred_skills": ["OSHA safety"],
+    "experience": "2+ years",
+}
+
+
+def main(args) -> None:
+    texts = {f"resume_{seed:05d}.pdf": "\n".join(resume_lines(seed, args.lines)) for seed in range(args.resumes)}
+
+    start = time.perf_counter()
+    selected, report = triage(texts, JOB_DESCRIPTION, args.top_k, args.min_score)
+    seconds = time.perf_counter() - start
+
+    # One JD parse per batch either way; calls_per_candidate model calls per screened resume.
+    calls_before = 1 + args.resumes * args.calls_per_candidate
+    calls_after = 1 + len(selected) * args.calls_per_candidate
+    reasons = Counter(entry["reason"].split(" ")[0] + " ..." for entry in report.values() if not entry["selected"])
+    best = report[selected[0]] if selected else None
+
+    print(f"resumes:             {args.resumes} x {args.lines} lines")
+    print(f"triage time:         {seconds * 1000:.0f} ms ({seconds / args.resumes * 1000:.2f} ms per resume)")
+    print(f"sent to pipeline:    {len(selected)} (top_k={args.top_k}, min_score={args.min_score})")
+    print(f"filtered:            {args.resumes - len(selected)} {dict(reasons)}")
+    if best:
+        print(f"best triage score:   {best['triage_score']} (coverage {best['skill_coverage']}, similarity {best['similarity']})")
+    print(f"model calls:         {calls_before} -> {calls_after} ({calls_before / calls_after:.1f}x fewer)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=40, help="Text lines per resume.")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--min-score", type=float, default=0)
+    parser.add_argument("--calls-per-candidate", type=int, default=8, help="Model calls per pipeline run (8 with the default engines).")
+    main(parser.parse_args())
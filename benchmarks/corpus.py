@@ -0,0 +1,93 @@
+"""
+Synthetic resume corpus for the benchmarks: multi-page PDFs and DOCX files
+with realistic resume-like text, generated without extra dependencies.
+"""
+import os
+import random
+
+from docx import Document
+
+SKILLS = [
+    "MIG welding", "TIG welding", "Stick welding", "Blueprint reading", "OSHA safety",
+    "Electrical wiring", "PLC programming", "Conduit bending", "Preventive maintenance",
+    "Forklift operation", "Python", "SQL", "Project management", "Quality inspection",
+]
+TITLES = ["Welder", "Electrician", "Maintenance Mechanic", "Fabricator", "Pipefitter", "Data Analyst"]
+COMPANIES = ["AME Industries", "Building Works Manufacturing", "Kornsky Manufacturing", "Metro Utilities"]
+
+
+def resume_lines(seed: int, lines: int) -> list:
+    """
+    Returns deterministic resume-like text lines for a candidate.
+    """
+    rng = random.Random(seed)
+    out = [f"Candidate {seed}", f"{rng.choice(TITLES)} | candidate{seed}@example.com | +1 555 {seed:04d}"]
+    out.append("Skills: " + ", ".join(rng.sample(SKILLS, 5)))
+    while len(out) < lines:
+        out.append(
+            f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2005, 2020)} - {rng.randint(2021, 2025)}): "
+            f"used {rng.choice(SKILLS)} and {rng.choice(SKILLS)} on production work."
+        )
+    return out
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: int, seed: int = 0, lines_per_page: int = 40) -> None:
+    """
+    Writes a minimal valid PDF with one Helvetica text stream per page.
+    """
+    lines = resume_lines(seed, pages * lines_per_page)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        chunk = lines[page * lines_per_page:(page + 1) * lines_per_page]
+        body = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in chunk) + " ET"
+        objects.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref_offset = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        data += f"{offset:010d} 00000 n \n".encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def write_docx(path: str, pages: int, seed: int = 0, lines_per_page: int = 40) -> None:
+    """
+    Writes a DOCX with roughly pages * lines_per_page paragraphs.
+    """
+    doc = Document()
+    for line in resume_lines(seed, pages * lines_per_page):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def build_corpus(directory: str, page_counts, formats=("pdf", "docx")) -> list:
+    """
+    Writes one file per page count and format into directory; returns the paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for seed, pages in enumerate(page_counts):
+        for fmt in formats:
+            path = os.path.join(directory, f"resume_{seed:04d}_{pages}p.{fmt}")
+            if not os.path.exists(path):
+                (write_pdf if fmt == "pdf" else write_docx)(path, pages, seed)
+            paths.append(path)
+    return paths
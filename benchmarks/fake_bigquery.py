@@ -0,0 +1,37 @@
+"""
+In-process stand-in for bigquery.Client.insert_rows_json that records every
+batch, with optional per-call latency, transient failures and row rejection.
+"""
+import time
+import threading
+
+
+class FakeBigQueryClient:
+    def __init__(self, latency: float = 0.0, fail_first_calls: int = 0, reject=None):
+        """
+        fail_first_calls: number of initial calls that raise (transient errors).
+        reject: optional predicate; matching rows are returned as "invalid".
+        """
+        self.latency = latency
+        self.fail_first_calls = fail_first_calls
+        self.reject = reject
+        self.calls = 0
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def insert_rows_json(self, table, json_rows, row_ids=None, **kwargs):
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            if self.calls <= self.fail_first_calls:
+                raise ConnectionError("Simulated transient BigQuery failure")
+        errors = []
+        accepted = []
+        for index, row in enumerate(json_rows):
+            if self.reject and self.reject(row):
+                errors.append({"index": index, "errors": [{"reason": "invalid", "message": "Simulated bad row"}]})
+            else:
+                accepted.append(row)
+        with self._lock:
+            self.batches.append(accepted)
+        return errors
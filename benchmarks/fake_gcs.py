@@ -0,0 +1,59 @@
+"""
+In-process stand-in for the google-cloud-storage client API used by
+src.tools: client.bucket(), bucket.list_blobs(), bucket.rename_blob() and
+blob.download_as_bytes(). Downloads sleep for a fixed latency to mimic
+network round-trips.
+"""
+import time
+import threading
+
+
+class FakeBlob:
+    def __init__(self, bucket, name: str, data: bytes):
+        self.bucket = bucket
+        self.name = name
+        self.data = data
+
+    def download_as_bytes(self) -> bytes:
+        time.sleep(self.bucket.latency)
+        if self.name not in self.bucket.blobs:
+            raise FileNotFoundError(f"No such object: {self.bucket.name}/{self.name}")
+        return self.data
+
+
+class FakeBucket:
+    def __init__(self, name: str, latency: float = 0.0):
+        self.name = name
+        self.latency = latency
+        self.blobs = {}
+        self._lock = threading.Lock()
+
+    def upload(self, name: str, data: bytes) -> None:
+        with self._lock:
+            self.blobs[name] = FakeBlob(self, name, data)
+
+    def list_blobs(self, prefix: str = ""):
+        with self._lock:
+            names = sorted(name for name in self.blobs if name.startswith(prefix or ""))
+        for name in names:
+            blob = self.blobs.get(name)
+            if blob is not None:
+                yield blob
+
+    def rename_blob(self, blob, new_name: str):
+        with self._lock:
+            self.blobs.pop(blob.name)
+            self.blobs[new_name] = FakeBlob(self, new_name, blob.data)
+            return self.blobs[new_name]
+
+
+class FakeStorageClient:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.buckets = {}
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self.buckets.setdefault(name, FakeBucket(name, self.latency))
+
+    def list_blobs(self, bucket_name: str, prefix: str = ""):
+        return self.bucket(bucket_name).list_blobs(prefix=prefix)
@@ -0,0 +1,140 @@
+import json
+import random
+import asyncio
+from typing import AsyncGenerator
+
+from google.genai import errors, types
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+
+from src.model_client import RateLimitedLlm
+
+
+# --- Canned Responses ---
+# Schema-shaped outputs keyed by agent name, so downstream agents and the
+# save step receive realistic JSON without a network call.
+CANNED_RESPONSES = {
+    "extraction_formatter": {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "+1 555 0100",
+        "location": "Omaha, NE",
+        "summary": "Certified welder with 8 years of structural and pipe welding experience.",
+        "skills": ["MIG welding", "TIG welding", "Blueprint reading", "OSHA safety"],
+        "education": [{"degree": "Welding Technology Diploma", "institution": "Metro Community College"}],
+        "experience": [
+            {"job_title": "Structural Welder", "company": "AME Industries", "start_year": "2017",
+             "description": "Welded structural steel for commercial buildings."},
+        ],
+        "certifications": [{"name": "AWS Certified Welder", "provider": "American Welding Society"}],
+        "languages": ["English"],
+        "projects": [],
+    },
+    "jd_parser": {
+        "job_title": "Welder",
+        "skills": ["MIG welding", "TIG welding", "Blueprint reading"],
+        "experience": "2+ years",
+        "certifications": ["AWS Certified Welder"],
+    },
+    "profile_jd_matcher": {
+        "attribute_scores": {"skill_match": 90, "experience_match": 85, "education_match": 70,
+                             "certification_match": 100, "overall_fit": 86},
+    },
+    "semantic_scoring_agent": {"semantic_score": 84, "ranking": "Strong", "explanation": "Close match."},
+    "final_ranking_agent": {"final_score": 85, "ranking": "Strong", "summary": "Recommended for interview."},
+    "external_hr_enrichment_agent": {"linkedin_profile": "not found"},
+    "gap_flagging_agent": {"flagged_issues": [
+        {"issue": "Missing skill", "description": "No stick welding", "severity": "low", "resolution": "Assess"},
+    ]},
+    "interview_question_agent": {
+        "interview_questions": [{"category": "Technical", "question": "Describe a TIG weld you are proud of."}],
+        "skill_assessments": [{"assessment_type": "Practical", "description": "Weld test", "rationale": "Verify skill"}],
+    },
+    "Context_Saver": {"save_context_to_json_response": {"status": "saved"}},
+}
+
+
+class FakeLlm(BaseLlm):
+    """
+    Deterministic stand-in for Gemini used by the benchmarks.
+    Sleeps for latency (optionally +/- jitter, seeded per agent and call) and
+    returns canned JSON for its agent. Token counts are estimated at four
+    characters per token unless prompt_tokens / completion_tokens are set.
+    With error_rate, that share of calls (also seeded) fails with error_code
+    after the latency, like a quota (429) or server (5xx) error from Gemini.
+    """
+
+    agent_name: str = ""
+    latency: float = 0.0
+    jitter: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    transfer_to: str = ""
+    error_rate: float = 0.0
+    error_code: int = 429
+    calls: int = 0
+    injected_errors: int = 0
+
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        rng = random.Random(f"{self.agent_name}:{self.calls}")
+        return max(0.0, self.latency * (1 + rng.uniform(-self.jitter, self.jitter)))
+
+    def _raise_injected_error(self) -> None:
+        if not self.error_rate or random.Random(f"{self.agent_name}:{self.calls}:error").random() >= self.error_rate:
+            return
+        self.injected_errors += 1
+        error_class = errors.ClientError if self.error_code < 500 else errors.ServerError
+        raise error_class(self.error_code, {"error": {
+            "code": self.error_code, "message": "Injected by FakeLlm.", "status": "RESOURCE_EXHAUSTED" if self.error_code == 429 else "UNAVAILABLE",
+        }})
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        self._raise_injected_error()
+        if self.transfer_to:
+            part = types.Part(function_call=types.FunctionCall(
+                name="transfer_to_agent", args={"agent_name": self.transfer_to}
+            ))
+        else:
+            part = types.Part(text=json.dumps(CANNED_RESPONSES.get(self.agent_name, {})))
+        prompt_chars = sum(len(p.text or "") for c in llm_request.contents for p in (c.parts or []))
+        if llm_request.config and isinstance(llm_request.config.system_instruction, str):
+            prompt_chars += len(llm_request.config.system_instruction)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=self.prompt_tokens or prompt_chars // 4,
+                candidates_token_count=self.completion_tokens or len(part.text or "") // 4,
+            ),
+        )
+
+
+def install_fake_llm(agent, latency: float = 0.0, **fake_options) -> list:
+    """
+    Replaces the model of every LlmAgent in the tree with a FakeLlm.
+    fake_options (jitter, prompt_tokens, completion_tokens, error_rate,
+    error_code) are passed to each fake. A RateLimitedLlm wrapper is kept and
+    wraps the fake, so calls still go through the shared limiter.
+    Returns the installed fakes so callers can read their call counts.
+    """
+    fakes = []
+    if isinstance(agent, LlmAgent):
+        transfer_to = agent.sub_agents[0].name if agent.sub_agents else ""
+        fake = FakeLlm(
+            model="fake-llm", agent_name=agent.name, latency=latency, transfer_to=transfer_to, **fake_options
+        )
+        if isinstance(agent.model, RateLimitedLlm):
+            agent.model = agent.model.model_copy(update={"model": fake.model, "llm": fake})
+        else:
+            agent.model = fake
+        fakes.append(fake)
+    for sub_agent in agent.sub_agents:
+        fakes.extend(install_fake_llm(sub_agent, latency, **fake_options))
+    return fakes
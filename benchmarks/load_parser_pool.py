@@ -0,0 +1,96 @@
+"""
+Load test: latency of small requests while large PDFs are being parsed.
+
+A steady stream of small requests (a light handler: a short await and a
+small JSON round-trip) runs alongside back-to-back large-PDF extractions.
+The test is run with parsing inline on the event loop, in a thread, and in
+the process pool, and reports small-request p50/p99 latency for each.
+
+    python -m benchmarks.load_parser_pool --large-pages 80 --duration 10
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+from benchmarks.corpus import build_corpus
+from src.tools import extract_text_from_file
+from src.parser_pool import DocumentParserPool
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def small_requests(stop_at: float, interval: float) -> list:
+    latencies = []
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        json.loads(json.dumps({"status": "ok", "latencies": latencies[-10:]}))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def large_requests(large_path: str, parse, stop_at: float, concurrency: int) -> int:
+    parsed = 0
+
+    async def worker():
+        nonlocal parsed
+        while time.perf_counter() < stop_at:
+            await parse(large_path)
+            parsed += 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return parsed
+
+
+async def run_mode(mode: str, small_path: str, large_path: str, duration: float, workers: int, small_clients: int):
+    pool = None
+    if mode == "inline":
+        async def parse(path):
+            return extract_text_from_file(path)
+    elif mode == "thread":
+        async def parse(path):
+            return await asyncio.to_thread(extract_text_from_file, path)
+    else:
+        pool = DocumentParserPool(max_workers=workers)
+        await pool.extract_text(small_path)  # warm up the worker processes
+        parse = pool.extract_text
+
+    stop_at = time.perf_counter() + duration
+    results = await asyncio.gather(
+        large_requests(large_path, parse, stop_at, workers),
+        *[small_requests(stop_at, 0.02) for _ in range(small_clients)],
+    )
+    if pool is not None:
+        pool.shutdown()
+    latencies = [latency * 1000 for client in results[1:] for latency in client]
+    print(
+        f"{mode:<8} small requests={len(latencies):>5}  p50={statistics.median(latencies):8.1f} ms  "
+        f"p99={percentile(latencies, 99):8.1f} ms  max={max(latencies):8.1f} ms  large parsed={results[0]}"
+    )
+
+
+async def main(large_pages: int, duration: float, workers: int, small_clients: int, corpus_dir: str) -> None:
+    small_path, = build_corpus(corpus_dir, [1], formats=("docx",))
+    large_path, = build_corpus(os.path.join(corpus_dir, "large"), [large_pages], formats=("pdf",))
+    print(f"Large document: {large_pages} pages, {workers} concurrent large parses, {small_clients} small clients")
+    for mode in ("inline", "thread", "process"):
+        await run_mode(mode, small_path, large_path, duration, workers, small_clients)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--large-pages", type=int, default=80)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--small-clients", type=int, default=4)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "hr_bench_corpus"))
+    args = parser.parse_args()
+    asyncio.run(main(args.large_pages, args.duration, args.workers, args.small_clients, args.corpus_dir))
@@ -7,8 +7,25 @@ from google.adk.tools import FunctionTool
 from google.adk.agents import SequentialAgent, LoopAgent, ParallelAgent, LlmAgent
 from google.genai import types
 
-from src.schema import File_Inputs, ResumeOutput
-from src.tools import extract_text_from_file, fetch_linkedin_profile, save_context_to_json
+from src.schema import ResumeOutput
+from src.cache import canonical_hash
+from src.callbacks import (
+    project_state,
+    score_with_rules,
+    score_semantics_locally,
+    skip_below_score,
+    pin_local_semantic_score,
+    skip_if_state_present,
+    use_cached_jd,
+    store_jd_in_cache,
+    use_cached_resume,
+    store_resume_in_cache,
+)
+from src.scoring import MATCH_ENGINE
+from src.semantic import SEMANTIC_ENGINE
+from src.custom_agents import ExtractTextAgent, MergeContextAgent, PersistContextAgent
+from src.tools import fetch_linkedin_profile
+from src.model_client import shared_model
 
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO)
@@ -18,99 +35,75 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 model_name = os.getenv("MODEL")
 logger.info(f"Loaded model: {model_name}")
+# One rate-limited, retrying client shared by every agent (see src/model_client.py).
+llm = shared_model(model_name)
+# full: every stage runs for every candidate. conditional: enrichment, gap
+# flagging and interview questions only run when final_score >= EARLY_EXIT_MIN_SCORE.
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "full").strip().lower()
+EARLY_EXIT_MIN_SCORE = float(os.getenv("EARLY_EXIT_MIN_SCORE", "50"))
+if PIPELINE_MODE not in ("full", "conditional"):
+    raise ValueError(f"Unknown PIPELINE_MODE '{PIPELINE_MODE}'; expected full or conditional.")
 
 # --- 2. Tool Wrappers ---
-save_context_tool = FunctionTool(func=save_context_to_json)
 fetch_linkedin_tool = FunctionTool(func=fetch_linkedin_profile)
-logger.info("Registered tools: save_context_tool, fetch_linkedin_tool")
+logger.info("Registered tools: fetch_linkedin_tool")
 
 # --- 3. Agent Definitions ---
 
-extraction_agent = LlmAgent(
-    name="file_path_data_extractor",
-    description="Receives a file path to a resume (PDF or DOCX), uses the extract_text_from_file tool to extract all readable text from the file, and returns the raw extracted text exactly as found in the document, without any modification, inference, or reformatting. Handles unsupported file types with an appropriate error message.",
-    instruction="""
-    INSTRUCTIONS:
-    You will receive a user profile file path in the variable called profile_path.
-    Your task is to extract all readable text from the provided local file path (PDF, DOC, or DOCX).
-    - Use the 'extract_text_from_file' tool to process the file.
-    - Return the extracted text exactly as found in the document, without any modification, inference, or reformatting.
-    - If the file type is unsupported, return an appropriate error message.
-    """,
-    generate_content_config=types.GenerateContentConfig(temperature=0),
-    input_schema=File_Inputs,
-    tools=[FunctionTool(func=extract_text_from_file)],
-    output_key="extracted_text",
-)
-logger.info("Initialized extraction_agent")
-
-formatter_agent = LlmAgent(
-    name="extraction_formatter",
-    model=model_name,
-    description="Converts unstructured resume text into structured JSON data using the ResumeOutput Pydantic schema.",
-    instruction="""
+FORMATTER_INSTRUCTION = """
 You will receive resume text in the variable {{extracted_text}}.
 Your task:
 - Carefully parse the provided resume text and extract all relevant information *exactly* as it appears in the text. Do not add, infer, or modify any information.
 - Format the extracted information as a JSON object that strictly matches the ResumeOutput Pydantic schema. Ensure every field in the schema is present in the output. Use empty strings, empty lists, or None where data is missing in the extracted text.
 - If the input text does not appear to be a valid resume, or if you are unable to extract any information, return an appropriate error message.
 - Output a JSON object with fields: 'int_profile_data_json' contains all the fields of output schema.
-""",
+"""
+
+# Cached resumes are invalidated whenever the output schema or formatter prompt changes.
+RESUME_CACHE_VERSION = canonical_hash([ResumeOutput.model_json_schema(), FORMATTER_INSTRUCTION])
+logger.info(f"Resume cache version: {RESUME_CACHE_VERSION[:12]}")
+
+formatter_agent = LlmAgent(
+    name="extraction_formatter",
+    model=llm,
+    description="Converts unstructured resume text into structured JSON data using the ResumeOutput Pydantic schema.",
+    instruction=FORMATTER_INSTRUCTION,
     generate_content_config=types.GenerateContentConfig(temperature=0),
     output_schema=ResumeOutput,
     output_key="int_profile_data_json",
+    before_agent_callback=skip_if_state_present("int_profile_data_json"),
+    after_agent_callback=store_resume_in_cache(RESUME_CACHE_VERSION),
 )
 logger.info("Initialized formatter_agent")
 
-save_context_agent = LlmAgent(
+extraction_agent = ExtractTextAgent(
+    name="file_path_data_extractor",
+    description="Extracts all readable text from the resume at profile_path (PDF or DOCX) in the document parser pool and stores it unmodified in extracted_text, without an LLM call. Unsupported or unreadable files are stored as an error message.",
+    input_key="profile_path",
+    output_key="extracted_text",
+    before_agent_callback=use_cached_resume(RESUME_CACHE_VERSION),
+)
+logger.info("Initialized extraction_agent")
+
+save_context_agent = PersistContextAgent(
     name="Context_Saver",
-    model=model_name,
     description=(
-        "Saves the extracted profile data to a JSON file with the name 'Profile_Analysis_Result_.json'. "
-        "The file will contain the structured resume data extracted from the provided text. "
+        "Saves the merged context JSON by converting it with convert_gh_to_modified_json and writing it to the result sink "
+        "(BigQuery, JSONL or Parquet, set by RESULT_SINK), "
+        "directly from session state. Set SAVE_CONTEXT_MODE=async to return before the warehouse write finishes."
     ),
-    instruction="""
-You will receive resume text in the variable {{merged_context_json}}.
-Take filename from profile_path context variable and save the merged context JSON data to a file named 'Profile_Analysis_Result_<filename>_YYYYMMDD_HHMMSS.json'.
-For saving pass it to tool 'save_context_to_json' with the following parameters:
-    - context_data: the merged JSON object
-    - output_key: "Profile_Analysis_Result_json"
-Ensure the file is saved in the current working directory.
-and 
-- The output from tool will be dictionary, just return the dictionary with as JSON
-""",
-    generate_content_config=types.GenerateContentConfig(temperature=0),
-    tools=[save_context_tool],
+    input_key="merged_context_json",
     output_key="save_context",
 )
 logger.info("Initialized save_context_agent")
 
-merge_context_agent = LlmAgent(
+merge_context_agent = MergeContextAgent(
     name="merge_context_agent",
-    model=model_name,
     description=(
-        "Merges all available context variables (JSON outputs from previous agents) into a single JSON object. "
-        "Each merged entry is assigned a key corresponding to its context variable name. "
-        "The following context variables will be merged: "
-        "{{int_profile_data_json}}, {{attribute_scores}}, {{semantic_match}}, {{final_ranking}}, {{enriched_profile_json}}, {{flagged_gaps_json}}, {{interview_questions_json}}."
+        "Merges all available context variables (JSON outputs from previous agents) into a single JSON object "
+        "directly from session state, without an LLM call. Each merged entry is keyed by its context variable name; "
+        "missing or empty variables are skipped."
     ),
-    instruction="""
-You will receive multiple context variables, each containing JSON data from previous agents:
-- {{int_profile_data_json}}
-- {{attribute_scores}}
-- {{semantic_match}}
-- {{final_ranking}}
-- {{enriched_profile_json}}
-- {{flagged_gaps_json}}
-- {{interview_questions_json}}
-
-Your task:
-- For each context variable, assign its variable name as the key and its JSON content as the value.
-- Merge all such key-value pairs into a single JSON object.
-- Return the merged JSON object.
-- If any context variable is missing or empty, skip it.
-""",
-    generate_content_config=types.GenerateContentConfig(temperature=0),
     output_key="merged_context_json",
 )
 logger.info("Initialized merge_context_agent")
@@ -124,7 +117,7 @@ logger.info("Initialized profile_formation_agent")
 
 jd_agent = LlmAgent(
     name="jd_parser",
-    model=model_name,
+    model=llm,
     description="Parses the provided job description text and extracts structured requirements.",
     instruction="""
 You will receive a job description in the variable job_description.
@@ -135,9 +128,15 @@ Your task:
 """,
     generate_content_config=types.GenerateContentConfig(temperature=0),
     output_key="jd_json",
+    before_agent_callback=[skip_if_state_present("jd_json"), use_cached_jd],
+    after_agent_callback=store_jd_in_cache,
 )
 logger.info("Initialized jd_agent")
 
+# Standalone copy used to parse a job description once for a whole batch.
+batch_jd_agent = jd_agent.clone(update={"before_agent_callback": use_cached_jd})
+logger.info("Initialized batch_jd_agent")
+
 parallel_agent = ParallelAgent(
     name="resume_and_jd_parallel",
     description="Processes profile_path to profile_formation_agent and pass job_description key information to jd_agent in parallel.",
@@ -147,12 +146,12 @@ logger.info("Initialized parallel_agent")
 
 match_agent = Agent(
     name="profile_jd_matcher",
-    model=model_name,
+    model=llm,
     description="Compares structured resume data and job description to compute attribute match scores.",
     instruction="""
 You will receive:
-- Resume data in the variable {{int_profile_data_json}}
-- Job description data in the variable {{jd_json}}
+- Resume data in the variable {{profile_for_scoring}}
+- Job description data in the variable {{jd_for_scoring}}
 
 Your task:
 - Compare the resume data and job description data.
@@ -161,32 +160,59 @@ Your task:
 """,
     generate_content_config=types.GenerateContentConfig(temperature=0),
     output_key="attribute_scores",
+    before_agent_callback=(
+        [project_state("profile_for_scoring", "jd_for_scoring")]
+        if MATCH_ENGINE == "llm"
+        else [score_with_rules(MATCH_ENGINE), project_state("profile_for_scoring", "jd_for_scoring")]
+    ),
 )
-logger.info("Initialized match_agent")
+logger.info(f"Initialized match_agent (MATCH_ENGINE={MATCH_ENGINE})")
 
-semantic_scoring_agent = Agent(
-    name="semantic_scoring_agent",
-    model=model_name,
-    description="Performs semantic scoring and ranking of candidate profiles against job requirements using job-role ontologies.",
-    instruction="""
+SEMANTIC_SCORING_INSTRUCTION = """
 You will receive:
-- Resume data in the variable {{int_profile_data_json}}
-- Job description data in the variable {{jd_json}}
+- Resume data in the variable {{profile_for_scoring}}
+- Job description data in the variable {{jd_for_scoring}}
 
 Your task:
 - Analyze the candidate's qualifications and experience against the job requirements and project needs.
 - Use semantic similarity and job-role ontologies to assess the match between the candidate and the job.
 - Rank the candidate and provide a semantic match score (0-100), along with a brief explanation for the score.
 - Output a JSON object with fields: 'semantic_score', 'ranking', and 'explanation'.
-""",
+"""
+
+# SEMANTIC_ENGINE=local_explain: the score is computed locally, the LLM only explains it.
+SEMANTIC_EXPLAIN_INSTRUCTION = """
+You will receive:
+- Resume data in the variable {{profile_for_scoring}}
+- Job description data in the variable {{jd_for_scoring}}
+- A precomputed semantic match in the variable {{semantic_local}}
+
+Your task:
+- Explain in two or three sentences why the candidate received this semantic score, citing the strongest matches and the main gaps.
+- Do not change the score or ranking.
+- Output a JSON object with fields: 'semantic_score', 'ranking', and 'explanation', copying 'semantic_score' and 'ranking' from the precomputed match.
+"""
+
+if SEMANTIC_ENGINE == "llm":
+    semantic_callbacks = [project_state("profile_for_scoring", "jd_for_scoring")]
+else:
+    semantic_callbacks = [score_semantics_locally(SEMANTIC_ENGINE), project_state("profile_for_scoring", "jd_for_scoring")]
+
+semantic_scoring_agent = Agent(
+    name="semantic_scoring_agent",
+    model=llm,
+    description="Performs semantic scoring and ranking of candidate profiles against job requirements using job-role ontologies.",
+    instruction=SEMANTIC_EXPLAIN_INSTRUCTION if SEMANTIC_ENGINE == "local_explain" else SEMANTIC_SCORING_INSTRUCTION,
     generate_content_config=types.GenerateContentConfig(temperature=0),
     output_key="semantic_match",
+    before_agent_callback=semantic_callbacks,
+    after_agent_callback=pin_local_semantic_score if SEMANTIC_ENGINE == "local_explain" else None,
 )
-logger.info("Initialized semantic_scoring_agent")
+logger.info(f"Initialized semantic_scoring_agent (SEMANTIC_ENGINE={SEMANTIC_ENGINE})")
 
 final_ranking_agent = Agent(
     name="final_ranking_agent",
-    model=model_name,
+    model=llm,
     description="Aggregates attribute scores and semantic match to provide a final candidate ranking and summary.",
     instruction="""
 You will receive:
@@ -205,7 +231,7 @@ logger.info("Initialized final_ranking_agent")
 
 external_hr_enrichment_agent = Agent(
     name="external_hr_enrichment_agent",
-    model=model_name,
+    model=llm,
     description="Checks for LinkedIn profile URL in the candidate profile and fetches additional info if present. If LinkedIn URL is not found, returns a single line indicating this.",
     instruction="""
 You will receive structured resume data in the variable {{int_profile_data_json}}.
@@ -222,12 +248,12 @@ logger.info("Initialized external_hr_enrichment_agent")
 
 gap_flagging_agent = Agent(
     name="gap_flagging_agent",
-    model=model_name,
+    model=llm,
     description="Flags mismatches or gaps in candidate profiles, such as expired certifications or missing skills, and displays the results in JSON format.",
     instruction="""
 You will receive:
-- Enriched candidate profile in the variable {{enriched_profile_json}}
-- Job description data in the variable {{jd_json}}
+- Candidate profile, with any enrichment findings under 'enrichment', in the variable {{profile_for_review}}
+- Job description data in the variable {{jd_for_scoring}}
 
 Your task:
 - Analyze the candidate profile for mismatches or gaps (e.g., expired certifications, missing or critical skills).
@@ -236,18 +262,19 @@ Your task:
 - Display the flagged gaps and issues in JSON format.
 """,
     generate_content_config=types.GenerateContentConfig(temperature=0),
-    output_key="flagged_gaps_json"
+    output_key="flagged_gaps_json",
+    before_agent_callback=project_state("profile_for_review", "jd_for_scoring"),
 )
 logger.info("Initialized gap_flagging_agent")
 
 interview_question_agent = Agent(
     name="interview_question_agent",
-    model=model_name,
+    model=llm,
     description="Suggests interview questions or skill assessments based on the job role and candidate profile.",
     instruction="""
 You will receive:
-- Enriched candidate profile in the variable {{enriched_profile_json}}
-- Job description data in the variable {{jd_json}}
+- Candidate profile, with any enrichment findings under 'enrichment', in the variable {{profile_for_review}}
+- Job description data in the variable {{jd_for_scoring}}
 
 Your task:
 - Suggest relevant interview questions or skill assessments tailored to the job role and candidate's background.
@@ -256,21 +283,72 @@ Your task:
 - Similarly, each entry in the skill_assessments array should be an object containing the subfields assessment_type, description, and rationale.
 """,
     generate_content_config=types.GenerateContentConfig(temperature=0),
-    output_key="interview_questions_json"
+    output_key="interview_questions_json",
+    before_agent_callback=project_state("profile_for_review", "jd_for_scoring"),
 )
 logger.info("Initialized interview_question_agent")
 
+if PIPELINE_MODE == "conditional":
+    # Stage 2: scoring only; enrichment waits for the early-exit gate.
+    scoring_parallel_agent = ParallelAgent(
+        name="scoring_parallel",
+        description="Runs attribute scoring and semantic scoring in parallel once the resume and JD are structured.",
+        sub_agents=[match_agent, semantic_scoring_agent],
+    )
+    # Stage 4 is skipped entirely when final_ranking is below EARLY_EXIT_MIN_SCORE.
+    review_stage_agent = SequentialAgent(
+        name="enrichment_and_review",
+        description="Enriches the profile, then flags gaps and suggests interview questions, for candidates above the early-exit threshold.",
+        sub_agents=[
+            external_hr_enrichment_agent,
+            ParallelAgent(
+                name="gap_and_interview_parallel",
+                description="Runs gap flagging and interview question generation in parallel.",
+                sub_agents=[gap_flagging_agent, interview_question_agent],
+            ),
+        ],
+        before_agent_callback=skip_below_score(EARLY_EXIT_MIN_SCORE),
+    )
+    pipeline_stages = [
+        parallel_agent,                  # Resume & JD extraction
+        scoring_parallel_agent,          # Attribute & semantic scoring
+        final_ranking_agent,             # Final ranking
+        review_stage_agent,              # Early-exit gate, enrichment, gap flagging & interview questions
+    ]
+else:
+    # Stage 2 only needs int_profile_data_json and jd_json.
+    scoring_parallel_agent = ParallelAgent(
+        name="scoring_and_enrichment_parallel",
+        description="Runs attribute scoring, semantic scoring and profile enrichment in parallel once the resume and JD are structured.",
+        sub_agents=[
+            match_agent,                     # Attribute scoring
+            semantic_scoring_agent,          # Semantic scoring
+            external_hr_enrichment_agent,    # Enrich profile from HR systems
+        ],
+    )
+
+    # Stage 3 needs the scores (final ranking) or the enriched profile (gaps, questions).
+    review_parallel_agent = ParallelAgent(
+        name="ranking_and_review_parallel",
+        description="Runs final ranking, gap flagging and interview question generation in parallel.",
+        sub_agents=[
+            final_ranking_agent,             # Final ranking
+            gap_flagging_agent,              # Flag gaps/mismatches
+            interview_question_agent,        # Suggest interview questions
+        ],
+    )
+    pipeline_stages = [
+        parallel_agent,                  # Resume & JD extraction
+        scoring_parallel_agent,          # Attribute/semantic scoring & enrichment
+        review_parallel_agent,           # Final ranking, gap flagging & interview questions
+    ]
+logger.info(f"Initialized pipeline stages (PIPELINE_MODE={PIPELINE_MODE})")
+
 pipeline_agent = SequentialAgent(
     name="advanced_profile_jd_scoring_pipeline",
     description="Runs the full candidate-job matching, enrichment, compliance, recommendation, and dashboard pipeline.",
     sub_agents=[
-        parallel_agent,                  # Resume & JD extraction
-        match_agent,                     # Attribute scoring
-        semantic_scoring_agent,          # Semantic scoring
-        final_ranking_agent,             # Final ranking
-        external_hr_enrichment_agent,    # Enrich profile from HR systems
-        gap_flagging_agent,              # Flag gaps/mismatches
-        interview_question_agent,        # Suggest interview questions
+        *pipeline_stages,
         merge_context_agent,             # Merge all context variables into a single JSON object
         save_context_agent,              # Save the final merged context JSON
     ],
@@ -279,7 +357,7 @@ logger.info("Initialized pipeline_agent")
 
 root_agent = Agent(
     name="root_agent",
-    model=model_name,
+    model=llm,
     description=(
         "Coordinates the end-to-end candidate-job matching workflow: extracts and structures resume and job description, computes match scores, aggregates results, enriches candidate data, flags profile gaps, and displays all intermediate and final results."
     ),
@@ -312,6 +390,8 @@ root_agent = Agent(
     """,
     sub_agents=[pipeline_agent],
     output_key="merged_context_json",
+    # Deterministic routing, so the transfer call is replayable from the LLM response cache.
+    generate_content_config=types.GenerateContentConfig(temperature=0),
 )
 logger.info("Initialized root_agent")
 
@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import uuid
+import random
+import datetime
+import logging
+import threading
+from typing import Callable, Optional
+
+from google.cloud import bigquery
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+BQ_DATASET = os.getenv("BQ_DATASET", "candidate_cv")
+BQ_TABLE = os.getenv("BQ_TABLE", "welder_profile_v1")
+BQ_BATCH_MAX_ROWS = int(os.getenv("BQ_BATCH_MAX_ROWS", "500"))
+# Streaming inserts are limited to 10 MB per request; stay well below it.
+BQ_BATCH_MAX_BYTES = int(os.getenv("BQ_BATCH_MAX_BYTES", str(5 * 1024 * 1024)))
+BQ_FLUSH_INTERVAL_SECONDS = float(os.getenv("BQ_FLUSH_INTERVAL_SECONDS", "2"))
+BQ_MAX_RETRIES = int(os.getenv("BQ_MAX_RETRIES", "5"))
+BQ_RETRY_BASE_SECONDS = float(os.getenv("BQ_RETRY_BASE_SECONDS", "0.5"))
+BQ_DEAD_LETTER_PATH = os.getenv("BQ_DEAD_LETTER_PATH", "bigquery_dead_letter.jsonl")
+
+# Per-row error reasons that are worth retrying; anything else (e.g. "invalid")
+# goes straight to the dead-letter file.
+RETRYABLE_ROW_REASONS = {"stopped", "backendError", "timeout", "internalError"}
+
+
+class BigQueryBatchWriter:
+    """
+    Long-lived BigQuery streaming writer. Rows are buffered and sent by a
+    background thread in batches, flushed when the buffer reaches max_rows or
+    max_bytes or its oldest row is flush_interval old. One client is reused
+    for every batch. Failed batches are retried with jittered exponential
+    backoff; rows that still fail are appended to a dead-letter JSONL file.
+    """
+
+    def __init__(
+        self,
+        table: str = f"{BQ_DATASET}.{BQ_TABLE}",
+        max_rows: int = BQ_BATCH_MAX_ROWS,
+        max_bytes: int = BQ_BATCH_MAX_BYTES,
+        flush_interval: float = BQ_FLUSH_INTERVAL_SECONDS,
+        max_retries: int = BQ_MAX_RETRIES,
+        retry_base_seconds: float = BQ_RETRY_BASE_SECONDS,
+        dead_letter_path: Optional[str] = BQ_DEAD_LETTER_PATH,
+        client_factory: Callable = bigquery.Client,
+    ):
+        self.table = table
+        self.max_rows = max(1, max_rows)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.dead_letter_path = dead_letter_path
+        self.client_factory = client_factory
+        self._client = None
+        # (row, insert_id, size, enqueued_at) tuples, oldest first.
+        self._buffer: list = []
+        self._buffer_bytes = 0
+        self._oldest_at = 0.0
+        self._in_flight = False
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._dead_letter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.rows_enqueued = 0
+        self.rows_written = 0
+        self.insert_calls = 0
+        self.retries = 0
+        self.dead_lettered = 0
+
+    # --- Public API ---
+    def enqueue(self, rows) -> int:
+        """
+        Buffers one row (dict) or a list of rows; returns the number queued.
+        """
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BigQuery writer is closed.")
+            now = time.monotonic()
+            if not self._buffer:
+                self._oldest_at = now
+            for row in rows:
+                size = len(json.dumps(row, default=str))
+                self._buffer.append((row, uuid.uuid4().hex, size, now))
+                self._buffer_bytes += size
+            self.rows_enqueued += len(rows)
+            self._ensure_thread()
+            self._cond.notify_all()
+        return len(rows)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends everything buffered and waits for it; returns False on timeout.
+        """
+        with self._cond:
+            if self._thread is None:
+                return not self._buffer
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._buffer and not self._in_flight, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Flushes remaining rows and stops the background thread.
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "buffered_rows": len(self._buffer),
+                "buffered_bytes": self._buffer_bytes,
+                "rows_enqueued": self.rows_enqueued,
+                "rows_written": self.rows_written,
+                "insert_calls": self.insert_calls,
+                "retries": self.retries,
+                "dead_lettered": self.dead_lettered,
+            }
+
+    # --- Background Flushing ---
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="bigquery-writer", daemon=True)
+            self._thread.start()
+
+    def _batch_ready(self) -> bool:
+        if not self._buffer:
+            return False
+        return (
+            self._flush_requested
+            or self._closed
+            or len(self._buffer) >= self.max_rows
+            or (self.max_bytes and self._buffer_bytes >= self.max_bytes)
+            or time.monotonic() - self._oldest_at >= self.flush_interval
+        )
+
+    def _take_batch(self) -> list:
+        count, size = 0, 0
+        for _, _, row_size, _ in self._buffer:
+            if count and (count >= self.max_rows or (self.max_bytes and size + row_size > self.max_bytes)):
+                break
+            count += 1
+            size += row_size
+        batch, self._buffer = self._buffer[:count], self._buffer[count:]
+        self._buffer_bytes -= size
+        # Rows left behind keep their age, so the flush interval still bounds their latency.
+        self._oldest_at = self._buffer[0][3] if self._buffer else time.monotonic()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._batch_ready():
+                    if self._closed:
+                        return
+                    timeout = None
+                    if self._buffer:
+                        timeout = max(0.0, self.flush_interval - (time.monotonic() - self._oldest_at))
+                    self._cond.wait(timeout)
+                batch = self._take_batch()
+                self._in_flight = True
+            try:
+                self._write_batch([row for row, _, _, _ in batch], [insert_id for _, insert_id, _, _ in batch])
+            except Exception as e:
+                logger.exception(f"Unexpected BigQuery writer error: {e}")
+                self._dead_letter([row for row, _, _, _ in batch], f"Unexpected writer error: {e}")
+            finally:
+                with self._cond:
+                    self._in_flight = False
+                    if not self._buffer:
+                        self._flush_requested = False
+                    self._cond.notify_all()
+
+    # --- Writing ---
+    def _get_client(self):
+        if self._client is None:
+            self._client = self.client_factory()
+        return self._client
+
+    def _backoff(self, attempt: int) -> None:
+        delay = min(30.0, self.retry_base_seconds * (2 ** (attempt - 1)))
+        time.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _write_batch(self, rows: list, insert_ids: list) -> None:
+        """
+        Inserts one batch. Insert IDs stay fixed across retries so BigQuery
+        can de-duplicate rows that were written by a request that timed out.
+        """
+        attempt = 0
+        while rows:
+            try:
+                self.insert_calls += 1
+                errors = self._get_client().insert_rows_json(self.table, rows, row_ids=insert_ids)
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"BigQuery insert failed after {attempt} retries: {e}")
+                    self._dead_letter(rows, str(e))
+                    return
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"BigQuery insert failed ({e}); retry {attempt}/{self.max_retries}.")
+                self._backoff(attempt)
+                continue
+
+            failed = {error["index"]: error.get("errors", []) for error in errors or []}
+            self.rows_written += len(rows) - len(failed)
+            if not failed:
+                logger.info(f"Inserted {len(rows)} rows into BigQuery table {self.table}.")
+                return
+
+            retry_rows, retry_ids, rejected, rejected_errors = [], [], [], []
+            for index, row_errors in failed.items():
+                reasons = {error.get("reason") for error in row_errors}
+                if reasons and reasons <= RETRYABLE_ROW_REASONS and attempt < self.max_retries:
+                    retry_rows.append(rows[index])
+                    retry_ids.append(insert_ids[index])
+                else:
+                    rejected.append(rows[index])
+                    rejected_errors.append(row_errors)
+            if rejected:
+                logger.error(f"BigQuery rejected {len(rejected)} rows: {rejected_errors[:3]}")
+                self._dead_letter(rejected, rejected_errors)
+            rows, insert_ids = retry_rows, retry_ids
+            if rows:
+                attempt += 1
+                self.retries += 1
+                self._backoff(attempt)
+
+    def _dead_letter(self, rows: list, errors) -> None:
+        self.dead_lettered += len(rows)
+        if not self.dead_letter_path:
+            logger.error(f"Dropped {len(rows)} BigQuery rows (no dead-letter file configured).")
+            return
+        failed_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        per_row_errors = errors if isinstance(errors, list) else [errors] * len(rows)
+        with self._dead_letter_lock:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for row, row_errors in zip(rows, per_row_errors):
+                    record = {"table": self.table, "failed_at": failed_at, "errors": row_errors, "row": row}
+                    f.write(json.dumps(record, default=str) + "\n")
+        logger.warning(f"Wrote {len(rows)} rows to BigQuery dead-letter file {self.dead_letter_path}.")
+
+
+bigquery_writer = BigQueryBatchWriter()
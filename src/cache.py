@@ -0,0 +1,205 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+JD_CACHE_MAX_ENTRIES = int(os.getenv("JD_CACHE_MAX_ENTRIES", "256"))
+JD_CACHE_DIR = os.getenv("JD_CACHE_DIR", "")
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", "")
+
+
+# --- Utility Functions ---
+def canonical_hash(obj: Any) -> str:
+    """
+    Returns the SHA-256 of the canonical JSON encoding of obj, so dicts that
+    differ only in key order or whitespace hash the same.
+    """
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Returns the SHA-256 of a file's bytes, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# --- Cache ---
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache of JSON-serializable values, bounded by
+    entry count and optionally by serialized size, with an optional on-disk
+    store (one JSON file per key) that survives restarts. The disk store has
+    the same bounds: beyond them the least recently used files (by mtime,
+    refreshed on every read) are deleted.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, disk_dir: Optional[str] = None, max_bytes: int = 0):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or None
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: dict = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Disk entries (key -> file size), least recently used first.
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    # --- Disk Store ---
+    def _load_disk_index(self) -> None:
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        for _mtime, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._remove_files(self._track_disk(None, 0))
+
+    def _track_disk(self, key: Optional[str], size: int) -> list:
+        """
+        Records a disk write or read of key (None only sweeps) and returns the
+        keys whose files must go to respect the bounds.
+        """
+        with self._lock:
+            if key is not None:
+                self._disk_bytes += size - self._disk.get(key, 0)
+                self._disk[key] = size
+                self._disk.move_to_end(key)
+            victims = []
+            while len(self._disk) > self.max_entries or (self.max_bytes and self._disk_bytes > self.max_bytes and len(self._disk) > 1):
+                victim, victim_size = self._disk.popitem(last=False)
+                self._disk_bytes -= victim_size
+                victims.append(victim)
+        return victims
+
+    def _remove_files(self, keys: list) -> None:
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to evict {self.name} cache file {key}: {e}")
+        if keys:
+            logger.info(f"Evicted {len(keys)} {self.name} cache files from {self.disk_dir}.")
+
+    def _put_memory(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value, default=str)) if self.max_bytes else 0
+        self._total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries or (self.max_bytes and self._total_bytes > self.max_bytes and len(self._entries) > 1):
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(evicted_key, 0)
+
+    def get(self, key: str, version: Optional[str] = None) -> Optional[Any]:
+        """
+        Returns the cached value or None. When version is given, dict entries
+        whose "version" differs are dropped and treated as a miss.
+        """
+        value = None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                value = self._entries[key]
+        if value is None and self.disk_dir and os.path.exists(self._disk_path(key)):
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    value = json.load(f)
+                with self._lock:
+                    self._put_memory(key, value)
+                os.utime(self._disk_path(key))
+                self._remove_files(self._track_disk(key, os.path.getsize(self._disk_path(key))))
+            except Exception as e:
+                logger.warning(f"Failed to read {self.name} cache entry {key}: {e}")
+        if value is not None and version is not None and (not isinstance(value, dict) or value.get("version") != version):
+            logger.info(f"Dropping stale {self.name} cache entry {key}")
+            self.delete(key)
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops every in-memory entry and resets the counters (disk entries are
+        kept, within their bounds).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._total_bytes -= self._sizes.pop(key, 0)
+            self._disk_bytes -= self._disk.pop(key, 0)
+        if self.disk_dir and os.path.exists(self._disk_path(key)):
+            try:
+                os.remove(self._disk_path(key))
+            except OSError as e:
+                logger.warning(f"Failed to delete {self.name} cache entry {key}: {e}")
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._put_memory(key, value)
+        if self.disk_dir:
+            try:
+                tmp_path = self._disk_path(key) + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self._disk_path(key))
+                self._remove_files(self._track_disk(key, os.path.getsize(self._disk_path(key))))
+            except Exception as e:
+                logger.warning(f"Failed to write {self.name} cache entry {key}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+jd_cache = LRUCache("jd", max_entries=JD_CACHE_MAX_ENTRIES, disk_dir=JD_CACHE_DIR)
+resume_cache = LRUCache("resume", max_entries=100_000, disk_dir=RESUME_CACHE_DIR, max_bytes=RESUME_CACHE_MAX_BYTES)
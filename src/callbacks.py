@@ -0,0 +1,232 @@
+import re
+import json
+import asyncio
+import logging
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from src.cache import canonical_hash, file_sha256, jd_cache, resume_cache
+from src.custom_agents import parse_state_value
+from src.projections import PROJECTED_VIEWS
+from src.schema import ResumeOutput
+from src.scoring import score_profile
+from src.semantic import semantic_match
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+
+# --- Utility Functions ---
+def _state_value_content(value) -> types.Content:
+    """
+    Wraps a state value as the content returned by a skipping callback.
+    LlmAgent saves callback content to its output_key, so the content must be
+    the value itself rather than a status message.
+    """
+    text = value if isinstance(value, str) else json.dumps(value)
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+# --- Agent Callbacks ---
+def skip_if_state_present(state_key: str):
+    """
+    Builds a before_agent_callback that skips the agent when state_key is
+    already populated, e.g. jd_json parsed once for a whole batch.
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        value = callback_context.state.get(state_key)
+        if value:
+            logger.info(f"Skipping {callback_context.agent_name}: '{state_key}' already in state.")
+            return _state_value_content(value)
+        return None
+
+    return _callback
+
+
+def project_state(*view_keys: str):
+    """
+    Builds a before_agent_callback that writes compact, field-projected views
+    (see src/projections.py) to state, so the agent's instruction interpolates
+    only the fields it uses instead of the full upstream JSON.
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        for view_key in view_keys:
+            callback_context.state[view_key] = PROJECTED_VIEWS[view_key](callback_context.state)
+        return None
+
+    return _callback
+
+
+def score_with_rules(engine: str):
+    """
+    Builds a before_agent_callback for match_agent that computes attribute_scores
+    with the rule engine (src/scoring.py) and skips the LLM. With engine
+    "hybrid", the LLM still runs when the rules are not confident (free-text
+    requirements, unmatched skills, undated roles).
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        profile = parse_state_value(callback_context.state.get("int_profile_data_json"))
+        jd = parse_state_value(callback_context.state.get("jd_json"))
+        if not isinstance(profile, dict) or not isinstance(jd, dict):
+            if engine == "hybrid":
+                return None
+            profile = profile if isinstance(profile, dict) else {}
+            jd = jd if isinstance(jd, dict) else {}
+        attribute_scores, details = score_profile(profile, jd)
+        callback_context.state["attribute_score_details"] = details
+        if engine == "hybrid" and not details["confident"]:
+            logger.info(f"Rule scoring not confident ({'; '.join(details['fallback_reasons'])}); running {callback_context.agent_name}.")
+            return None
+        callback_context.state["attribute_scores"] = attribute_scores
+        logger.info(f"Attribute scores computed by rules; skipping {callback_context.agent_name}.")
+        return _state_value_content(attribute_scores)
+
+    return _callback
+
+
+def score_semantics_locally(engine: str):
+    """
+    Builds a before_agent_callback for semantic_scoring_agent that computes
+    semantic_match with the local similarity engine (src/semantic.py). With
+    engine "local" it skips the LLM; with "local_explain" it writes the result
+    to semantic_local and lets the LLM explain it (see pin_local_semantic_score).
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        profile = parse_state_value(callback_context.state.get("int_profile_data_json"))
+        jd = parse_state_value(callback_context.state.get("jd_json"))
+        result = semantic_match(profile if isinstance(profile, dict) else {}, jd if isinstance(jd, dict) else {})
+        if engine == "local_explain":
+            callback_context.state["semantic_local"] = json.dumps(result)
+            return None
+        callback_context.state["semantic_match"] = result
+        logger.info(f"Semantic score computed locally; skipping {callback_context.agent_name}.")
+        return _state_value_content(result)
+
+    return _callback
+
+
+def pin_local_semantic_score(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    after_agent_callback for semantic_scoring_agent with SEMANTIC_ENGINE=local_explain:
+    keeps the LLM's explanation but restores the local semantic_score and ranking,
+    so scores stay reproducible.
+    """
+    local = parse_state_value(callback_context.state.get("semantic_local"))
+    if not isinstance(local, dict):
+        return None
+    generated = parse_state_value(callback_context.state.get("semantic_match"))
+    explanation = generated.get("explanation") if isinstance(generated, dict) else None
+    callback_context.state["semantic_match"] = {**local, "explanation": explanation or local["explanation"]}
+    return None
+
+
+def _numeric_score(value) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"\d+(?:\.\d+)?", str(value or ""))
+    return float(match.group(0)) if match else None
+
+
+def skip_below_score(threshold: float, state_key: str = "final_ranking", field: str = "final_score"):
+    """
+    Builds a before_agent_callback for the post-ranking stages that skips them
+    when state_key's field is below threshold, and records screening_status
+    ("rejected" or "screened") for the merged record. A missing or unreadable
+    score never skips.
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        ranking = parse_state_value(callback_context.state.get(state_key))
+        score = _numeric_score(ranking.get(field)) if isinstance(ranking, dict) else None
+        if score is not None and score < threshold:
+            callback_context.state["screening_status"] = "rejected"
+            logger.info(f"{field} {score} below {threshold}; skipping {callback_context.agent_name}.")
+            return types.Content(role="model", parts=[types.Part(text=f"Rejected: {field} {score} below {threshold}; review skipped.")])
+        callback_context.state["screening_status"] = "screened"
+        return None
+
+    return _callback
+
+
+def use_cached_jd(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback for jd_agent: on a cache hit for job_description,
+    writes the cached jd_json to state and skips the LLM parse.
+    """
+    job_description = callback_context.state.get("job_description")
+    if not job_description:
+        return None
+    jd_json = jd_cache.get(canonical_hash(job_description))
+    if jd_json is None:
+        return None
+    callback_context.state["jd_json"] = jd_json
+    logger.info(f"JD cache hit; skipping {callback_context.agent_name}.")
+    return _state_value_content(jd_json)
+
+
+def store_jd_in_cache(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    after_agent_callback for jd_agent: caches a freshly parsed jd_json
+    under the canonical hash of job_description.
+    """
+    job_description = callback_context.state.get("job_description")
+    jd_json = callback_context.state.get("jd_json")
+    if job_description and isinstance(parse_state_value(jd_json), dict):
+        jd_cache.set(canonical_hash(job_description), jd_json)
+    return None
+
+
+def use_cached_resume(version: str):
+    """
+    Builds a before_agent_callback for the extraction agent: hashes the file at
+    profile_path and, on a cache hit for the current version, writes the cached
+    extracted_text and int_profile_data_json to state and skips extraction.
+    On a miss, records the hash in resume_cache_key for store_resume_in_cache.
+    """
+    async def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        profile_path = callback_context.state.get("profile_path")
+        if not isinstance(profile_path, str) or not profile_path:
+            return None
+        try:
+            cache_key = await asyncio.to_thread(file_sha256, profile_path)
+        except OSError as e:
+            logger.warning(f"Could not hash {profile_path} for the resume cache: {e}")
+            return None
+        callback_context.state["resume_cache_key"] = cache_key
+        cached = resume_cache.get(cache_key, version=version)
+        if cached is None:
+            return None
+        callback_context.state["extracted_text"] = cached["extracted_text"]
+        callback_context.state["int_profile_data_json"] = cached["int_profile_data_json"]
+        logger.info(f"Resume cache hit for {profile_path}; skipping {callback_context.agent_name}.")
+        return types.Content(role="model", parts=[types.Part(text="Resume loaded from cache; skipped.")])
+
+    return _callback
+
+
+def store_resume_in_cache(version: str):
+    """
+    Builds an after_agent_callback for formatter_agent that caches the raw text
+    and the ResumeOutput-validated profile under resume_cache_key.
+    """
+    def _callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        cache_key = callback_context.state.get("resume_cache_key")
+        profile = parse_state_value(callback_context.state.get("int_profile_data_json"))
+        if not cache_key or not isinstance(profile, dict):
+            return None
+        try:
+            profile = ResumeOutput.model_validate(profile).model_dump(exclude_none=True)
+        except ValueError as e:
+            logger.warning(f"Not caching resume {cache_key}: profile failed validation: {e}")
+            return None
+        resume_cache.set(cache_key, {
+            "version": version,
+            "extracted_text": callback_context.state.get("extracted_text"),
+            "int_profile_data_json": profile,
+        })
+        return None
+
+    return _callback
@@ -0,0 +1,195 @@
+import os
+import json
+import asyncio
+import logging
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from src.tools import save_context_to_json
+from src.parser_pool import extract_text_from_file_async
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+SAVE_CONTEXT_MODE = os.getenv("SAVE_CONTEXT_MODE", "sync").lower()
+
+# --- Constants ---
+MERGE_CONTEXT_KEYS = [
+    "int_profile_data_json",
+    "attribute_scores",
+    "semantic_match",
+    "final_ranking",
+    "enriched_profile_json",
+    "flagged_gaps_json",
+    "interview_questions_json",
+    # Only set with PIPELINE_MODE=conditional: "screened" or "rejected".
+    "screening_status",
+]
+# Context keys whose value is plain text rather than a JSON object.
+TEXT_CONTEXT_KEYS = {"screening_status"}
+
+
+# --- Utility Functions ---
+def parse_state_value(value):
+    """
+    Parses a session state value written by an LLM agent.
+    Strings are stripped of ```json code fences and decoded; anything that is
+    not valid JSON is returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if text.startswith("```"):
+        text = text.replace("```json", "").replace("```", "").strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return value
+
+
+# --- Background Saves ---
+# Strong references to fire-and-forget save tasks so they are not garbage
+# collected before they finish.
+_pending_saves: set = set()
+
+
+def _log_save_result(task: asyncio.Task) -> None:
+    _pending_saves.discard(task)
+    if task.cancelled():
+        logger.warning("Background context save was cancelled.")
+        return
+    result = task.exception() or task.result()
+    if isinstance(result, Exception) or (isinstance(result, dict) and "error" in result):
+        logger.error(f"Background context save failed: {result}")
+    else:
+        logger.info("Background context save completed.")
+
+
+async def drain_pending_saves() -> None:
+    """
+    Waits for all in-flight background saves, e.g. on application shutdown.
+    """
+    if _pending_saves:
+        logger.info(f"Waiting for {len(_pending_saves)} background context saves.")
+        await asyncio.gather(*list(_pending_saves), return_exceptions=True)
+
+
+# --- Custom Agents ---
+class MergeContextAgent(BaseAgent):
+    """
+    Merges the outputs of previous agents from session state into a single
+    JSON object keyed by state variable name, without an LLM call.
+    Missing or empty variables are skipped; values that should be JSON objects
+    but are not (e.g. LLM output that failed to parse) are logged and kept
+    under a raw_<key> entry instead.
+    """
+
+    context_keys: list[str] = MERGE_CONTEXT_KEYS
+    output_key: str = "merged_context_json"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        merged = {}
+        for key in self.context_keys:
+            value = parse_state_value(state.get(key))
+            if value in (None, "", {}, []):
+                continue
+            if key not in TEXT_CONTEXT_KEYS and not isinstance(value, dict):
+                logger.warning(f"State key {key} is not a JSON object; keeping it as raw_{key}.")
+                merged[f"raw_{key}"] = value
+                continue
+            merged[key] = value
+        logger.info(f"Merged context keys: {list(merged)}")
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: json.dumps(merged)}),
+        )
+
+
+class ExtractTextAgent(BaseAgent):
+    """
+    Extracts raw resume text from profile_path in the document parser pool and
+    writes it to session state, without an LLM echoing the text back.
+    profile_path is read from session state, falling back to the JSON user message.
+    Extraction is skipped when output_key is already populated.
+    """
+
+    input_key: str = "profile_path"
+    output_key: str = "extracted_text"
+
+    def _get_profile_path(self, ctx: InvocationContext):
+        profile_path = ctx.session.state.get(self.input_key)
+        if profile_path or not ctx.user_content or not ctx.user_content.parts:
+            return profile_path
+        message = parse_state_value(ctx.user_content.parts[0].text)
+        if isinstance(message, dict):
+            return message.get(self.input_key)
+        return None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        existing = ctx.session.state.get(self.output_key)
+        if isinstance(existing, str) and existing and not existing.startswith("Error"):
+            # Already extracted upstream, e.g. by batch triage.
+            logger.info(f"Skipping extraction: '{self.output_key}' already in state.")
+            return
+        profile_path = self._get_profile_path(ctx)
+        if not isinstance(profile_path, str) or not profile_path:
+            text = f"Error: no valid '{self.input_key}' provided."
+            logger.error(text)
+        else:
+            try:
+                text = await extract_text_from_file_async(profile_path)
+                logger.info(f"Extracted {len(text)} characters from {profile_path}")
+            except Exception as e:
+                logger.exception(f"Error extracting text from {profile_path}")
+                text = f"Error: {e}"
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: text}),
+        )
+
+
+class PersistContextAgent(BaseAgent):
+    """
+    Persists merged_context_json by calling save_context_to_json directly,
+    without an LLM re-emitting the document as tool arguments.
+    In "async" mode the write runs in the background and the pipeline
+    returns immediately with a queued status.
+    """
+
+    input_key: str = "merged_context_json"
+    output_key: str = "save_context"
+    mode: str = SAVE_CONTEXT_MODE
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        context_data = parse_state_value(ctx.session.state.get(self.input_key))
+        if not isinstance(context_data, dict):
+            result = {"error": f"No merged context found in '{self.input_key}'."}
+            logger.error(result["error"])
+        elif self.mode == "async":
+            task = asyncio.create_task(
+                asyncio.to_thread(save_context_to_json, context_data, "Profile_Analysis_Result_json")
+            )
+            _pending_saves.add(task)
+            task.add_done_callback(_log_save_result)
+            result = {"status": "queued"}
+        else:
+            result = await asyncio.to_thread(save_context_to_json, context_data, "Profile_Analysis_Result_json")
+
+        response_text = json.dumps({"save_context_to_json_response": result}, default=str)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=response_text)]),
+            actions=EventActions(state_delta={self.output_key: result}),
+        )
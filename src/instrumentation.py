@@ -0,0 +1,244 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.genai import types
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from prometheus_client import Counter, Histogram
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# USD per million tokens, used for the cost estimate (defaults: gemini-2.0-flash list price).
+MODEL_INPUT_PRICE_PER_MTOK = float(os.getenv("MODEL_INPUT_PRICE_PER_MTOK", "0.10"))
+MODEL_OUTPUT_PRICE_PER_MTOK = float(os.getenv("MODEL_OUTPUT_PRICE_PER_MTOK", "0.40"))
+# Completed per-request breakdowns kept for the debug field.
+TIMING_HISTORY_SIZE = int(os.getenv("TIMING_HISTORY_SIZE", "1024"))
+# In-flight runs tracked at once. Cancelled runs get no callback, so beyond
+# this the oldest are dropped and counted as abandoned.
+TIMING_MAX_ACTIVE_RUNS = int(os.getenv("TIMING_MAX_ACTIVE_RUNS", "1024"))
+
+# --- Prometheus Metrics ---
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+PIPELINE_SECONDS = Histogram(
+    "hr_pipeline_seconds", "Wall time of one pipeline run.", buckets=LATENCY_BUCKETS
+)
+PIPELINE_RUNS = Counter(
+    "hr_pipeline_runs_total", "Pipeline runs by outcome (ok, error, abandoned).", ["status"]
+)
+AGENT_SECONDS = Histogram(
+    "hr_agent_seconds", "Wall time per agent run.", ["agent", "output_key"], buckets=LATENCY_BUCKETS
+)
+AGENT_SKIPPED = Counter(
+    "hr_agent_skipped_total", "Agent runs short-circuited by a before callback (cache hit, skip).", ["agent", "output_key"]
+)
+MODEL_SECONDS = Histogram(
+    "hr_model_call_seconds", "Wall time per model call.", ["agent"], buckets=LATENCY_BUCKETS
+)
+MODEL_TOKENS = Counter(
+    "hr_model_tokens_total", "Model tokens by agent and kind (prompt, completion, cached).", ["agent", "output_key", "kind"]
+)
+MODEL_COST = Counter(
+    "hr_model_cost_usd_total", "Estimated model spend in USD.", ["agent", "output_key"]
+)
+TOOL_SECONDS = Histogram(
+    "hr_tool_seconds", "Wall time per tool call.", ["tool", "agent", "status"], buckets=LATENCY_BUCKETS
+)
+
+
+def _new_run() -> dict:
+    return {"started": time.perf_counter(), "agents": {}, "tools": [], "_starts": {}}
+
+
+class PipelineMetricsPlugin(BasePlugin):
+    """
+    Runner plugin that times every agent, model call and tool call, counts
+    prompt/completion tokens per agent, and exports them as Prometheus
+    metrics. It also keeps a per-invocation breakdown for the debug field.
+    Runs that raise are recorded as errors; at most max_active_runs runs are
+    tracked, the oldest beyond that being dropped as abandoned.
+    """
+
+    def __init__(
+        self,
+        name: str = "pipeline_metrics",
+        history_size: int = TIMING_HISTORY_SIZE,
+        max_active_runs: int = TIMING_MAX_ACTIVE_RUNS,
+    ):
+        super().__init__(name)
+        self.history_size = history_size
+        self.max_active_runs = max_active_runs
+        self._runs: "OrderedDict[str, dict]" = OrderedDict()
+        self._completed: "OrderedDict[str, dict]" = OrderedDict()
+        self._output_keys: dict = {}
+        self._lock = threading.Lock()
+
+    # --- Helpers ---
+    def _run(self, invocation_id: str) -> dict:
+        with self._lock:
+            run = self._runs.get(invocation_id)
+            if run is not None:
+                return run
+            run = self._runs[invocation_id] = _new_run()
+            abandoned = 0
+            while len(self._runs) > self.max_active_runs:
+                self._runs.popitem(last=False)
+                abandoned += 1
+        if abandoned:
+            PIPELINE_RUNS.labels("abandoned").inc(abandoned)
+            logger.warning(f"Dropped {abandoned} pipeline runs that never finished (cancelled or lost).")
+        return run
+
+    def _agent_entry(self, run: dict, agent_name: str) -> dict:
+        return run["agents"].setdefault(agent_name, {
+            "output_key": self._output_keys.get(agent_name, ""),
+            "seconds": None,
+            "model_calls": 0,
+            "model_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cost_usd": 0.0,
+        })
+
+    def pop_timings(self, invocation_id: str) -> Optional[dict]:
+        """
+        Returns and forgets the breakdown of a finished invocation.
+        """
+        with self._lock:
+            return self._completed.pop(invocation_id, None)
+
+    # --- Run Lifecycle ---
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> Optional[types.Content]:
+        self._run(invocation_context.invocation_id)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._finish(invocation_context.invocation_id)
+
+    async def on_run_error_callback(self, *, invocation_context: InvocationContext, error: Exception) -> None:
+        self._finish(invocation_context.invocation_id, error)
+
+    def _finish(self, invocation_id: str, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            run = self._runs.pop(invocation_id, None)
+        if run is None:
+            return
+        total = time.perf_counter() - run.pop("started")
+        PIPELINE_SECONDS.observe(total)
+        PIPELINE_RUNS.labels("error" if error is not None else "ok").inc()
+        if error is not None:
+            run["error"] = f"{type(error).__name__}: {error}"
+        for (kind, agent_name), _start in run.pop("_starts").items():
+            if kind != "agent":
+                continue
+            entry = self._agent_entry(run, agent_name)
+            # An agent that called the model but never finished handed off via
+            # transfer_to_agent; one that never called it was short-circuited
+            # by its before_agent_callback (cache hit or skip).
+            if not entry["model_calls"]:
+                entry["skipped"] = True
+                AGENT_SKIPPED.labels(agent_name, entry["output_key"]).inc()
+        run["total_seconds"] = round(total, 4)
+        run["total_prompt_tokens"] = sum(a["prompt_tokens"] for a in run["agents"].values())
+        run["total_completion_tokens"] = sum(a["completion_tokens"] for a in run["agents"].values())
+        run["total_cost_usd"] = round(sum(a["cost_usd"] for a in run["agents"].values()), 6)
+        with self._lock:
+            self._completed[invocation_id] = run
+            while len(self._completed) > self.history_size:
+                self._completed.popitem(last=False)
+
+    # --- Agents ---
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        self._output_keys.setdefault(agent.name, getattr(agent, "output_key", None) or "")
+        run = self._run(callback_context.invocation_id)
+        run["_starts"][("agent", agent.name)] = time.perf_counter()
+        return None
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> Optional[types.Content]:
+        run = self._run(callback_context.invocation_id)
+        start = run["_starts"].pop(("agent", agent.name), None)
+        if start is None:
+            return None
+        seconds = time.perf_counter() - start
+        entry = self._agent_entry(run, agent.name)
+        entry["seconds"] = round(seconds, 4)
+        AGENT_SECONDS.labels(agent.name, entry["output_key"]).observe(seconds)
+        return None
+
+    # --- Model Calls ---
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        run = self._run(callback_context.invocation_id)
+        run["_starts"][("model", callback_context.agent_name)] = time.perf_counter()
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        agent_name = callback_context.agent_name
+        run = self._run(callback_context.invocation_id)
+        entry = self._agent_entry(run, agent_name)
+        start = run["_starts"].pop(("model", agent_name), None)
+        if start is not None:
+            seconds = time.perf_counter() - start
+            entry["model_calls"] += 1
+            entry["model_seconds"] = round(entry["model_seconds"] + seconds, 4)
+            MODEL_SECONDS.labels(agent_name).observe(seconds)
+
+        usage = llm_response.usage_metadata
+        if usage is None:
+            return None
+        prompt = usage.prompt_token_count or 0
+        completion = (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+        cached = usage.cached_content_token_count or 0
+        cost = (prompt * MODEL_INPUT_PRICE_PER_MTOK + completion * MODEL_OUTPUT_PRICE_PER_MTOK) / 1_000_000
+        entry["prompt_tokens"] += prompt
+        entry["completion_tokens"] += completion
+        entry["cost_usd"] = round(entry["cost_usd"] + cost, 8)
+        output_key = entry["output_key"]
+        MODEL_TOKENS.labels(agent_name, output_key, "prompt").inc(prompt)
+        MODEL_TOKENS.labels(agent_name, output_key, "completion").inc(completion)
+        MODEL_TOKENS.labels(agent_name, output_key, "cached").inc(cached)
+        MODEL_COST.labels(agent_name, output_key).inc(cost)
+        return None
+
+    # --- Tools ---
+    def _record_tool(self, tool: BaseTool, tool_context: ToolContext, status: str) -> None:
+        run = self._run(tool_context.invocation_id)
+        start = run["_starts"].pop(("tool", tool_context.function_call_id), None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        run["tools"].append({
+            "tool": tool.name, "agent": tool_context.agent_name, "seconds": round(seconds, 4), "status": status
+        })
+        TOOL_SECONDS.labels(tool.name, tool_context.agent_name, status).observe(seconds)
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext) -> Optional[dict]:
+        run = self._run(tool_context.invocation_id)
+        run["_starts"][("tool", tool_context.function_call_id)] = time.perf_counter()
+        return None
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, result: dict
+    ) -> Optional[dict]:
+        self._record_tool(tool, tool_context, "ok")
+        return None
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext, error: Exception
+    ) -> Optional[dict]:
+        self._record_tool(tool, tool_context, "error")
+        return None
+
+
+pipeline_metrics = PipelineMetricsPlugin()
@@ -0,0 +1,334 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Awaitable, Callable, Optional
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+JOB_QUEUE_DB = os.getenv("JOB_QUEUE_DB", "jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+# A running job older than this is assumed orphaned (crashed worker) and re-queued.
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "1800"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Jobs failing with a transient error (quota, model outage) are re-queued after
+# JOB_RETRY_BASE_SECONDS * 2^(attempt - 1), capped at JOB_RETRY_MAX_SECONDS.
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "600"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+
+# Lower number = served first.
+PRIORITY_LANES = {"urgent": 0, "normal": 1, "bulk": 2}
+LANE_NAMES = {value: name for name, value in PRIORITY_LANES.items()}
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobQueue:
+    """
+    Persistent SQLite job queue with priority lanes. Jobs move from queued to
+    running to succeeded, failed or cancelled. A running job whose worker died
+    is re-queued once it is JOB_STALE_SECONDS old, up to max_attempts runs.
+    A job that failed transiently is re-queued by retry() and not claimed
+    again before its backoff has passed.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOB_QUEUE_DB,
+        stale_seconds: float = JOB_STALE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_base_seconds: float = JOB_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = JOB_RETRY_MAX_SECONDS,
+    ):
+        self.db_path = db_path
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                available_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, created_at);
+            """
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "available_at" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN available_at REAL")
+
+    # --- Producer API ---
+    def submit(self, payload: dict, priority: str = "normal") -> str:
+        if priority not in PRIORITY_LANES:
+            raise ValueError(f"Unknown priority '{priority}'; expected one of {', '.join(PRIORITY_LANES)}.")
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, priority, status, payload, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, PRIORITY_LANES[priority], json.dumps(payload), time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Returns the job record (with its queue position while queued), or None.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = {
+                "job_id": row["id"],
+                "status": row["status"],
+                "priority": LANE_NAMES.get(row["priority"], str(row["priority"])),
+                "attempts": row["attempts"],
+                "created_at": row["created_at"],
+                "started_at": row["started_at"],
+                "finished_at": row["finished_at"],
+                "available_at": row["available_at"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"],
+            }
+            if row["status"] == "queued":
+                job["position"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                    "(priority < ? OR (priority = ? AND created_at < ?))",
+                    (row["priority"], row["priority"], row["created_at"]),
+                ).fetchone()[0]
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a queued job; returns False if it is unknown or already started.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    # --- Worker API ---
+    def claim(self) -> Optional[tuple]:
+        """
+        Atomically marks the next job (highest lane, oldest first) whose retry
+        backoff has passed as running and returns (job_id, payload), or None
+        when no job is ready.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._recover_stale(now)
+                row = self._conn.execute(
+                    "SELECT id, payload FROM jobs WHERE status = 'queued' AND (available_at IS NULL OR available_at <= ?) "
+                    "ORDER BY priority, created_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (row["id"], json.loads(row["payload"])) if row is not None else None
+
+    def _recover_stale(self, now: float) -> None:
+        cutoff = now - self.stale_seconds
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', finished_at = ?, error = 'Worker lost; attempts exhausted.' "
+            "WHERE status = 'running' AND started_at < ? AND attempts >= ?",
+            (now, cutoff, self.max_attempts),
+        )
+        recovered = self._conn.execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+            (cutoff,),
+        ).rowcount
+        if recovered:
+            logger.warning(f"Re-queued {recovered} stale running jobs.")
+
+    def complete(self, job_id: str, result) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, finished_at = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+
+    def retry(self, job_id: str, error: str, min_delay: float = 0.0) -> bool:
+        """
+        Re-queues a running job that failed transiently, with exponential
+        backoff (at least min_delay seconds). Fails it instead once it has run
+        max_attempts times. Returns True if the job was re-queued.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = 'running'", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row["attempts"]
+            if attempts >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (f"{error} (attempts exhausted)", now, job_id),
+                )
+                return False
+            delay = max(min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1)), min_delay)
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, error = ?, available_at = ? WHERE id = ?",
+                (error, now + delay, job_id),
+            )
+        logger.warning(f"Job {job_id} failed transiently (attempt {attempts}/{self.max_attempts}); retrying in {delay:.1f}s: {error}")
+        return True
+
+    def release(self, job_id: str) -> None:
+        """
+        Puts a running job back in the queue (e.g. when the server shuts down).
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, attempts = MAX(attempts - 1, 0) "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    # --- Maintenance ---
+    def purge_finished(self, older_than_seconds: float = JOB_RETENTION_SECONDS) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN {FINISHED_STATUSES} AND finished_at < ?",
+                (time.time() - older_than_seconds,),
+            ).rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, priority, COUNT(*) AS n FROM jobs GROUP BY status, priority"
+            ).fetchall()
+        stats = {"by_status": {}, "queued_by_lane": {lane: 0 for lane in PRIORITY_LANES}}
+        for row in rows:
+            stats["by_status"][row["status"]] = stats["by_status"].get(row["status"], 0) + row["n"]
+            if row["status"] == "queued":
+                stats["queued_by_lane"][LANE_NAMES.get(row["priority"], str(row["priority"]))] += row["n"]
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """
+    Runs num_workers asyncio workers that drain a JobQueue through handler
+    (an async function taking the job payload and returning its result).
+    Workers wake up on submit() in this process and poll for jobs submitted
+    by other processes sharing the database. Errors for which is_transient
+    returns True re-queue the job with backoff (see JobQueue.retry); any
+    other error fails it.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[dict], Awaitable],
+        num_workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+        retention_seconds: float = JOB_RETENTION_SECONDS,
+        is_transient: Optional[Callable[[Exception], bool]] = None,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.is_transient = is_transient
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list = []
+
+    async def submit(self, payload: dict, priority: str = "normal") -> str:
+        job_id = await asyncio.to_thread(self.queue.submit, payload, priority)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.num_workers)]
+        self._tasks.append(asyncio.create_task(self._maintenance()))
+        logger.info(f"Started {self.num_workers} job workers on {self.queue.db_path}.")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            claimed = await asyncio.to_thread(self.queue.claim)
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            job_id, payload = claimed
+            logger.info(f"Worker {worker_id} running job {job_id}.")
+            try:
+                result = await self.handler(payload)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self.queue.release, job_id)
+                raise
+            except Exception as e:
+                if self.is_transient is not None and self.is_transient(e):
+                    # Honour a server retry hint (e.g. ModelUnavailableError.retry_after).
+                    min_delay = getattr(e, "retry_after", 0) or 0
+                    if not await asyncio.to_thread(self.queue.retry, job_id, str(e), min_delay):
+                        logger.error(f"Job {job_id} failed after {self.queue.max_attempts} attempts: {e}")
+                    continue
+                logger.exception(f"Job {job_id} failed")
+                await asyncio.to_thread(self.queue.fail, job_id, str(e))
+            else:
+                await asyncio.to_thread(self.queue.complete, job_id, result)
+                logger.info(f"Job {job_id} succeeded.")
+
+    async def _maintenance(self) -> None:
+        while True:
+            purged = await asyncio.to_thread(self.queue.purge_finished, self.retention_seconds)
+            if purged:
+                logger.info(f"Purged {purged} finished jobs.")
+            await asyncio.sleep(600)
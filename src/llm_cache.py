@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from prometheus_client import Counter
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# Off by default; the store file is only created when the cache is enabled.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.sqlite3")
+# 0 disables the limit.
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+# Session state flag set by the API when a request carries the bypass header.
+BYPASS_STATE_KEY = "llm_cache_bypass"
+# Per-invocation state (temp: keys are never persisted): the pending cache key
+# of each agent's model call.
+PENDING_KEY_PREFIX = "temp:llm_cache_key:"
+# Request config fields that do not change the model output.
+_IGNORED_CONFIG_FIELDS = {"labels", "http_options"}
+# Size is checked (and LRU entries evicted) every this many writes.
+_EVICTION_INTERVAL = 50
+
+LLM_CACHE_LOOKUPS = Counter("hr_llm_cache_total", "LLM response cache lookups by result.", ["agent", "result"])
+
+
+class ResponseStore:
+    """
+    SQLite store of serialized LlmResponses keyed by request hash. Entries
+    expire after ttl_seconds; beyond max_bytes the least recently used are
+    evicted.
+    """
+
+    def __init__(self, db_path: str = LLM_CACHE_DB, ttl_seconds: float = LLM_CACHE_TTL_SECONDS, max_mb: float = LLM_CACHE_MAX_MB):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._writes = 0
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                agent TEXT NOT NULL,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access);
+            """
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and row[1] < now - self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, agent: str, model: Optional[str], response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, agent, model, response, len(response), now, now),
+            )
+            self._writes += 1
+            if self._writes % _EVICTION_INTERVAL == 0:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        if not self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop the least recently used entries until 90% of the limit is free again.
+        excess = total - int(self.max_bytes * 0.9)
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if excess <= 0:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            excess -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} LLM cache entries over the {self.max_bytes} byte limit.")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"db_path": self.db_path, "entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def request_key(agent_name: str, llm_request: LlmRequest) -> Optional[str]:
+    """
+    Hashes everything that determines a temperature-0 response: agent, model,
+    generation config (system instruction with its interpolated state, tools,
+    schema) and the conversation contents. Returns None for requests that are
+    not cacheable (temperature unset or above 0).
+    """
+    config = llm_request.config
+    if config is None or config.temperature != 0:
+        return None
+    payload = {
+        "agent": agent_name,
+        "model": llm_request.model,
+        "config": config.model_dump(mode="json", exclude_none=True, exclude=_IGNORED_CONFIG_FIELDS),
+        "contents": [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LlmResponseCachePlugin(BasePlugin):
+    """
+    Runner plugin that answers repeated temperature-0 model calls from a
+    ResponseStore instead of calling the model. Sessions with
+    state[BYPASS_STATE_KEY] set skip the lookup but still refresh the entry.
+    Only complete, error-free responses are stored. The key of a call that
+    reaches the model is kept in temp: session state until its response
+    arrives, so failed or cancelled calls leave nothing behind.
+    """
+
+    def __init__(self, store: Optional[ResponseStore] = None, name: str = "llm_response_cache"):
+        super().__init__(name)
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        if self.store is None:
+            return None
+        agent_name = callback_context.agent_name
+        try:
+            key = request_key(agent_name, llm_request)
+        except Exception as e:
+            logger.warning(f"Not caching {agent_name} model call: request not serializable: {e}")
+            return None
+        state = callback_context.state
+        if key is None:
+            return None
+        if state.get(BYPASS_STATE_KEY):
+            cached = None
+            self.bypassed += 1
+            LLM_CACHE_LOOKUPS.labels(agent_name, "bypass").inc()
+        else:
+            cached = await asyncio.to_thread(self.store.get, key)
+            if cached is not None:
+                self.hits += 1
+                LLM_CACHE_LOOKUPS.labels(agent_name, "hit").inc()
+                logger.info(f"LLM cache hit for {agent_name}.")
+                return LlmResponse.model_validate_json(cached)
+            self.misses += 1
+            LLM_CACHE_LOOKUPS.labels(agent_name, "miss").inc()
+        state[PENDING_KEY_PREFIX + agent_name] = key
+        return None
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        if llm_response.partial or self.store is None:
+            return None
+        state = callback_context.state
+        pending = PENDING_KEY_PREFIX + callback_context.agent_name
+        key = state.get(pending)
+        if key is None:
+            return None
+        state[pending] = None
+        if llm_response.error_code or not llm_response.content or not llm_response.content.parts:
+            return None
+        await asyncio.to_thread(
+            self.store.set,
+            key,
+            callback_context.agent_name,
+            None,
+            llm_response.model_dump_json(exclude_none=True),
+        )
+        return None
+
+    async def on_model_error_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception) -> Optional[LlmResponse]:
+        pending = PENDING_KEY_PREFIX + callback_context.agent_name
+        if callback_context.state.get(pending) is not None:
+            callback_context.state[pending] = None
+        return None
+
+    def stats(self) -> dict:
+        stats = {"enabled": self.store is not None, "hits": self.hits, "misses": self.misses, "bypassed": self.bypassed}
+        if self.store is not None:
+            stats.update(self.store.stats())
+        return stats
+
+
+llm_response_cache = LlmResponseCachePlugin(ResponseStore() if LLM_CACHE_ENABLED else None)
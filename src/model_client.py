@@ -0,0 +1,346 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Optional, Union
+
+import httpx
+from google.genai import errors as genai_errors
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from prometheus_client import Counter, Gauge
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# Per-process quota: divide the project quota by the number of worker processes. 0 = unlimited.
+MODEL_RPM = float(os.getenv("MODEL_RPM", "0"))
+MODEL_TPM = float(os.getenv("MODEL_TPM", "0"))
+# Bucket size as seconds of quota: bursts up to this much run without waiting.
+MODEL_RATE_BURST_SECONDS = float(os.getenv("MODEL_RATE_BURST_SECONDS", "10"))
+MODEL_MAX_RETRIES = int(os.getenv("MODEL_MAX_RETRIES", "4"))
+MODEL_RETRY_BASE_SECONDS = float(os.getenv("MODEL_RETRY_BASE_SECONDS", "1"))
+MODEL_RETRY_MAX_SECONDS = float(os.getenv("MODEL_RETRY_MAX_SECONDS", "30"))
+# Consecutive server/connection failures that open the circuit; 0 disables the breaker.
+MODEL_BREAKER_THRESHOLD = int(os.getenv("MODEL_BREAKER_THRESHOLD", "5"))
+MODEL_BREAKER_COOLDOWN_SECONDS = float(os.getenv("MODEL_BREAKER_COOLDOWN_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+# Rough prompt size estimate used to reserve TPM before the call; corrected from usage_metadata after.
+CHARS_PER_TOKEN = 4
+
+MODEL_RETRIES = Counter("hr_model_retries_total", "Model call retries by reason.", ["reason"])
+MODEL_THROTTLE_SECONDS = Counter("hr_model_throttle_seconds_total", "Seconds model calls waited for rate limit tokens.", ["bucket"])
+MODEL_REJECTED = Counter("hr_model_rejected_total", "Model calls failed fast while the circuit was open.")
+MODEL_CIRCUIT_OPEN = Gauge("hr_model_circuit_open", "1 while the model circuit breaker is open.")
+
+
+class ModelUnavailableError(RuntimeError):
+    """
+    The model cannot be called right now: the circuit is open, or a retryable
+    error persisted through every retry. retry_after is a hint in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Refills per_minute tokens per minute, holding at most burst_seconds'
+    worth. Waiters are served in arrival order. per_minute <= 0 disables the
+    bucket.
+    """
+
+    def __init__(self, name: str, per_minute: float, burst_seconds: float = MODEL_RATE_BURST_SECONDS):
+        self.name = name
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * burst_seconds / 60)
+        self.tokens = self.capacity
+        self.waited_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """
+        Waits until amount tokens are available and takes them; returns the
+        seconds waited. Requests larger than the bucket take it whole.
+        """
+        if self.per_minute <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) * 60 / self.per_minute)
+                self._refill()
+            self.tokens -= amount
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.waited_seconds += waited
+            MODEL_THROTTLE_SECONDS.labels(self.name).inc(waited)
+        return waited
+
+    def adjust(self, amount: float) -> None:
+        """
+        Takes (or with a negative amount, returns) tokens after the fact, e.g.
+        when a call used more tokens than reserved. The bucket may go negative.
+        """
+        if self.per_minute > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failures and rejects calls for
+    cooldown_seconds; then lets one trial call through (half-open), which
+    closes the circuit on success or re-opens it on failure.
+    """
+
+    def __init__(self, threshold: int, cooldown_seconds: float):
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def check(self) -> None:
+        """
+        Raises ModelUnavailableError while the circuit is open.
+        """
+        if self.state == "closed":
+            return
+        remaining = self._opened_at + self.cooldown_seconds - time.monotonic()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        MODEL_REJECTED.inc()
+        raise ModelUnavailableError(
+            f"Model circuit is open after {self.failures} consecutive failures; not calling the model.",
+            retry_after=max(remaining, 1.0),
+        )
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Model circuit closed.")
+            MODEL_CIRCUIT_OPEN.set(0)
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        Ends a half-open trial call that neither succeeded nor failed (cancelled).
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.threshold > 0 and (self.state == "half_open" or self.failures >= self.threshold):
+            if self.state != "open":
+                self.opened += 1
+                logger.warning(f"Model circuit opened after {self.failures} consecutive failures.")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            MODEL_CIRCUIT_OPEN.set(1)
+
+
+def retry_reason(error: Exception) -> Optional[str]:
+    """
+    Returns a short label if error is worth retrying (quota, server error,
+    timeout, dropped connection), else None.
+    """
+    if isinstance(error, genai_errors.APIError):
+        return str(error.code) if error.code in RETRYABLE_STATUS_CODES else None
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(error, (ConnectionError, httpx.TransportError)):
+        return "connection"
+    return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    True if error, or an error it was raised from, is a model outage or a
+    retryable model error, i.e. the same request may succeed later.
+    """
+    while error is not None:
+        if isinstance(error, ModelUnavailableError) or retry_reason(error) is not None:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _server_retry_delay(error: Exception) -> float:
+    """
+    Seconds the API asked us to wait (google.rpc.RetryInfo "retryDelay": "12s"), or 0.
+    """
+    details = getattr(error, "details", None)
+    if not isinstance(details, dict):
+        return 0.0
+    for detail in (details.get("error") or {}).get("details") or []:
+        if isinstance(detail, dict) and str(detail.get("@type", "")).endswith("RetryInfo"):
+            try:
+                return float(str(detail.get("retryDelay", "0")).rstrip("s"))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+def _estimate_tokens(llm_request: LlmRequest) -> int:
+    chars = sum(len(part.text or "") for content in llm_request.contents for part in (content.parts or []))
+    config = llm_request.config
+    if config is not None and isinstance(config.system_instruction, str):
+        chars += len(config.system_instruction)
+    max_output = (config.max_output_tokens if config is not None else None) or 0
+    return chars // CHARS_PER_TOKEN + max_output
+
+
+class ModelCallLimiter:
+    """
+    Process-wide budget shared by every agent's model calls: requests-per-
+    minute and tokens-per-minute buckets, retry policy and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        rpm: float = MODEL_RPM,
+        tpm: float = MODEL_TPM,
+        burst_seconds: float = MODEL_RATE_BURST_SECONDS,
+        max_retries: int = MODEL_MAX_RETRIES,
+        retry_base_seconds: float = MODEL_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = MODEL_RETRY_MAX_SECONDS,
+        breaker_threshold: int = MODEL_BREAKER_THRESHOLD,
+        breaker_cooldown_seconds: float = MODEL_BREAKER_COOLDOWN_SECONDS,
+    ):
+        self.requests = TokenBucket("requests", rpm, burst_seconds)
+        self.tokens = TokenBucket("tokens", tpm, burst_seconds)
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown_seconds)
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Full-jitter exponential backoff, at least what the server asked for.
+        """
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt)
+        return min(self.retry_max_seconds, max(random.uniform(0, ceiling), _server_retry_delay(error)))
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rpm": self.requests.per_minute,
+            "tpm": self.tokens.per_minute,
+            "throttled_seconds": {"requests": round(self.requests.waited_seconds, 3), "tokens": round(self.tokens.waited_seconds, 3)},
+            "circuit": {"state": self.breaker.state, "consecutive_failures": self.breaker.failures, "opened": self.breaker.opened},
+        }
+
+
+class RateLimitedLlm(BaseLlm):
+    """
+    Wraps an agent's model so every call goes through a shared
+    ModelCallLimiter: waits for RPM/TPM tokens, retries retryable errors with
+    jittered exponential backoff and fails fast with ModelUnavailableError
+    while the circuit is open. The wrapped model is resolved from the
+    registry by name on first use unless llm is given.
+    """
+
+    llm: Optional[BaseLlm] = None
+    limiter: Any = None
+
+    def _inner(self) -> BaseLlm:
+        if self.llm is None:
+            self.llm = LLMRegistry.new_llm(self.model)
+        return self.llm
+
+    @property
+    def capabilities(self):
+        return self._inner().capabilities
+
+    def connect(self, llm_request: LlmRequest):
+        return self._inner().connect(llm_request)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        limiter: ModelCallLimiter = self.limiter
+        llm = self._inner()
+        reserved = _estimate_tokens(llm_request)
+        for attempt in range(limiter.max_retries + 1):
+            limiter.breaker.check()
+            await limiter.requests.acquire(1)
+            await limiter.tokens.acquire(reserved)
+            limiter.calls += 1
+            started = False
+            try:
+                async for response in llm.generate_content_async(llm_request, stream=stream):
+                    started = True
+                    usage = response.usage_metadata
+                    if not response.partial and usage is not None and usage.total_token_count:
+                        limiter.tokens.adjust(usage.total_token_count - reserved)
+                    yield response
+                limiter.breaker.record_success()
+                return
+            except Exception as e:
+                reason = retry_reason(e)
+                # The service answered: quota errors mean "slow down" and other
+                # client errors are the request's fault, not an outage.
+                if reason is None or reason == "429":
+                    limiter.breaker.record_success()
+                else:
+                    limiter.breaker.record_failure()
+                if reason is None:
+                    raise
+                # A streamed response cannot be restarted once the caller has seen part of it.
+                if started:
+                    raise
+                if attempt == limiter.max_retries:
+                    limiter.failures += 1
+                    raise ModelUnavailableError(
+                        f"Model call failed after {attempt + 1} attempts: {e}",
+                        retry_after=limiter.retry_max_seconds,
+                    ) from e
+                delay = limiter.backoff(attempt, e)
+                limiter.retries += 1
+                MODEL_RETRIES.labels(reason).inc()
+                logger.warning(f"Model call failed ({reason}), retry {attempt + 1}/{limiter.max_retries} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled or closed mid-call.
+                limiter.breaker.release()
+                raise
+
+
+model_limiter = ModelCallLimiter()
+
+
+def shared_model(model: Optional[str]) -> Union[str, BaseLlm, None]:
+    """
+    Returns the model for an agent: model wrapped in a RateLimitedLlm that
+    shares model_limiter. Returns model unchanged when it is not set, so
+    agents keep inheriting their parent's model.
+    """
+    if not model:
+        return model
+    return RateLimitedLlm(model=model, limiter=model_limiter)
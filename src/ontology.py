@@ -0,0 +1,169 @@
+import re
+from typing import Iterable
+
+# --- Skill Synonyms ---
+# Canonical skill -> aliases. Matching is done on normalized text (see
+# normalize_term), so aliases only need one spelling each.
+SKILL_SYNONYMS = {
+    # Trades
+    "mig welding": ["gmaw", "gas metal arc welding", "metal inert gas welding", "mig"],
+    "tig welding": ["gtaw", "gas tungsten arc welding", "tungsten inert gas welding", "tig"],
+    "stick welding": ["smaw", "shielded metal arc welding", "arc welding", "stick"],
+    "flux core welding": ["fcaw", "flux cored arc welding", "flux-cored welding"],
+    "blueprint reading": ["blueprints", "reading blueprints", "blueprint interpretation", "print reading", "technical drawings"],
+    "osha safety": ["osha", "osha 10", "osha 30", "workplace safety"],
+    "forklift operation": ["forklift", "forklift certified", "powered industrial truck"],
+    "cnc machining": ["cnc", "cnc operation", "computer numerical control"],
+    "preventive maintenance": ["pm", "preventative maintenance"],
+    # Software
+    "python": ["python3", "py"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "java": ["jdk", "core java"],
+    "c++": ["cpp", "cplusplus"],
+    "c#": ["csharp", "c sharp"],
+    "golang": ["go"],
+    "sql": ["structured query language", "t-sql", "pl/sql"],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "nosql": ["mongodb", "mongo"],
+    "react": ["reactjs", "react.js"],
+    "node.js": ["node", "nodejs"],
+    "rest api": ["rest", "restful", "restful api", "rest apis", "restful services"],
+    "machine learning": ["ml"],
+    "deep learning": ["dl", "neural networks"],
+    "natural language processing": ["nlp"],
+    "data analysis": ["data analytics", "analytics"],
+    "amazon web services": ["aws"],
+    "google cloud platform": ["gcp", "google cloud"],
+    "microsoft azure": ["azure"],
+    "kubernetes": ["k8s"],
+    "docker": ["containers", "containerization"],
+    "ci/cd": ["cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "git": ["github", "gitlab", "version control"],
+    "microsoft excel": ["excel", "ms excel", "spreadsheets"],
+    "microsoft office": ["ms office", "office 365", "microsoft 365"],
+    # General
+    "project management": ["pmp", "project planning"],
+    "communication": ["communication skills", "verbal communication", "written communication"],
+    "leadership": ["team leadership", "people management", "team lead"],
+    "customer service": ["customer support", "client service"],
+}
+
+# --- Certification Synonyms ---
+CERTIFICATION_SYNONYMS = {
+    "aws certified welder": ["aws welder", "aws welding certification", "american welding society certified welder"],
+    "certified welding inspector": ["cwi", "aws cwi"],
+    "project management professional": ["pmp"],
+    "aws certified solutions architect": ["aws solutions architect", "aws saa"],
+    "certified kubernetes administrator": ["cka"],
+    "cissp": ["certified information systems security professional"],
+}
+
+# --- Education Levels ---
+# Highest level wins; a keyword hit in a degree string sets its level. Text is
+# matched with periods removed, so "B.S." matches "bs" and "Ph.D." "phd".
+# A bare "master" is not a degree ("Master Welder"); "master s" is "master's".
+EDUCATION_LEVELS = {
+    1: ["high school", "ged", "secondary school", "diploma"],
+    2: ["associate", "associates", "associate s", "certificate program", "vocational", "trade school", "apprenticeship"],
+    3: ["bachelor", "bachelors", "bachelor s", "bs", "bsc", "ba", "btech", "beng", "undergraduate"],
+    4: ["masters", "master s", "master of", "ms", "msc", "mba", "mtech", "meng", "postgraduate"],
+    5: ["phd", "doctorate", "doctoral"],
+}
+# Abbreviations that are ordinary words undotted ("must be able"); they only
+# count when written with periods ("B.E.", "M.A.").
+DOTTED_EDUCATION_LEVELS = {"be": 3, "ma": 4, "me": 4}
+
+_NON_TERM_CHARS = re.compile(r"[^a-z0-9+#./\s-]")
+_SPACES = re.compile(r"[\s_]+")
+_TERM_SEPARATORS = re.compile(r"[,;\n]")
+_DOTTED_ABBREVIATION = re.compile(r"\b([a-z]{1,2})\.([a-z]{1,3})\b")
+# "MS Office" in a requirement is not a master's degree.
+_MS_PRODUCTS = re.compile(r"\bms (?:office|excel|word|access|project|sql|teams|outlook|powerpoint|dynamics)\b")
+
+
+def normalize_term(text: str) -> str:
+    """
+    Lowercases, drops punctuation other than + # . / - (C++, C#, node.js,
+    CI/CD), and collapses whitespace.
+    """
+    text = _NON_TERM_CHARS.sub(" ", str(text).lower())
+    return _SPACES.sub(" ", text).strip(" .-/")
+
+
+def _alias_index(synonyms: dict) -> dict:
+    index = {}
+    for canonical, aliases in synonyms.items():
+        for term in [canonical, *aliases]:
+            index.setdefault(normalize_term(term), normalize_term(canonical))
+    return index
+
+
+# Aliases too ambiguous to trust in free text ("AWS Certified Welder" is not
+# Amazon Web Services); they still resolve when listed as a skill.
+AMBIGUOUS_ALIASES = {"aws", "rest", "node", "stick", "containers", "analytics", "excel"}
+
+SKILL_INDEX = _alias_index(SKILL_SYNONYMS)
+CERTIFICATION_INDEX = _alias_index(CERTIFICATION_SYNONYMS)
+
+
+def canonical_skill(text: str) -> str:
+    term = normalize_term(text)
+    return SKILL_INDEX.get(term, term)
+
+
+def canonical_certification(text: str) -> str:
+    term = normalize_term(text)
+    return CERTIFICATION_INDEX.get(term, term)
+
+
+def split_terms(value) -> list:
+    """
+    Splits a skill string or list of strings ("Python, Go / Kubernetes") into
+    separate terms on commas, semicolons, newlines and slashes. A term that is
+    itself a known skill with a slash (CI/CD, PL/SQL) is kept whole.
+    """
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    terms = []
+    for item in values:
+        if item is None:
+            continue
+        for part in _TERM_SEPARATORS.split(str(item)):
+            if "/" in part and normalize_term(part) not in SKILL_INDEX:
+                terms.extend(part.split("/"))
+            else:
+                terms.append(part)
+    return [term.strip() for term in terms if term.strip()]
+
+
+def canonical_skills(values: Iterable[str]) -> set:
+    return {skill for skill in (canonical_skill(value) for value in values) if skill}
+
+
+def mentioned_skills(text: str) -> set:
+    """
+    Canonical skills whose canonical name or an alias appears as a whole
+    phrase in free text (summary, job descriptions).
+    """
+    padded = f" {normalize_term(text)} "
+    return {
+        canonical for term, canonical in SKILL_INDEX.items()
+        if len(term) > 2 and term not in AMBIGUOUS_ALIASES and f" {term} " in padded
+    }
+
+
+def education_level(text: str) -> int:
+    """
+    Returns the highest EDUCATION_LEVELS level named in text, or 0.
+    """
+    lowered = str(text).lower()
+    level = max(
+        (DOTTED_EDUCATION_LEVELS.get(a + b, 0) for a, b in _DOTTED_ABBREVIATION.findall(lowered)),
+        default=0,
+    )
+    padded = f" {_MS_PRODUCTS.sub(' ', normalize_term(lowered).replace('.', ''))} "
+    for candidate_level, keywords in EDUCATION_LEVELS.items():
+        if any(f" {keyword} " in padded for keyword in keywords):
+            level = max(level, candidate_level)
+    return level
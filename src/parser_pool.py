@@ -0,0 +1,130 @@
+import os
+import signal
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.tools import extract_text_from_file
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# PARSER_POOL_WORKERS=0 parses in a thread instead of a process pool.
+PARSER_POOL_WORKERS = int(os.getenv("PARSER_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSER_TIMEOUT_SECONDS = float(os.getenv("PARSER_TIMEOUT_SECONDS", "60"))
+PARSER_MEMORY_LIMIT_MB = int(os.getenv("PARSER_MEMORY_LIMIT_MB", "1024"))
+PARSER_START_METHOD = os.getenv("PARSER_START_METHOD", "spawn")
+
+
+# --- Worker Functions ---
+def _init_worker(memory_limit_mb: int) -> None:
+    """
+    Caps the address space of a parser process so one pathological document
+    fails with MemoryError instead of exhausting the container.
+    """
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        logger.warning(f"Could not set parser memory limit: {e}")
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Document parsing timed out.")
+
+
+def _extract_with_timeout(file_path: str, timeout_seconds: float) -> str:
+    """
+    Runs extract_text_from_file in a worker with a SIGALRM deadline, so a slow
+    document frees its worker without tearing down the pool.
+    """
+    if not timeout_seconds or not hasattr(signal, "setitimer"):
+        return extract_text_from_file(file_path)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return extract_text_from_file(file_path)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# --- Parser Pool ---
+class DocumentParserPool:
+    """
+    Parses documents in a ProcessPoolExecutor so CPU-bound PDF/DOCX extraction
+    never blocks the event loop. Each document gets a timeout and each worker
+    a memory limit; a crashed pool is replaced on the next call.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PARSER_POOL_WORKERS,
+        timeout_seconds: float = PARSER_TIMEOUT_SECONDS,
+        memory_limit_mb: int = PARSER_MEMORY_LIMIT_MB,
+        start_method: str = PARSER_START_METHOD,
+    ):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self.start_method = start_method
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+            )
+            logger.info(f"Started document parser pool with {self.max_workers} workers.")
+        return self._executor
+
+    def _reset_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def extract_text(self, file_path: str) -> str:
+        if not self.max_workers:
+            return await asyncio.to_thread(extract_text_from_file, file_path)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_executor(), _extract_with_timeout, file_path, self.timeout_seconds
+        )
+        # The worker enforces the timeout itself; this is a backstop for a
+        # worker that cannot be interrupted.
+        backstop = self.timeout_seconds * 2 if self.timeout_seconds else None
+        try:
+            return await asyncio.wait_for(future, backstop)
+        except asyncio.TimeoutError:
+            logger.error(f"Parser worker unresponsive on {file_path}; recycling the pool.")
+            self._reset_executor()
+            raise RuntimeError(f"Document parsing timed out: {file_path}")
+        except BrokenProcessPool:
+            logger.error(f"Parser worker died on {file_path} (memory limit?); recycling the pool.")
+            self._reset_executor()
+            raise RuntimeError(f"Document parser crashed: {file_path}")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+parser_pool = DocumentParserPool()
+
+
+async def extract_text_from_file_async(file_path: str) -> str:
+    """
+    Async tool: extracts all readable text from a local PDF or DOCX resume in
+    the document parser pool, without blocking other requests.
+    """
+    return await parser_pool.extract_text(file_path)
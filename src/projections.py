@@ -0,0 +1,154 @@
+import os
+import json
+import logging
+from typing import Any
+
+from src.custom_agents import parse_state_value
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# Default cap for any string in a projected view, and for lists other than
+# scoring inputs (see SCORING_LIST_KEYS).
+PROJECTION_MAX_CHARS = int(os.getenv("PROJECTION_MAX_CHARS", "200"))
+PROJECTION_MAX_ITEMS = int(os.getenv("PROJECTION_MAX_ITEMS", "10"))
+# Per-field overrides as "<view>.<field path>=<chars>", comma separated; 0 drops the field.
+# "<view>.<field path>[]=<items>" caps a list's items instead; 0 = no cap.
+# e.g. "profile_for_scoring.experience.description=0,profile_for_review.projects[]=3"
+PROJECTION_FIELD_LIMITS = os.getenv("PROJECTION_FIELD_LIMITS", "")
+
+# Lists the scoring agents need in full (skills, certifications, roles,
+# degrees, JD requirements): no item cap unless set per field.
+SCORING_LIST_KEYS = ("skill", "certif", "licen", "requirement", "qualification", "experience", "education")
+
+
+# --- Field Specs ---
+# A spec maps a field to True (keep, default string cap), an int (keep, cap
+# strings at that many characters; 0 drops it) or a nested spec for objects
+# and lists of objects. None keeps every field with the default caps.
+PROFILE_SCORING_FIELDS = {
+    "location": True,
+    "summary": 300,
+    "skills": True,
+    "education": {"degree": True, "institution": True, "end_year": True},
+    "experience": {"job_title": True, "company": True, "start_year": True, "end_year": True, "description": 120},
+    "certifications": {"name": True, "provider": True, "end_year": True},
+    "languages": True,
+}
+
+PROFILE_REVIEW_FIELDS = {
+    **PROFILE_SCORING_FIELDS,
+    "experience": {"job_title": True, "company": True, "start_year": True, "end_year": True, "description": 80},
+    "certifications": {"name": True, "provider": True, "start_year": True, "end_year": True},
+}
+
+
+def _parse_limits(raw: str) -> tuple:
+    """
+    Returns (string limits, item limits) keyed by field path.
+    """
+    limits, item_limits = {}, {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        path, _, value = item.partition("=")
+        path = path.strip()
+        try:
+            if path.endswith("[]"):
+                item_limits[path[:-2]] = int(value)
+            else:
+                limits[path] = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid PROJECTION_FIELD_LIMITS entry: {item}")
+    return limits, item_limits
+
+
+FIELD_LIMITS, ITEM_LIMITS = _parse_limits(PROJECTION_FIELD_LIMITS)
+
+
+def item_limit(path: str) -> int:
+    """
+    Item cap for the list at path (0 = none): the per-field override, else no
+    cap for scoring inputs and PROJECTION_MAX_ITEMS for everything else.
+    """
+    if path in ITEM_LIMITS:
+        return ITEM_LIMITS[path]
+    field = path.rsplit(".", 1)[-1].lower()
+    return 0 if any(key in field for key in SCORING_LIST_KEYS) else PROJECTION_MAX_ITEMS
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def project(value: Any, spec=None, path: str = "", max_chars: int = PROJECTION_MAX_CHARS) -> Any:
+    """
+    Returns value reduced to the fields in spec, with strings capped at
+    max_chars (or the spec/override limit), lists capped at item_limit(path)
+    items and empty values dropped.
+    """
+    if isinstance(value, dict):
+        keys = value.keys() if not isinstance(spec, dict) else [key for key in spec if key in value]
+        projected = {}
+        for key in keys:
+            rule = spec.get(key, True) if isinstance(spec, dict) else None
+            child_path = f"{path}.{key}" if path else key
+            limit = FIELD_LIMITS.get(child_path, rule if isinstance(rule, int) and rule is not True else max_chars)
+            if limit == 0:
+                continue
+            child = project(value[key], rule if isinstance(rule, dict) else None, child_path, limit)
+            if not _is_empty(child):
+                projected[key] = child
+        return projected
+    if isinstance(value, list):
+        cap = item_limit(path)
+        items = [project(item, spec, path, max_chars) for item in (value[:cap] if cap else value)]
+        return [item for item in items if not _is_empty(item)]
+    if isinstance(value, str):
+        text = " ".join(value.split())
+        return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
+    return value
+
+
+def minify(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _view(name: str, value: Any, spec) -> str:
+    if not isinstance(value, (dict, list)):
+        # Unparseable model output: pass it through, capped.
+        return project(str(value or ""), None, name, PROJECTION_MAX_CHARS * 10)
+    return minify(project(value, spec, name))
+
+
+# --- Views ---
+def profile_for_scoring(state) -> str:
+    return _view("profile_for_scoring", parse_state_value(state.get("int_profile_data_json")), PROFILE_SCORING_FIELDS)
+
+
+def jd_for_scoring(state) -> str:
+    return _view("jd_for_scoring", parse_state_value(state.get("jd_json")), None)
+
+
+def profile_for_review(state) -> str:
+    """
+    Compact resume profile plus whatever the enrichment step found, for the
+    gap-flagging and interview-question agents.
+    """
+    profile = parse_state_value(state.get("int_profile_data_json"))
+    profile = project(profile, PROFILE_REVIEW_FIELDS, "profile_for_review") if isinstance(profile, dict) else {}
+    enrichment = parse_state_value(state.get("enriched_profile_json"))
+    if isinstance(enrichment, dict):
+        enrichment = project(enrichment, None, "profile_for_review.enrichment")
+    elif enrichment:
+        enrichment = project(str(enrichment), None, "profile_for_review.enrichment")
+    if not _is_empty(enrichment):
+        profile["enrichment"] = enrichment
+    return minify(profile)
+
+
+# State key of each view -> builder taking the session state.
+PROJECTED_VIEWS = {
+    "profile_for_scoring": profile_for_scoring,
+    "jd_for_scoring": jd_for_scoring,
+    "profile_for_review": profile_for_review,
+}
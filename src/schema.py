@@ -1,5 +1,5 @@
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
 class EducationEntry(BaseModel):
@@ -12,7 +12,7 @@ class ExperienceEntry(BaseModel):
     job_title: str = Field(description="Job title or position held")
     company: str = Field(description="Name of the company or organization")
     start_year: Optional[str] = Field(default=None, description="Start date (YYYY-MM or similar)")
-    start_year: Optional[str] = Field(default=None, description="End date or 'Present'")
+    end_year: Optional[str] = Field(default=None, description="End date or 'Present'")
     description: Optional[str] = Field(default=None, description="Brief description of responsibilities or achievements")
 
 class CertificationEntry(BaseModel):
@@ -20,7 +20,7 @@ class CertificationEntry(BaseModel):
     provider: Optional[str] = Field(default=None, description="Name of the certification provider")
     certificate_url: Optional[str] = Field(default=None, description="URL to the certification")
     start_year: Optional[str] = Field(default=None, description="Start date of the certification (YYYY-MM or similar)")
-    start_year: Optional[str] = Field(default=None, description="Expiration date of the certification (YYYY-MM or similar)")
+    end_year: Optional[str] = Field(default=None, description="Expiration date of the certification (YYYY-MM or similar)")
 
 
 class ResumeOutput(BaseModel):
@@ -43,3 +43,21 @@ class ResumeOutput(BaseModel):
 class File_Inputs(BaseModel):
     profile_path: str = Field(description="Resume file path to extract text from.")
     job_description: dict = Field(description="Job description to match against the resume in json format.")
+
+
+class Batch_Inputs(BaseModel):
+    job_description: dict = Field(description="Job description to match every resume against, in json format.")
+    profile_paths: List[str] = Field(default_factory=list, description="Resume file paths to screen.")
+    profile_dir: Optional[str] = Field(default=None, description="Local directory of PDF/DOCX resumes to screen.")
+    gcs_bucket: Optional[str] = Field(default=None, description="GCS bucket holding resumes to screen.")
+    gcs_prefix: Optional[str] = Field(default=None, description="Prefix of the resumes inside gcs_bucket.")
+    max_concurrency: Optional[int] = Field(default=None, ge=1, le=64, description="Maximum candidates screened at once for this batch (1-64, default BATCH_MAX_CONCURRENCY).")
+    triage_top_k: Optional[int] = Field(default=None, description="Only run the full pipeline for the K best candidates by triage score (default TRIAGE_TOP_K; 0 = no cap).")
+    triage_min_score: Optional[float] = Field(default=None, description="Only run the full pipeline for candidates with a triage score (0-100) of at least this (default TRIAGE_MIN_SCORE; 0 = no threshold).")
+
+
+class Job_Inputs(File_Inputs):
+    priority: Literal["urgent", "normal", "bulk"] = Field(
+        default="normal",
+        description="Queue lane: urgent jobs run before normal ones, normal before bulk backfills.",
+    )
@@ -0,0 +1,319 @@
+import os
+import re
+import datetime
+import logging
+from typing import Any, Iterator, Optional
+
+from src.ontology import (
+    canonical_certification,
+    canonical_skill,
+    canonical_skills,
+    education_level,
+    mentioned_skills,
+    normalize_term,
+    split_terms,
+)
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# llm: match_agent scores every candidate. rules: the rule engine below scores
+# every candidate. hybrid: rules first, match_agent only for fuzzy cases.
+MATCH_ENGINE = os.getenv("MATCH_ENGINE", "llm").strip().lower()
+# hybrid: share of required JD skills the rules may leave unmatched (possibly a
+# synonym the ontology lacks) before the candidate is handed to the LLM.
+MATCH_HYBRID_MAX_UNMATCHED = float(os.getenv("MATCH_HYBRID_MAX_UNMATCHED", "0.25"))
+
+MATCH_ENGINES = ("llm", "rules", "hybrid")
+if MATCH_ENGINE not in MATCH_ENGINES:
+    raise ValueError(f"Unknown MATCH_ENGINE '{MATCH_ENGINE}'; expected one of {', '.join(MATCH_ENGINES)}.")
+ATTRIBUTE_WEIGHTS = {
+    "skill_match": 0.45,
+    "experience_match": 0.25,
+    "education_match": 0.15,
+    "certification_match": 0.15,
+}
+PREFERRED_WEIGHT = 0.5
+# Free-text JD values longer than this are treated as sentences to mine, not skill names.
+MAX_SKILL_WORDS = 4
+
+# JD keys are free-form (whatever jd_parser emitted); they are classified by substring.
+_SKILL_KEYS = ("skill", "technolog", "tool", "competenc", "proficienc", "stack")
+_CERT_KEYS = ("certif", "licen")
+_EDUCATION_KEYS = ("education", "degree")
+_EXPERIENCE_KEYS = ("experience", "years")
+_REQUIREMENT_KEYS = ("requirement", "qualification", "must")
+_PREFERRED_KEYS = ("prefer", "nice", "bonus", "desired", "plus", "optional")
+# Dropped from a JD certification before matching: "AWS certification" is met by "AWS Certified Welder".
+_CERT_WORDS = {"certification", "certifications", "certified", "certificate", "license", "licensed", "a", "an", "valid"}
+
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:(?:-|to)\s*\d+\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+_PRESENT = ("present", "current", "currently", "now", "ongoing", "till date", "to date")
+_MONTHS = {name: i + 1 for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+)}
+
+
+# --- Dates ---
+def parse_resume_date(value: Any, end: bool = False) -> Optional[float]:
+    """
+    Parses a resume date ("2017", "2017-03", "03/2017", "Mar 2017",
+    "Present") into fractional years. A bare year is read as January when it
+    starts a range and December when it ends one. Returns None if unparseable.
+    """
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    today = datetime.date.today()
+    if not text:
+        return None
+    if any(word in text for word in _PRESENT):
+        return today.year + (today.month - 1) / 12
+    year_match = re.search(r"(19|20)\d{2}", text)
+    if year_match is None:
+        return None
+    year = int(year_match.group(0))
+    month = None
+    numeric_month = re.search(r"(?:^|\D)(\d{1,2})\s*[-/.]\s*(?:19|20)\d{2}|(?:19|20)\d{2}\s*[-/.]\s*(\d{1,2})(?:\D|$)", text)
+    if numeric_month:
+        month = int(numeric_month.group(1) or numeric_month.group(2))
+    else:
+        for name, number in _MONTHS.items():
+            if re.search(rf"\b{name}", text):
+                month = number
+                break
+    if month is None or not 1 <= month <= 12:
+        month = 12 if end else 1
+    return year + (month - 1) / 12
+
+
+def experience_years(experience: list) -> tuple:
+    """
+    Returns (total years, undated entries) over the experience entries, with
+    overlapping roles counted once. An entry without an end date is treated
+    as current when it is listed first (resumes list the latest role first),
+    and as a one-year role otherwise.
+    """
+    intervals, undated = [], 0
+    for index, entry in enumerate(experience):
+        if not isinstance(entry, dict):
+            continue
+        start = parse_resume_date(entry.get("start_year"))
+        if start is None:
+            undated += 1
+            continue
+        end = parse_resume_date(entry.get("end_year"), end=True)
+        if end is None:
+            end = parse_resume_date("present") if index == 0 else start + 1
+        intervals.append((start, max(start, end + (1 / 12))))
+
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return round(total, 1), undated
+
+
+# --- Job Description ---
+def _leaves(value: Any, path: str = "") -> Iterator[tuple]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _leaves(child, f"{path}.{normalize_term(key)}")
+    elif isinstance(value, list):
+        for child in value:
+            yield from _leaves(child, path)
+    elif value not in (None, ""):
+        yield path, value
+
+
+def _has(path: str, keys: tuple) -> bool:
+    return any(key in path for key in keys)
+
+
+def jd_requirements(jd: dict) -> dict:
+    """
+    Extracts skills (canonical name -> weight), minimum years, education level
+    and certifications from a parsed JD. Skill phrases that could not be
+    resolved to a skill name are returned under "unparsed".
+    """
+    skills, certifications, unparsed = {}, [], []
+    min_years, level = None, 0
+
+    def add_skill(skill: str, weight: float) -> None:
+        if skill:
+            skills[skill] = max(skills.get(skill, 0), weight)
+
+    for path, value in _leaves(jd):
+        weight = PREFERRED_WEIGHT if _has(path, _PREFERRED_KEYS) else 1.0
+        text = str(value)
+        if _has(path, _EXPERIENCE_KEYS) or _has(path, _REQUIREMENT_KEYS):
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and _has(path, _EXPERIENCE_KEYS):
+                years = [float(value)]
+            else:
+                years = [float(match) for match in _YEARS.findall(text)]
+            if years and weight == 1.0:
+                min_years = max(min_years or 0, min(years))
+        if _has(path, _EDUCATION_KEYS) or _has(path, _REQUIREMENT_KEYS):
+            level = max(level, education_level(text) if weight == 1.0 else 0)
+
+        if _has(path, _CERT_KEYS):
+            certifications.append(canonical_certification(text))
+        elif _has(path, _SKILL_KEYS):
+            terms = split_terms(text)
+            if len(terms) > 1 and all(len(term.split()) <= MAX_SKILL_WORDS for term in terms):
+                # A delimited list of skill names: "Python, Go, Kubernetes".
+                for term in terms:
+                    add_skill(canonical_skill(term), weight)
+            elif len(text.split()) <= MAX_SKILL_WORDS:
+                add_skill(canonical_skill(text), weight)
+            else:
+                found = mentioned_skills(text)
+                for skill in found:
+                    add_skill(skill, weight)
+                if not found:
+                    unparsed.append(text)
+        elif _has(path, _REQUIREMENT_KEYS):
+            if _has(text.lower(), _CERT_KEYS):
+                # "AWS certification" names a certification, not the AWS skill.
+                if len(text.split()) <= MAX_SKILL_WORDS + 2:
+                    certifications.append(canonical_certification(text))
+                continue
+            for skill in mentioned_skills(text):
+                add_skill(skill, weight)
+
+    return {
+        "skills": skills,
+        "min_years": min_years,
+        "education_level": level,
+        "certifications": list(dict.fromkeys(certifications)),
+        "unparsed": unparsed,
+    }
+
+
+# --- Candidate ---
+def candidate_facts(profile: dict) -> dict:
+    skills = split_terms(profile.get("skills") or [])
+    experience = [entry for entry in profile.get("experience") or [] if isinstance(entry, dict)]
+    free_text = " \n ".join(
+        [str(profile.get("summary") or "")]
+        + [f"{entry.get('job_title') or ''} \n {entry.get('description') or ''}" for entry in experience]
+    )
+    years, undated = experience_years(experience)
+    now = parse_resume_date("present")
+    certifications = []
+    for entry in profile.get("certifications") or []:
+        name = entry.get("name") if isinstance(entry, dict) else entry
+        if not name:
+            continue
+        expires = parse_resume_date(entry.get("end_year"), end=True) if isinstance(entry, dict) else None
+        certifications.append((canonical_certification(name), expires is not None and expires < now))
+    degrees = [
+        f"{entry.get('degree') or ''}" if isinstance(entry, dict) else str(entry)
+        for entry in profile.get("education") or []
+    ]
+    return {
+        "skills": canonical_skills(skills) | mentioned_skills(free_text),
+        "years": years,
+        "undated_roles": undated,
+        "education_level": max((education_level(degree) for degree in degrees), default=0),
+        "certifications": certifications,
+    }
+
+
+# --- Scoring ---
+def _tokens(term: str) -> set:
+    return set(term.split())
+
+
+def _skill_credit(required: str, candidate_skills: set) -> float:
+    """
+    1 for the same canonical skill or a more specific one ("welding" is met by
+    "mig welding"), 0.5 for a less specific one, else 0.
+    """
+    if required in candidate_skills:
+        return 1.0
+    required_tokens = _tokens(required)
+    credit = 0.0
+    for skill in candidate_skills:
+        skill_tokens = _tokens(skill)
+        if required_tokens <= skill_tokens:
+            return 1.0
+        if skill_tokens <= required_tokens:
+            credit = PREFERRED_WEIGHT
+    return credit
+
+
+def _cert_credit(required: str, certifications: list) -> float:
+    required_tokens = _tokens(required) - _CERT_WORDS or _tokens(required)
+    credit = 0.0
+    for name, expired in certifications:
+        if name == required or required_tokens <= _tokens(name):
+            credit = max(credit, 0.5 if expired else 1.0)
+    return credit
+
+
+def score_profile(profile: dict, jd: dict) -> tuple:
+    """
+    Scores a ResumeOutput-shaped profile against a parsed JD without a model.
+    Returns (attribute_scores, details): attribute_scores has the same shape
+    as match_agent's output; details lists matched and missing requirements
+    and whether the result is confident enough to skip the LLM in hybrid mode.
+    Attributes the JD does not ask for score 100 and are left out of overall_fit;
+    with no recognised requirement at all, overall_fit is 100 too and details
+    carry the fallback reason.
+    """
+    requirements = jd_requirements(jd)
+    facts = candidate_facts(profile)
+    scores, missing = {}, {}
+
+    if requirements["skills"]:
+        credits = {skill: _skill_credit(skill, facts["skills"]) for skill in requirements["skills"]}
+        earned = sum(credits[skill] * weight for skill, weight in requirements["skills"].items())
+        scores["skill_match"] = 100 * earned / sum(requirements["skills"].values())
+        missing["skills"] = sorted(skill for skill, credit in credits.items() if credit < 1)
+    if requirements["min_years"]:
+        scores["experience_match"] = 100 * min(1.0, facts["years"] / requirements["min_years"])
+    if requirements["education_level"]:
+        scores["education_match"] = 100 * min(1.0, facts["education_level"] / requirements["education_level"])
+    if requirements["certifications"]:
+        credits = {cert: _cert_credit(cert, facts["certifications"]) for cert in requirements["certifications"]}
+        scores["certification_match"] = 100 * sum(credits.values()) / len(credits)
+        missing["certifications"] = sorted(cert for cert, credit in credits.items() if credit < 1)
+
+    if scores:
+        total_weight = sum(ATTRIBUTE_WEIGHTS[name] for name in scores)
+        overall = sum(scores[name] * ATTRIBUTE_WEIGHTS[name] for name in scores) / total_weight
+    else:
+        overall = 100.0
+    attribute_scores = {name: round(scores.get(name, 100)) for name in ATTRIBUTE_WEIGHTS}
+    attribute_scores["overall_fit"] = round(overall)
+
+    required_skills = [skill for skill, weight in requirements["skills"].items() if weight == 1.0]
+    unmatched_required = [skill for skill in required_skills if skill in missing.get("skills", [])]
+    reasons = []
+    if not scores:
+        reasons.append("no requirements recognised in the job description")
+    if requirements["unparsed"]:
+        reasons.append("skill requirements written as free text")
+    if required_skills and len(unmatched_required) / len(required_skills) > MATCH_HYBRID_MAX_UNMATCHED:
+        reasons.append("too many required skills unmatched")
+    if requirements["min_years"] and facts["undated_roles"]:
+        reasons.append("roles without start dates")
+
+    details = {
+        "engine": "rules",
+        "confident": not reasons,
+        "fallback_reasons": reasons,
+        "scored": sorted(scores),
+        "candidate_years": facts["years"],
+        "required_years": requirements["min_years"],
+        "missing": missing,
+    }
+    return {"attribute_scores": attribute_scores}, details
@@ -0,0 +1,204 @@
+import os
+import re
+import zlib
+import logging
+from collections import Counter
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.cache import LRUCache, canonical_hash
+from src.ontology import mentioned_skills, normalize_term
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# llm: semantic_scoring_agent scores every candidate. local: this module
+# scores and explains, no model call. local_explain: this module scores and
+# semantic_scoring_agent only writes the explanation.
+SEMANTIC_ENGINE = os.getenv("SEMANTIC_ENGINE", "llm").strip().lower()
+SEMANTIC_HASH_DIM = int(os.getenv("SEMANTIC_HASH_DIM", "16384"))
+# Cosine similarities at or below the floor map to 0, at or above the ceiling to 100.
+SEMANTIC_FLOOR = float(os.getenv("SEMANTIC_FLOOR", "0.05"))
+SEMANTIC_CEILING = float(os.getenv("SEMANTIC_CEILING", "0.55"))
+# Candidates embedded per matrix product (memory: batch x 4 x SEMANTIC_HASH_DIM floats).
+SEMANTIC_BATCH_SIZE = int(os.getenv("SEMANTIC_BATCH_SIZE", "256"))
+
+SEMANTIC_ENGINES = ("llm", "local", "local_explain")
+if SEMANTIC_ENGINE not in SEMANTIC_ENGINES:
+    raise ValueError(f"Unknown SEMANTIC_ENGINE '{SEMANTIC_ENGINE}'; expected one of {', '.join(SEMANTIC_ENGINES)}.")
+
+# JD aspect -> weight in semantic_score; each aspect is compared with every profile field.
+ASPECT_WEIGHTS = {"skills": 0.4, "role": 0.35, "overall": 0.25}
+RANKING_THRESHOLDS = ((75, "Strong"), (50, "Moderate"), (30, "Weak"))
+CHAR_NGRAM_WEIGHT = 0.3
+
+# JD keys are free-form; they are assigned to aspects by substring.
+_SKILL_KEYS = ("skill", "technolog", "tool", "competenc", "proficienc", "stack", "certif", "licen")
+_ROLE_KEYS = ("title", "role", "position", "responsib", "duties", "description", "summary", "experience")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "ability able must should strong good excellent experience experienced years year work working knowledge "
+    "skills skill required requirements preferred responsibilities including etc using use candidate team".split()
+)
+_WORD = re.compile(r"[a-z0-9+#][a-z0-9+#./-]*")
+
+_jd_vectors = LRUCache("jd_vectors", max_entries=256)
+
+
+# --- Vectorizer ---
+def _features(text: str) -> Counter:
+    """
+    Returns feature -> weight for text: content words, word bigrams and
+    character 3-grams of each word, plus the canonical names of any skills or
+    aliases mentioned, so "GMAW" and "MIG welding" share features.
+    """
+    normalized = normalize_term(text)
+    expanded = " ".join([normalized, *sorted(mentioned_skills(normalized))])
+    words = [word for word in _WORD.findall(expanded) if word not in STOPWORDS]
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    # Character n-grams are added once per distinct word, weighted by its count.
+    for word, count in Counter(words).items():
+        padded = f"<{word}>"
+        for i in range(len(padded) - 2):
+            features[padded[i:i + 3]] += CHAR_NGRAM_WEIGHT * count
+    return features
+
+
+def embed(texts: Iterable[str], dim: int = SEMANTIC_HASH_DIM) -> np.ndarray:
+    """
+    Embeds texts as L2-normalized hashed n-gram vectors (one row per text),
+    with sublinear term frequency. Hashing uses CRC32, so vectors are the same
+    in every process and run.
+    """
+    texts = list(texts)
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        features = _features(text or "")
+        if not features:
+            continue
+        indices = np.fromiter((zlib.crc32(f.encode("utf-8")) % dim for f in features), dtype=np.int64, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        matrix[row] = np.log1p(np.bincount(indices, weights=weights, minlength=dim))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+# --- Text Views ---
+def _flatten(value: Any) -> str:
+    if isinstance(value, dict):
+        return " \n ".join(_flatten(child) for child in value.values())
+    if isinstance(value, list):
+        return " \n ".join(_flatten(child) for child in value)
+    return "" if value is None else str(value)
+
+
+def jd_aspects(jd: dict) -> dict:
+    """
+    Splits a parsed JD into the ASPECT_WEIGHTS texts: skills (skills, tools,
+    certifications), role (title, responsibilities, description) and overall.
+    """
+    skills, role = [], []
+    for key, value in jd.items():
+        name = normalize_term(key)
+        if any(k in name for k in _SKILL_KEYS):
+            skills.append(_flatten(value))
+        elif any(k in name for k in _ROLE_KEYS) or any(k in name for k in ("requirement", "qualification")):
+            role.append(_flatten(value))
+    overall = _flatten(jd)
+    return {"skills": " \n ".join(skills) or overall, "role": " \n ".join(role) or overall, "overall": overall}
+
+
+def profile_fields(profile: dict) -> list:
+    """
+    Texts a JD aspect is compared against; each aspect takes its best match.
+    """
+    skills = profile.get("skills") or []
+    experience = [entry for entry in profile.get("experience") or [] if isinstance(entry, dict)]
+    certifications = profile.get("certifications") or []
+    return [
+        _flatten(skills) + " \n " + _flatten([c.get("name") if isinstance(c, dict) else c for c in certifications]),
+        " \n ".join(f"{e.get('job_title') or ''} \n {e.get('description') or ''}" for e in experience),
+        str(profile.get("summary") or ""),
+        _flatten({key: profile.get(key) for key in ("summary", "skills", "experience", "education", "certifications", "projects")}),
+    ]
+
+
+def jd_matrix(jd: dict) -> np.ndarray:
+    key = canonical_hash(jd)
+    matrix = _jd_vectors.get(key)
+    if matrix is None:
+        aspects = jd_aspects(jd)
+        matrix = embed([aspects[name] for name in ASPECT_WEIGHTS])
+        _jd_vectors.set(key, matrix)
+    return matrix
+
+
+# --- Scoring ---
+def calibrate(similarity: np.ndarray) -> np.ndarray:
+    scaled = (similarity - SEMANTIC_FLOOR) / (SEMANTIC_CEILING - SEMANTIC_FLOOR)
+    return np.clip(scaled, 0.0, 1.0) * 100
+
+
+def ranking_label(score: float) -> str:
+    for threshold, label in RANKING_THRESHOLDS:
+        if score >= threshold:
+            return label
+    return "Poor"
+
+
+def aspect_scores(profiles: list, jd: dict) -> np.ndarray:
+    """
+    Returns a (candidates x aspects) array of 0-100 scores: for each JD aspect,
+    the calibrated cosine similarity of its closest profile field. Candidates
+    are embedded and compared SEMANTIC_BATCH_SIZE at a time, one matrix
+    product per chunk.
+    """
+    aspects = jd_matrix(jd)
+    scores = np.zeros((len(profiles), len(ASPECT_WEIGHTS)), dtype=np.float32)
+    for start in range(0, len(profiles), SEMANTIC_BATCH_SIZE):
+        chunk = profiles[start:start + SEMANTIC_BATCH_SIZE]
+        fields = [profile_fields(profile) for profile in chunk]
+        field_matrix = embed(text for texts in fields for text in texts).reshape(len(chunk), len(fields[0]), -1)
+        similarity = field_matrix @ aspects.T  # candidates x fields x aspects
+        scores[start:start + len(chunk)] = calibrate(similarity.max(axis=1))
+    return scores
+
+
+def semantic_scores(profiles: list, jd: dict) -> np.ndarray:
+    """
+    Weighted semantic_score (0-100) for each profile against jd.
+    """
+    weights = np.array(list(ASPECT_WEIGHTS.values()), dtype=np.float32)
+    return aspect_scores(profiles, jd) @ weights / weights.sum()
+
+
+def _shared_terms(profile: dict, jd: dict, limit: int = 5) -> list:
+    profile_skills = mentioned_skills(_flatten(profile))
+    jd_skills = mentioned_skills(_flatten(jd))
+    shared = sorted(profile_skills & jd_skills)
+    if len(shared) < limit:
+        profile_words = set(_WORD.findall(normalize_term(_flatten(profile)))) - STOPWORDS
+        jd_words = [w for w in _WORD.findall(normalize_term(jd_aspects(jd)["skills"])) if w not in STOPWORDS and len(w) > 2]
+        shared += [w for w in dict.fromkeys(jd_words) if w in profile_words and not any(w in term for term in shared)]
+    return shared[:limit]
+
+
+def semantic_match(profile: dict, jd: dict) -> dict:
+    """
+    Returns semantic_scoring_agent's output shape (semantic_score, ranking,
+    explanation) computed locally. The same inputs always give the same result.
+    """
+    aspects = aspect_scores([profile], jd)[0]
+    weights = np.array(list(ASPECT_WEIGHTS.values()), dtype=np.float32)
+    score = int(round(float(aspects @ weights / weights.sum())))
+    breakdown = ", ".join(f"{name} {int(round(float(value)))}" for name, value in zip(ASPECT_WEIGHTS, aspects))
+    shared = _shared_terms(profile, jd)
+    explanation = f"Local similarity {score}/100 ({breakdown})."
+    if shared:
+        explanation += f" Shared terms: {', '.join(shared)}."
+    return {"semantic_score": score, "ranking": ranking_label(score), "explanation": explanation}
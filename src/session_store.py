@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Defaults ---
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "900"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "256"))
+SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "200"))
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    In-memory session service with idle TTL expiry, LRU eviction and a cap on
+    the number of events kept per session, so resident memory stays flat under
+    sustained load. Sessions marked active (see mark_active) are never
+    evicted, so a running invocation cannot lose its session.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_TTL_SECONDS,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        max_events: int = SESSION_MAX_EVENTS,
+    ) -> None:
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_events = max_events
+        # (app_name, user_id, session_id) -> last access time, oldest first.
+        self._last_access: "OrderedDict[tuple, float]" = OrderedDict()
+        # Keys with running invocations -> number of holders.
+        self._active: dict = {}
+        # Serialized size of each stored session, kept up to date per event.
+        self._sizes: dict = {}
+        self._resident_bytes = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.trimmed_events = 0
+
+    # --- Bookkeeping ---
+    def _touch(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._last_access[key] = time.monotonic()
+        self._last_access.move_to_end(key)
+
+    def _forget(self, key: tuple) -> None:
+        self._last_access.pop(key, None)
+        self._resident_bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        excess = len(self._last_access) - self.max_sessions
+        victims = []
+        for key, last_access in self._last_access.items():
+            if key in self._active:
+                continue
+            if self.ttl_seconds and now - last_access > self.ttl_seconds:
+                self.evicted_ttl += 1
+            elif excess > 0:
+                self.evicted_lru += 1
+            else:
+                break
+            excess -= 1
+            victims.append(key)
+        for key in victims:
+            app_name, user_id, session_id = key
+            self._forget(key)
+            self._delete_session_impl(app_name=app_name, user_id=user_id, session_id=session_id)
+            logger.info(f"Evicted session {session_id}")
+
+    def _trim_events(self, session: Session) -> list:
+        """
+        Drops the oldest events beyond max_events; returns the dropped events.
+        """
+        if not self.max_events or len(session.events) <= self.max_events:
+            return []
+        overflow = len(session.events) - self.max_events
+        dropped = session.events[:overflow]
+        del session.events[:overflow]
+        return dropped
+
+    def mark_active(self, app_name: str, user_id: str, session_id: str) -> None:
+        """
+        Exempts a session from eviction until the matching mark_idle call.
+        """
+        key = (app_name, user_id, session_id)
+        self._active[key] = self._active.get(key, 0) + 1
+
+    def mark_idle(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        holders = self._active.get(key, 0) - 1
+        if holders > 0:
+            self._active[key] = holders
+        else:
+            self._active.pop(key, None)
+
+    # --- Session Service API ---
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._resident_bytes -= self._sizes.get(key, 0)
+        self._sizes[key] = len(session.model_dump_json())
+        self._resident_bytes += self._sizes[key]
+        self._touch(app_name, user_id, session.id)
+        self._evict()
+        return session
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, config=None) -> Optional[Session]:
+        self._evict()
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch(app_name, user_id, session_id)
+        return session
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._forget((app_name, user_id, session_id))
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        self._touch(*key)
+        storage_session = self.sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+        if storage_session is not None:
+            dropped = self._trim_events(storage_session)
+            self.trimmed_events += len(dropped)
+            if key in self._sizes:
+                delta = len(event.model_dump_json()) - sum(len(e.model_dump_json()) for e in dropped)
+                self._sizes[key] += delta
+                self._resident_bytes += delta
+        # The invocation holds its own copy of the session; cap it as well.
+        if storage_session is not session:
+            self._trim_events(session)
+        return event
+
+    # --- Metrics ---
+    def metrics(self) -> dict:
+        """
+        Returns resident session and byte counts plus eviction counters.
+        Byte counts are the serialized size of each session when created plus
+        that of its stored events, tracked as events are appended and trimmed,
+        so a scrape does not re-serialize every session.
+        """
+        resident_events = 0
+        for users in self.sessions.values():
+            for sessions in users.values():
+                for session in sessions.values():
+                    resident_events += len(session.events)
+        return {
+            "resident_sessions": len(self._last_access),
+            "active_sessions": len(self._active),
+            "resident_events": resident_events,
+            "resident_bytes": self._resident_bytes,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_lru": self.evicted_lru,
+            "trimmed_events": self.trimmed_events,
+        }
@@ -0,0 +1,268 @@
+import os
+import json
+import datetime
+import logging
+import threading
+from typing import Optional
+
+from src.bigquery_writer import bigquery_writer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: only needed for RESULT_SINK=parquet
+    pa = None
+    pq = None
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+RESULT_SINK = os.getenv("RESULT_SINK", "bigquery")
+RESULT_SINK_DIR = os.getenv("RESULT_SINK_DIR", "results")
+RESULT_FILE_PREFIX = "Profile_Analysis_Result"
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "1000"))
+PARQUET_MAX_ROWS_PER_FILE = int(os.getenv("PARQUET_MAX_ROWS_PER_FILE", "100000"))
+
+
+def _run_file_stem() -> str:
+    """
+    Profile_Analysis_Result_YYYYMMDD_HHMMSS_<pid>: one stem per process run,
+    so several workers can write to the same directory.
+    """
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{RESULT_FILE_PREFIX}_{timestamp}_{os.getpid()}"
+
+
+# --- Sinks ---
+class ResultSink:
+    """
+    Destination for final screening rows. write() returns the row so callers
+    can echo what was saved; close() must be called on shutdown.
+    """
+
+    name = "base"
+
+    def write(self, row: dict) -> dict:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> dict:
+        return {"sink": self.name}
+
+
+class BigQuerySink(ResultSink):
+    """
+    Queues rows on the shared batched BigQuery writer.
+    """
+
+    name = "bigquery"
+
+    def __init__(self, writer=bigquery_writer):
+        self.writer = writer
+
+    def write(self, row: dict) -> dict:
+        self.writer.enqueue(row)
+        return row
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def stats(self) -> dict:
+        return {"sink": self.name, **self.writer.stats()}
+
+
+class JsonlSink(ResultSink):
+    """
+    Appends one JSON line per row to <directory>/<run stem>.jsonl. Each line is
+    flushed to the OS as it is written, so a crash loses at most the current row.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, directory: str = RESULT_SINK_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{_run_file_stem()}.jsonl")
+        self._file = None
+        self._lock = threading.Lock()
+        self.rows_written = 0
+
+    def write(self, row: dict) -> dict:
+        line = json.dumps(row, default=str, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self.rows_written += 1
+        return row
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        logger.info(f"Closed JSONL result sink {self.path} ({self.rows_written} rows).")
+
+    def stats(self) -> dict:
+        return {"sink": self.name, "path": self.path, "rows_written": self.rows_written}
+
+
+class ParquetSink(ResultSink):
+    """
+    Buffers rows and writes them as Parquet row groups of row_group_size rows.
+    A new file is started every max_rows_per_file rows, or when a row group's
+    columns no longer fit the current file's schema. Files are written as
+    .parquet.tmp and renamed on close, so loaders globbing *.parquet only see
+    complete files.
+
+    Scalars keep their type (numbers as double); lists and dicts are stored
+    as JSON strings.
+    """
+
+    name = "parquet"
+
+    def __init__(
+        self,
+        directory: str = RESULT_SINK_DIR,
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        max_rows_per_file: int = PARQUET_MAX_ROWS_PER_FILE,
+    ):
+        if pa is None:
+            raise RuntimeError("RESULT_SINK=parquet requires pyarrow (pip install pyarrow).")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.row_group_size = max(1, row_group_size)
+        self.max_rows_per_file = max(self.row_group_size, max_rows_per_file)
+        self._stem = _run_file_stem()
+        self._buffer: list = []
+        self._lock = threading.Lock()
+        self._writer = None
+        self._path: Optional[str] = None
+        self._file_rows = 0
+        self.files_written: list = []
+        self.rows_written = 0
+        self.row_groups = 0
+
+    @staticmethod
+    def _normalize(value):
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, (int, float)):
+            return float(value)
+        return json.dumps(value, default=str, ensure_ascii=False)
+
+    def _to_table(self, rows: list):
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        arrays = []
+        for name in names:
+            values = [self._normalize(row.get(name)) for row in rows]
+            try:
+                array = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                array = None
+            if array is None or pa.types.is_null(array.type):
+                # Mixed types (e.g. "85" and 85) or all-null: store as strings.
+                array = pa.array([None if v is None else str(v) for v in values], pa.string())
+            arrays.append(array)
+        return pa.table(arrays, names=names)
+
+    def _conform(self, table):
+        """
+        Returns table reshaped to the open file's schema, or None if it does not fit.
+        """
+        schema = self._writer.schema
+        if not set(table.column_names) <= set(schema.names):
+            return None
+        columns = []
+        for field in schema:
+            if field.name not in table.column_names:
+                columns.append(pa.nulls(table.num_rows, field.type))
+                continue
+            try:
+                columns.append(table.column(field.name).cast(field.type))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                return None
+        return pa.table(columns, schema=schema)
+
+    def _open_file(self, schema) -> None:
+        self._path = os.path.join(self.directory, f"{self._stem}_{len(self.files_written):04d}.parquet")
+        self._writer = pq.ParquetWriter(self._path + ".tmp", schema)
+        self._file_rows = 0
+
+    def _close_file(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(self._path + ".tmp", self._path)
+        self.files_written.append(self._path)
+        logger.info(f"Closed Parquet result file {self._path} ({self._file_rows} rows).")
+        self._writer = None
+
+    def _write_row_group(self) -> None:
+        rows, self._buffer = self._buffer, []
+        table = self._to_table(rows)
+        if self._writer is not None:
+            conformed = self._conform(table)
+            if conformed is None or self._file_rows + table.num_rows > self.max_rows_per_file:
+                self._close_file()
+            else:
+                table = conformed
+        if self._writer is None:
+            self._open_file(table.schema)
+        self._writer.write_table(table)
+        self._file_rows += table.num_rows
+        self.rows_written += table.num_rows
+        self.row_groups += 1
+
+    def write(self, row: dict) -> dict:
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.row_group_size:
+                self._write_row_group()
+        return row
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._write_row_group()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._write_row_group()
+            self._close_file()
+
+    def stats(self) -> dict:
+        return {
+            "sink": self.name,
+            "buffered_rows": len(self._buffer),
+            "rows_written": self.rows_written,
+            "row_groups": self.row_groups,
+            "files": len(self.files_written) + (1 if self._writer is not None else 0),
+        }
+
+
+SINKS = {"bigquery": BigQuerySink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def build_result_sink(kind: str = RESULT_SINK) -> ResultSink:
+    """
+    Returns the sink selected by RESULT_SINK (bigquery, jsonl or parquet).
+    """
+    kind = (kind or "bigquery").strip().lower()
+    if kind not in SINKS:
+        raise ValueError(f"Unknown RESULT_SINK '{kind}'; expected one of {', '.join(SINKS)}.")
+    logger.info(f"Using result sink: {kind}")
+    return SINKS[kind]()
+
+
+result_sink = build_result_sink()
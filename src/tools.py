@@ -1,67 +1,40 @@
 import os
 import io
-import json
 import datetime
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from dotenv import load_dotenv
 import google.cloud.logging
 from google.cloud import storage
-from google.cloud import bigquery
 from PyPDF2 import PdfReader
+from docx import Document
+
+from src.sinks import result_sink
 
 # --- Logging Setup ---
-cloud_logging_client = google.cloud.logging.Client()
-cloud_logging_client.setup_logging()
 logger = logging.getLogger(__name__)
+try:
+    cloud_logging_client = google.cloud.logging.Client()
+    cloud_logging_client.setup_logging()
+except Exception as e:
+    # No GCP credentials (local runs, offline benchmarks): keep local logging.
+    logger.warning(f"Cloud Logging unavailable, using local logging: {e}")
 
 # --- Environment Setup ---
 load_dotenv()
 model_name = os.getenv("MODEL")
 logger.info(f"Loaded model: {model_name}")
 
+SUPPORTED_RESUME_EXTENSIONS = (".pdf", ".docx")
+# Per-document extraction caps; 0 means unlimited.
+MAX_PAGES_PER_DOCUMENT = int(os.getenv("MAX_PAGES_PER_DOCUMENT", "0"))
+MAX_CHARS_PER_DOCUMENT = int(os.getenv("MAX_CHARS_PER_DOCUMENT", "0"))
+# Concurrent blob downloads for GCS ingestion.
+GCS_INGEST_WORKERS = int(os.getenv("GCS_INGEST_WORKERS", "8"))
 
 
 
-# --- BigQuery Insertion ---
-def json_to_bigquery(json_file):
-    try:
-        client = bigquery.Client()
-        dataset_id = 'candidate_cv'
-        table_id = 'welder_profile_v1'
-        table_ref = client.dataset(dataset_id).table(table_id)
-
-        # Accept both dict and str input
-        if isinstance(json_file, str):
-            import json
-            try:
-                data = json.loads(json_file)
-            except Exception as e:
-                logger.error(f"Failed to parse JSON string: {e}")
-                return {"error": f"Invalid JSON string: {e}"}
-        elif isinstance(json_file, dict):
-            data = json_file
-        else:
-            logger.error("Input must be a JSON string or dictionary.")
-            return {"error": "Input must be a JSON string or dictionary."}
-
-        # Ensure data is a list of dictionaries
-        if isinstance(data, dict):
-            data = [data]
-        elif not isinstance(data, list):
-            logger.error("Parsed data is not a list or dict.")
-            return {"error": "Parsed data is not a list or dict."}
-
-        errors = client.insert_rows_json(table_ref, data)
-        if errors:
-            logger.error(f"BigQuery insertion errors: {errors}")
-            return {"error": f"BigQuery insertion errors: {errors}"}
-        else:
-            logger.info("Data inserted successfully into BigQuery.")
-            return json_file
-    except Exception as e:
-        logger.exception(f"Exception during BigQuery insertion: {e}")
-        return {"error": f"Exception during BigQuery insertion: {e}"}
 
 def fetch_linkedin_profile(linkedin_url: str):
     """
@@ -94,137 +67,232 @@ def fetch_linkedin_profile(linkedin_url: str):
 
 
 # --- JSON Conversion for GH ---
+def _dict_section(input_json: dict, key: str) -> dict:
+    """
+    Returns input_json[key] if it is a dict, otherwise an empty dict so that
+    malformed agent output is skipped instead of breaking the conversion.
+    """
+    value = input_json.get(key)
+    if value is None or isinstance(value, dict):
+        return value or {}
+    logger.warning(f"Skipping non-object section {key} ({type(value).__name__}).")
+    return {}
+
+
 def convert_gh_to_modified_json(input_json):
     if not isinstance(input_json, dict):
         raise ValueError("Input to convert_gh_to_modified_json must be a dict.")
     modified_json = {}
-    profile = input_json.get("int_profile_data_json", {})
+    profile = _dict_section(input_json, "int_profile_data_json")
     if "skills" in profile and isinstance(profile["skills"], list):
         profile["skills"] = ", ".join([str(skill) for skill in profile["skills"]])
     modified_json.update(profile)
-    print(input_json)
-    attribute_scores = input_json.get("attribute_scores", {})
+    logger.debug(f"Converting context sections: {sorted(input_json)}")
+    attribute_scores = _dict_section(input_json, "attribute_scores")
 
     modified_json.update(attribute_scores)
-    semantic_match = input_json.get("semantic_match", {})
+    semantic_match = _dict_section(input_json, "semantic_match")
     modified_json.update(semantic_match)
-    interview_data = input_json.get("interview_questions_json", {})
-    if isinstance(interview_data, dict) and "interview_questions" in interview_data:
+    interview_data = _dict_section(input_json, "interview_questions_json")
+    if "interview_questions" in interview_data:
         questions = interview_data.get("interview_questions", [])
         for q in questions:
             if isinstance(q, dict):
                 q.pop("rationale", None)
     modified_json.update(interview_data)
-    final_ranking = input_json.get("final_ranking", {})
+    final_ranking = _dict_section(input_json, "final_ranking")
     for key, value in final_ranking.items():
         if key not in modified_json:
             modified_json[key] = value
         elif key == "ranking" and "ranking_summary" not in modified_json:
             modified_json["ranking_summary"] = final_ranking.get("summary", "")
-    enriched_profile = input_json.get("enriched_profile_json", {})
+    enriched_profile = _dict_section(input_json, "enriched_profile_json")
     if "linkedin_profile" in enriched_profile:
         modified_json["linkedin_profile"] = enriched_profile["linkedin_profile"]
-    flagged_gaps = input_json.get("flagged_gaps_json", {})
+    flagged_gaps = _dict_section(input_json, "flagged_gaps_json")
     flagged_issues = flagged_gaps.get("flagged_issues", [])
+    if not isinstance(flagged_issues, list):
+        flagged_issues = []
+    flagged_issues = [issue for issue in flagged_issues if isinstance(issue, dict)]
     if flagged_issues:
-        modified_json["flagged_issue"] = ",".join([issue.get("issue", "") for issue in flagged_issues])
-        modified_json["flagged_issue_description"] = ",".join([issue.get("description", "") for issue in flagged_issues])
-        modified_json["flagged_issue_severity"] = ",".join([issue.get("severity", "") for issue in flagged_issues])
-        modified_json["flagged_issue_resolution"] = ",".join([issue.get("resolution", "") for issue in flagged_issues])
+        modified_json["flagged_issue"] = ",".join([str(issue.get("issue", "")) for issue in flagged_issues])
+        modified_json["flagged_issue_description"] = ",".join([str(issue.get("description", "")) for issue in flagged_issues])
+        modified_json["flagged_issue_severity"] = ",".join([str(issue.get("severity", "")) for issue in flagged_issues])
+        modified_json["flagged_issue_resolution"] = ",".join([str(issue.get("resolution", "")) for issue in flagged_issues])
+    if input_json.get("screening_status"):
+        modified_json["screening_status"] = input_json["screening_status"]
     return modified_json
 
 
 
-# --- Save Context to JSON and BigQuery ---
+# --- Save Context to the Result Sink ---
 def save_context_to_json(context_data: dict, output_key: str):
     """
-    Save context data to BigQuery only.
+    Save context data to the configured result sink (RESULT_SINK: BigQuery,
+    a local JSONL file or rolling Parquet files).
     """
     try:
         if not isinstance(context_data, dict):
             logger.error("Context data must be a dictionary.")
             return {"error": "Context data must be a dictionary."}
         _new_context_data = convert_gh_to_modified_json(context_data)
-        result = json_to_bigquery(_new_context_data)
-        logger.info("Context saved to BigQuery.")
+        result = result_sink.write(_new_context_data)
+        logger.info(f"Context saved to {result_sink.name} sink.")
         return result
     except Exception as e:
-        logger.exception(f"Error saving context to BigQuery: {e}")
-        return {"error": f"Error saving context to BigQuery: {e}"}
+        logger.exception(f"Error saving context to {result_sink.name} sink: {e}")
+        return {"error": f"Error saving context to {result_sink.name} sink: {e}"}
 
 # --- Extract Text from Local File ---
-# def extract_text_from_file(file_path: str):
-#     try:
-#         if not isinstance(file_path, str) or not file_path:
-#             logger.error("Invalid file path provided.")
-#             return {"error": "Invalid file path."}
-#         if file_path.lower().endswith(".pdf"):
-#             try:
-#                 reader = PdfReader(file_path)
-#                 text = ""
-#                 for page in reader.pages:
-#                     text += page.extract_text() or ""
-#                 logger.info(f"Extracted text from PDF: {file_path}")
-#                 return text
-#             except Exception as e:
-#                 logger.exception(f"Error reading PDF file: {e}")
-#                 return {"error": f"Error reading PDF file: {e}"}
-#         elif file_path.lower().endswith(".docx"):
-#             try:
-#                 from docx import Document
-#                 doc = Document(file_path)
-#                 for para in doc.paragraphs:
-#                     text += para.text + "\n"
-#                 return text
-#             except Exception as e:
-#                 raise RuntimeError(f"Error reading DOCX: {e}")
-#         else:
-#             logger.error("Unsupported file type.")
-#             return {"error": "Unsupported file type. Only PDF supported in this example."}
-#     except Exception as e:
-#         logger.exception(f"Exception during file extraction: {e}")
-#         return {"error": f"Exception during file extraction: {e}"}
-
-def extract_text_from_file(file_path: str):
-    ext = os.path.splitext(file_path)[1].lower()
-    text = ""
-    if ext == ".pdf" or ext==".PDF":
-        try:
-            import PyPDF2
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-        except Exception as e:
-            raise RuntimeError(f"Error reading PDF: {e}")
+def _iter_pdf_pages(source, max_pages: int = 0):
+    reader = PdfReader(source)
+    for page_number, page in enumerate(reader.pages):
+        if max_pages and page_number >= max_pages:
+            logger.info(f"Stopped PDF extraction at the {max_pages} page cap.")
+            return
+        yield page.extract_text() or ""
+
+
+def _iter_docx_paragraphs(source):
+    doc = Document(source)
+    for para in doc.paragraphs:
+        yield para.text + "\n"
+
+
+def iter_text_chunks(source, ext: str = None, max_pages: int = None, max_chars: int = None):
+    """
+    Yields the text of a PDF page by page, or of a DOCX paragraph by paragraph.
+    source is a file path or a binary file object (ext is then required).
+    Stops after max_pages PDF pages or max_chars characters; 0 disables a cap.
+    """
+    if ext is None:
+        ext = os.path.splitext(source)[1]
+    ext = ext.lower()
+    max_pages = MAX_PAGES_PER_DOCUMENT if max_pages is None else max_pages
+    max_chars = MAX_CHARS_PER_DOCUMENT if max_chars is None else max_chars
+    if ext == ".pdf":
+        chunks = _iter_pdf_pages(source, max_pages)
     elif ext == ".docx":
-        try:
-            from docx import Document
-            doc = Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        except Exception as e:
-            raise RuntimeError(f"Error reading DOCX: {e}")
+        chunks = _iter_docx_paragraphs(source)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
-    return text
 
-# --- Extract Texts from GCS Bucket ---
-def extract_texts_from_gcs(bucket_name, prefix, service_account_json, archive_prefix="archive_cv/"):
+    total_chars = 0
+    for chunk in chunks:
+        if max_chars and total_chars + len(chunk) >= max_chars:
+            yield chunk[:max_chars - total_chars]
+            logger.info(f"Stopped extraction at the {max_chars} character cap.")
+            return
+        total_chars += len(chunk)
+        yield chunk
+
+
+def extract_text_from_file(file_path: str, max_pages: int = None, max_chars: int = None):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in SUPPORTED_RESUME_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {ext}")
     try:
-        client = storage.Client.from_service_account_json(service_account_json)
-        bucket = client.get_bucket(bucket_name)
-        blobs = bucket.list_blobs(prefix=prefix)
-        texts = {}
-        for blob in blobs:
+        return "".join(iter_text_chunks(file_path, ext, max_pages, max_chars))
+    except Exception as e:
+        raise RuntimeError(f"Error reading {ext.lstrip('.').upper()}: {e}")
+
+# --- Resume Discovery ---
+def list_resume_files(directory: str):
+    """
+    Lists supported resume files (PDF, DOCX) in a local directory, sorted by name.
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"Not a directory: {directory}")
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if os.path.splitext(name)[1].lower() in SUPPORTED_RESUME_EXTENSIONS
+    ]
+
+
+def _storage_client(service_account_json=None):
+    if service_account_json:
+        return storage.Client.from_service_account_json(service_account_json)
+    return storage.Client()
+
+
+# --- Extract Texts from GCS Bucket ---
+def _extract_blob_text(bucket, blob, prefix, archive_prefix):
+    """
+    Downloads one blob into memory, extracts its text and, on success, moves
+    it under archive_prefix. A failed move is logged and the text is still
+    returned; the blob stays in place and is picked up again next run.
+    """
+    data = blob.download_as_bytes()
+    ext = os.path.splitext(blob.name)[1].lower()
+    if ext in SUPPORTED_RESUME_EXTENSIONS:
+        text = "".join(iter_text_chunks(io.BytesIO(data), ext))
+    else:
+        text = data.decode("utf-8", errors="replace")
+    if archive_prefix:
+        relative_name = blob.name[len(prefix):] if blob.name.startswith(prefix) else blob.name
+        try:
+            bucket.rename_blob(blob, archive_prefix + relative_name.lstrip("/"))
+        except Exception as e:
+            logger.error(f"Extracted {blob.name} but could not archive it: {e}")
+    return text
+
+
+def iter_texts_from_gcs(
+    bucket_name,
+    prefix,
+    service_account_json=None,
+    archive_prefix="archive_cv/",
+    max_workers=GCS_INGEST_WORKERS,
+    client=None,
+    extensions=None,
+):
+    """
+    Yields (blob_name, text) for every blob under prefix as downloads finish.
+    Downloads run in a bounded thread pool and PDF/DOCX bytes go straight to
+    the extractors. Processed blobs are moved to archive_prefix (None keeps
+    them in place); failed blobs yield "Error: ..." and are not moved.
+    extensions (e.g. SUPPORTED_RESUME_EXTENSIONS) limits which blobs are read.
+    client may be any object with the storage.Client bucket() API, e.g. a
+    stub or a client pointed at a fake GCS server via STORAGE_EMULATOR_HOST.
+    """
+    client = client or _storage_client(service_account_json)
+    bucket = client.bucket(bucket_name)
+    max_workers = max(1, max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcs-ingest")
+    pending = {}
+
+    def drain(return_when):
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            name = pending.pop(future)
             try:
-                content = blob.download_as_text()
-                texts[blob.name] = content
-                logger.info(f"Extracted text from GCS blob: {blob.name}")
+                text = future.result()
+                logger.info(f"Extracted text from GCS blob: {name}")
             except Exception as e:
-                logger.error(f"Error downloading blob {blob.name}: {e}")
-                texts[blob.name] = f"Error: {e}"
-        return texts
+                logger.error(f"Error processing blob {name}: {e}")
+                text = f"Error: {e}"
+            yield name, text
+
+    try:
+        for blob in bucket.list_blobs(prefix=prefix):
+            if blob.name.endswith("/") or (archive_prefix and blob.name.startswith(archive_prefix)):
+                continue
+            if extensions and os.path.splitext(blob.name)[1].lower() not in extensions:
+                continue
+            pending[executor.submit(_extract_blob_text, bucket, blob, prefix, archive_prefix)] = blob.name
+            # Keep at most two downloads per worker in flight (and in memory).
+            if len(pending) >= max_workers * 2:
+                yield from drain(FIRST_COMPLETED)
+        while pending:
+            yield from drain(FIRST_COMPLETED)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_texts_from_gcs(bucket_name, prefix, service_account_json, archive_prefix="archive_cv/"):
+    try:
+        return dict(iter_texts_from_gcs(bucket_name, prefix, service_account_json, archive_prefix))
     except Exception as e:
         logger.exception(f"Exception during GCS extraction: {e}")
-        return {"error": f"Exception during GCS extraction: {e}"}
\ No newline at end of file
+        return {"error": f"Exception during GCS extraction: {e}"}
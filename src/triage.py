@@ -0,0 +1,117 @@
+import os
+import logging
+from typing import Optional
+
+import numpy as np
+
+from src.ontology import mentioned_skills, normalize_term
+from src.scoring import jd_requirements
+from src.semantic import ASPECT_WEIGHTS, jd_matrix, calibrate, embed
+
+# --- Logging Setup ---
+logger = logging.getLogger(__name__)
+
+# --- Environment Setup ---
+# Defaults for /multi_agent_batch; 0 disables the cap. Triage runs when either is set.
+TRIAGE_TOP_K = int(os.getenv("TRIAGE_TOP_K", "0"))
+TRIAGE_MIN_SCORE = float(os.getenv("TRIAGE_MIN_SCORE", "0"))
+# Share of the triage score from JD skill coverage; the rest is text similarity.
+TRIAGE_COVERAGE_WEIGHT = float(os.getenv("TRIAGE_COVERAGE_WEIGHT", "0.6"))
+
+MAX_REPORTED_SKILLS = 10
+
+
+def _skill_coverage(texts: list, skills: dict) -> tuple:
+    """
+    Returns (candidates x skills) 0/1 matrix of JD skills found in each text:
+    either the canonical skill (or an alias) is mentioned, or the JD term
+    itself appears as a phrase.
+    """
+    names = list(skills)
+    found = np.zeros((len(texts), len(names)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        normalized = f" {normalize_term(text)} "
+        mentioned = mentioned_skills(normalized)
+        for column, skill in enumerate(names):
+            if skill in mentioned or f" {skill} " in normalized:
+                found[row, column] = 1.0
+    return names, found
+
+
+def triage_scores(texts: list, jd: dict) -> dict:
+    """
+    Scores raw resume texts against a parsed JD in one pass, without a model:
+    weighted coverage of the JD's skills, and hashed n-gram similarity of each
+    whole resume to the JD's skills, role and overall text (src/semantic.py).
+    Returns arrays "score", "coverage" and "similarity" (0-100), the skill
+    names and the candidates x skills "found" matrix.
+    """
+    requirements = jd_requirements(jd)
+    skills = requirements["skills"]
+    names, found = _skill_coverage(texts, skills)
+    weights = np.array([skills[name] for name in names], dtype=np.float32)
+    if len(names):
+        coverage = found @ weights / weights.sum() * 100
+        coverage_weight = TRIAGE_COVERAGE_WEIGHT
+    else:
+        coverage = np.zeros(len(texts), dtype=np.float32)
+        coverage_weight = 0.0
+
+    aspect_weights = np.array(list(ASPECT_WEIGHTS.values()), dtype=np.float32)
+    similarity = calibrate(embed(texts) @ jd_matrix(jd).T) @ aspect_weights / aspect_weights.sum()
+    score = coverage_weight * coverage + (1 - coverage_weight) * similarity
+    return {"score": score, "coverage": coverage, "similarity": similarity, "skills": names, "found": found}
+
+
+def triage(
+    texts: dict,
+    jd: dict,
+    top_k: Optional[int] = TRIAGE_TOP_K,
+    min_score: Optional[float] = TRIAGE_MIN_SCORE,
+) -> tuple:
+    """
+    Picks the candidates to send through the full pipeline: those scoring at
+    least min_score, capped at the top_k best (0 or None = no cap).
+    texts maps profile_path to extracted text; paths whose text is empty or an
+    extraction error are filtered. Returns (selected paths, best first, and a
+    report dict per path with the triage score, rank and, when filtered, why).
+    When no skills can be read from the JD (e.g. it failed to parse) every
+    score would be near 0, so triage is skipped: all paths are returned in
+    their original order with an empty report.
+    """
+    if not jd_requirements(jd or {})["skills"]:
+        logger.warning(f"Skipping triage of {len(texts)} candidates: the job description has no usable skill requirements.")
+        return list(texts), {}
+    readable = {path: text for path, text in texts.items() if text and not text.startswith("Error")}
+    report = {
+        path: {"selected": False, "reason": "no text could be extracted", "extraction": (text or "")[:200]}
+        for path, text in texts.items() if path not in readable
+    }
+    paths = list(readable)
+    if not paths:
+        return [], report
+
+    scores = triage_scores([readable[path] for path in paths], jd)
+    order = np.argsort(-scores["score"], kind="stable")
+    selected = []
+    for rank, index in enumerate(order, start=1):
+        path = paths[index]
+        score = round(float(scores["score"][index]), 1)
+        missing = [skill for skill, hit in zip(scores["skills"], scores["found"][index]) if not hit]
+        entry = {
+            "selected": True,
+            "rank": rank,
+            "triage_score": score,
+            "skill_coverage": round(float(scores["coverage"][index]), 1),
+            "similarity": round(float(scores["similarity"][index]), 1),
+            "missing_skills": missing[:MAX_REPORTED_SKILLS],
+        }
+        if min_score and score < min_score:
+            entry.update(selected=False, reason=f"triage score {score} below threshold {min_score}")
+        elif top_k and len(selected) >= top_k:
+            entry.update(selected=False, reason=f"ranked {rank}, outside the top {top_k}")
+        else:
+            selected.append(path)
+        report[path] = entry
+    logger.info(f"Triage kept {len(selected)} of {len(texts)} candidates (top_k={top_k}, min_score={min_score}).")
+    return selected, report
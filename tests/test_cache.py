@@ -0,0 +1,58 @@
+import os
+import time
+
+from src.cache import LRUCache, canonical_hash
+
+
+def test_canonical_hash_ignores_key_order():
+    assert canonical_hash({"a": 1, "b": [1, 2]}) == canonical_hash({"b": [1, 2], "a": 1})
+
+
+def test_memory_lru_eviction():
+    cache = LRUCache("test", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_version_mismatch_is_a_miss(tmp_path):
+    cache = LRUCache("test", disk_dir=str(tmp_path))
+    cache.set("a", {"version": "1", "value": 1})
+    assert cache.get("a", version="2") is None
+    assert not os.path.exists(tmp_path / "a.json")
+
+
+def test_disk_entries_survive_restart(tmp_path):
+    LRUCache("test", disk_dir=str(tmp_path)).set("a", {"value": 1})
+    assert LRUCache("test", disk_dir=str(tmp_path)).get("a") == {"value": 1}
+
+
+def test_disk_store_is_bounded_by_entries(tmp_path):
+    cache = LRUCache("test", max_entries=2, disk_dir=str(tmp_path))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    cache.get("a")  # read from disk: a becomes the most recently used file
+    cache.set("c", 3)
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+    assert cache.stats()["disk_entries"] == 2
+
+
+def test_disk_store_is_bounded_by_bytes(tmp_path):
+    cache = LRUCache("test", max_entries=100, disk_dir=str(tmp_path), max_bytes=250)
+    for key in "abcde":
+        cache.set(key, "x" * 100)
+    assert sorted(os.listdir(tmp_path)) == ["d.json", "e.json"]
+    assert cache.stats()["disk_bytes"] <= 250
+
+
+def test_existing_files_are_swept_on_start(tmp_path):
+    for i, key in enumerate("abc"):
+        path = tmp_path / f"{key}.json"
+        path.write_text("1")
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+    LRUCache("test", max_entries=1, disk_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == ["c.json"]
@@ -0,0 +1,61 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.custom_agents import MergeContextAgent
+from src.tools import convert_gh_to_modified_json
+
+
+def make_context(state):
+    return SimpleNamespace(session=SimpleNamespace(state=state), invocation_id="inv-1", branch=None)
+
+
+async def merge(state):
+    agent = MergeContextAgent(name="merge_context_agent")
+    events = [event async for event in agent._run_async_impl(make_context(state))]
+    return json.loads(events[-1].actions.state_delta["merged_context_json"])
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_non_json_output_under_raw_key():
+    merged = await merge({
+        "int_profile_data_json": '```json\n{"name": "Ada", "skills": ["python", "sql"]}\n```',
+        "final_ranking": "Strong candidate, recommend interview.",
+        "screening_status": "screened",
+        "semantic_match": "",
+    })
+
+    assert merged["int_profile_data_json"] == {"name": "Ada", "skills": ["python", "sql"]}
+    assert "final_ranking" not in merged
+    assert merged["raw_final_ranking"] == "Strong candidate, recommend interview."
+    assert merged["screening_status"] == "screened"
+    assert "semantic_match" not in merged
+
+
+@pytest.mark.asyncio
+async def test_non_json_agent_output_still_converts():
+    merged = await merge({
+        "int_profile_data_json": '{"name": "Ada", "skills": ["python"]}',
+        "attribute_scores": "not json at all",
+        "flagged_gaps_json": '{"flagged_issues": ["gap without details", {"issue": "tenure", "severity": "low"}]}',
+    })
+
+    row = convert_gh_to_modified_json(merged)
+
+    assert row["name"] == "Ada"
+    assert row["skills"] == "python"
+    assert row["flagged_issue"] == "tenure"
+    assert row["flagged_issue_severity"] == "low"
+
+
+def test_convert_skips_non_dict_sections():
+    row = convert_gh_to_modified_json({
+        "int_profile_data_json": {"name": "Ada"},
+        "attribute_scores": "oops",
+        "final_ranking": ["not", "a", "dict"],
+        "enriched_profile_json": 42,
+        "flagged_gaps_json": {"flagged_issues": "none"},
+    })
+
+    assert row == {"name": "Ada"}
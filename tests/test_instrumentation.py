@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.instrumentation import PipelineMetricsPlugin
+
+
+def invocation(invocation_id: str):
+    return SimpleNamespace(invocation_id=invocation_id)
+
+
+@pytest.mark.asyncio
+async def test_failed_run_is_recorded_and_forgotten():
+    plugin = PipelineMetricsPlugin()
+    await plugin.before_run_callback(invocation_context=invocation("a"))
+    await plugin.on_run_error_callback(invocation_context=invocation("a"), error=RuntimeError("model down"))
+    assert plugin._runs == {}
+    assert plugin.pop_timings("a")["error"] == "RuntimeError: model down"
+
+
+@pytest.mark.asyncio
+async def test_successful_run_has_totals():
+    plugin = PipelineMetricsPlugin()
+    await plugin.before_run_callback(invocation_context=invocation("a"))
+    await plugin.after_run_callback(invocation_context=invocation("a"))
+    timings = plugin.pop_timings("a")
+    assert "error" not in timings
+    assert timings["total_prompt_tokens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_runs_are_bounded():
+    plugin = PipelineMetricsPlugin(max_active_runs=3)
+    for i in range(5):
+        await plugin.before_run_callback(invocation_context=invocation(str(i)))
+    assert list(plugin._runs) == ["2", "3", "4"]
@@ -0,0 +1,105 @@
+import time
+import asyncio
+
+import pytest
+
+from src.job_queue import JobQueue, JobRunner
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=3, retry_base_seconds=0.05, retry_max_seconds=0.1)
+    yield queue
+    queue.close()
+
+
+class TransientError(RuntimeError):
+    pass
+
+
+def test_claim_serves_priority_lanes_first(queue):
+    bulk = queue.submit({"n": 1}, "bulk")
+    normal = queue.submit({"n": 2})
+    urgent = queue.submit({"n": 3}, "urgent")
+    assert [queue.claim()[0] for _ in range(3)] == [urgent, normal, bulk]
+    assert queue.claim() is None
+
+
+def test_submit_rejects_unknown_priority(queue):
+    with pytest.raises(ValueError):
+        queue.submit({}, "asap")
+
+
+def test_cancel_only_queued_jobs(queue):
+    job_id = queue.submit({})
+    assert queue.cancel(job_id)
+    assert queue.get(job_id)["status"] == "cancelled"
+    running = queue.submit({})
+    queue.claim()
+    assert not queue.cancel(running)
+
+
+def test_release_requeues_without_counting_the_attempt(queue):
+    job_id = queue.submit({})
+    queue.claim()
+    queue.release(job_id)
+    job = queue.get(job_id)
+    assert job["status"] == "queued"
+    assert job["attempts"] == 0
+
+
+def test_retry_backs_off_then_fails_after_max_attempts(queue):
+    job_id = queue.submit({})
+    queue.claim()
+    assert queue.retry(job_id, "quota")
+    job = queue.get(job_id)
+    assert job["status"] == "queued" and job["error"] == "quota"
+    assert queue.claim() is None  # still backing off
+    time.sleep(0.06)
+    assert queue.claim()[0] == job_id
+    assert queue.retry(job_id, "quota", min_delay=0)
+    time.sleep(0.11)
+    queue.claim()
+    assert not queue.retry(job_id, "quota")
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and job["attempts"] == 3
+
+
+def test_stale_running_job_is_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), stale_seconds=0)
+    job_id = queue.submit({})
+    queue.claim()
+    time.sleep(0.01)
+    assert queue.claim()[0] == job_id
+    assert queue.get(job_id)["attempts"] == 2
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_runner_retries_transient_errors_and_fails_others(queue):
+    calls = {"flaky": 0}
+
+    async def handler(payload):
+        if payload["kind"] == "flaky":
+            calls["flaky"] += 1
+            if calls["flaky"] < 3:
+                raise TransientError("model unavailable")
+        if payload["kind"] == "bad":
+            raise ValueError("bad input")
+        return {"ok": payload["kind"]}
+
+    runner = JobRunner(queue, handler, num_workers=2, poll_interval=0.01, is_transient=lambda e: isinstance(e, TransientError))
+    runner.start()
+    try:
+        flaky = await runner.submit({"kind": "flaky"})
+        bad = await runner.submit({"kind": "bad"})
+        for _ in range(200):
+            if queue.get(flaky)["status"] == "succeeded" and queue.get(bad)["status"] == "failed":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await runner.stop()
+    assert queue.get(flaky)["result"] == {"ok": "flaky"}
+    assert queue.get(flaky)["attempts"] == 3
+    assert queue.get(bad)["error"] == "bad input"
+    assert queue.get(bad)["attempts"] == 1
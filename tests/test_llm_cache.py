@@ -0,0 +1,118 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from src.llm_cache import (
+    BYPASS_STATE_KEY,
+    LlmResponseCachePlugin,
+    PENDING_KEY_PREFIX,
+    ResponseStore,
+    request_key,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResponseStore(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=0, max_mb=0)
+    yield store
+    store.close()
+
+
+def make_request(text: str = "hello", temperature=0.0) -> LlmRequest:
+    return LlmRequest(
+        model="fake-llm",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(temperature=temperature, labels={"request": text}),
+    )
+
+
+def make_response(text: str = "world") -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def make_context(state=None):
+    return SimpleNamespace(agent_name="scorer", state=state if state is not None else {})
+
+
+def test_request_key_only_for_temperature_zero():
+    assert request_key("scorer", make_request(temperature=None)) is None
+    assert request_key("scorer", make_request(temperature=0.7)) is None
+    assert request_key("scorer", make_request()) is not None
+
+
+def test_request_key_depends_on_agent_and_contents_but_not_labels():
+    key = request_key("scorer", make_request())
+    assert key == request_key("scorer", make_request())
+    assert key != request_key("ranker", make_request())
+    assert key != request_key("scorer", make_request("other"))
+    relabelled = make_request()
+    relabelled.config.labels = {"request": "different"}
+    assert key == request_key("scorer", relabelled)
+
+
+def test_store_round_trip_and_stats(store):
+    assert store.get("k") is None
+    store.set("k", "scorer", None, "payload")
+    assert store.get("k") == "payload"
+    assert store.stats()["entries"] == 1
+    store.clear()
+    assert store.get("k") is None
+
+
+def test_store_expires_entries(tmp_path):
+    store = ResponseStore(str(tmp_path / "ttl.sqlite3"), ttl_seconds=0.01, max_mb=0)
+    store.set("k", "scorer", None, "payload")
+    time.sleep(0.02)
+    assert store.get("k") is None
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_plugin_replays_stored_response(store):
+    plugin = LlmResponseCachePlugin(store)
+    context = make_context()
+    assert await plugin.before_model_callback(callback_context=context, llm_request=make_request()) is None
+    await plugin.after_model_callback(callback_context=context, llm_response=make_response())
+    assert context.state[PENDING_KEY_PREFIX + "scorer"] is None
+
+    replay = make_context()
+    cached = await plugin.before_model_callback(callback_context=replay, llm_request=make_request())
+    assert cached.content.parts[0].text == "world"
+    assert (plugin.hits, plugin.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_plugin_bypass_refreshes_entry(store):
+    plugin = LlmResponseCachePlugin(store)
+    await plugin.before_model_callback(callback_context=make_context(), llm_request=make_request())
+    context = make_context({BYPASS_STATE_KEY: True})
+    assert await plugin.before_model_callback(callback_context=context, llm_request=make_request()) is None
+    await plugin.after_model_callback(callback_context=context, llm_response=make_response("fresh"))
+    cached = await plugin.before_model_callback(callback_context=make_context(), llm_request=make_request())
+    assert cached.content.parts[0].text == "fresh"
+    assert plugin.bypassed == 1
+
+
+@pytest.mark.asyncio
+async def test_plugin_skips_errors_and_clears_pending_key(store):
+    plugin = LlmResponseCachePlugin(store)
+    context = make_context()
+    await plugin.before_model_callback(callback_context=context, llm_request=make_request())
+    await plugin.on_model_error_callback(callback_context=context, llm_request=make_request(), error=RuntimeError("429"))
+    assert context.state[PENDING_KEY_PREFIX + "scorer"] is None
+
+    await plugin.before_model_callback(callback_context=context, llm_request=make_request())
+    await plugin.after_model_callback(callback_context=context, llm_response=LlmResponse(error_code="500"))
+    assert store.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_plugin_disabled_without_store():
+    plugin = LlmResponseCachePlugin(None)
+    context = make_context()
+    assert await plugin.before_model_callback(callback_context=context, llm_request=make_request()) is None
+    assert context.state == {}
+    assert plugin.stats()["enabled"] is False
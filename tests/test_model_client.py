@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.models.base_llm import BaseLlm
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from src.model_client import (
+    CircuitBreaker,
+    ModelCallLimiter,
+    ModelUnavailableError,
+    RateLimitedLlm,
+    TokenBucket,
+    is_transient_error,
+    retry_reason,
+)
+
+
+def api_error(code: int, retry_delay: str = ""):
+    details = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": retry_delay}] if retry_delay else []
+    error_class = genai_errors.ServerError if code >= 500 else genai_errors.ClientError
+    return error_class(code, {"error": {"code": code, "message": "test", "details": details}})
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    Raises or answers per call from outcomes, in order.
+    """
+
+    outcomes: list = []
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=outcome)]))
+
+
+def limited(outcomes: list, **options) -> RateLimitedLlm:
+    options = {"rpm": 0, "tpm": 0, "retry_base_seconds": 0.001, "retry_max_seconds": 0.01, **options}
+    return RateLimitedLlm(model="scripted", llm=ScriptedLlm(model="scripted", outcomes=outcomes), limiter=ModelCallLimiter(**options))
+
+
+async def call(llm: RateLimitedLlm) -> list:
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+    return [response async for response in llm.generate_content_async(request)]
+
+
+def test_retry_reason():
+    assert retry_reason(api_error(429)) == "429"
+    assert retry_reason(api_error(503)) == "503"
+    assert retry_reason(api_error(400)) is None
+    assert retry_reason(asyncio.TimeoutError()) == "timeout"
+    assert retry_reason(ValueError()) is None
+
+
+def test_is_transient_error_follows_the_exception_chain():
+    assert is_transient_error(ModelUnavailableError("open", retry_after=1))
+    try:
+        try:
+            raise api_error(503)
+        except Exception as e:
+            raise RuntimeError("Agent execution failed") from e
+    except RuntimeError as wrapped:
+        assert is_transient_error(wrapped)
+    assert not is_transient_error(RuntimeError("bad input"))
+
+
+def test_backoff_honours_server_retry_delay():
+    limiter = ModelCallLimiter(retry_base_seconds=0.001, retry_max_seconds=30)
+    assert limiter.backoff(0, api_error(429, "12s")) == 12
+    assert limiter.backoff(0, api_error(429)) <= 0.001
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(threshold=2, cooldown_seconds=0)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    breaker.check()  # cooldown over: one half-open trial call
+    assert breaker.state == "half_open"
+    with pytest.raises(ModelUnavailableError):
+        breaker.check()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_beyond_burst():
+    bucket = TokenBucket("requests", per_minute=600, burst_seconds=0.1)
+    assert await bucket.acquire() < 0.01
+    assert await bucket.acquire() > 0.05
+    assert await TokenBucket("off", per_minute=0).acquire(100) == 0
+
+
+@pytest.mark.asyncio
+async def test_retries_retryable_errors():
+    llm = limited([api_error(429), api_error(503), "ok"])
+    responses = await call(llm)
+    assert responses[0].content.parts[0].text == "ok"
+    assert llm.limiter.retries == 2
+    assert llm.llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors():
+    llm = limited([api_error(400), "ok"])
+    with pytest.raises(genai_errors.ClientError):
+        await call(llm)
+    assert llm.llm.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_raise_model_unavailable():
+    llm = limited([api_error(503)], max_retries=2, breaker_threshold=0)
+    with pytest.raises(ModelUnavailableError) as raised:
+        await call(llm)
+    assert isinstance(raised.value.__cause__, genai_errors.ServerError)
+    assert llm.llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    llm = limited([api_error(503)], max_retries=5, breaker_threshold=2, breaker_cooldown_seconds=60)
+    with pytest.raises(ModelUnavailableError):
+        await call(llm)
+    assert llm.llm.calls == 2
+    assert llm.limiter.breaker.state == "open"
@@ -0,0 +1,46 @@
+import pytest
+
+from src.ontology import canonical_skill, education_level, split_terms
+
+
+@pytest.mark.parametrize(
+    "text, level",
+    [
+        ("B.S. Computer Science", 3),
+        ("BSc in Mechanical Engineering", 3),
+        ("B.E. Electrical", 3),
+        ("Master's in CS", 4),
+        ("Master of Business Administration", 4),
+        ("MS Computer Science", 4),
+        ("M.A. Economics", 4),
+        ("Ph.D. Physics", 5),
+        ("High School Diploma", 1),
+    ],
+)
+def test_education_level_degrees(text, level):
+    assert education_level(text) == level
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Master Welder", "Must be able to lift 50 lbs", "Proficient in MS Office", "Welding Technology"],
+)
+def test_education_level_ignores_non_degrees(text):
+    assert education_level(text) == 0
+
+
+def test_split_terms_on_delimiters():
+    assert split_terms("Python, Go; Kubernetes\nDocker / Terraform") == ["Python", "Go", "Kubernetes", "Docker", "Terraform"]
+
+
+def test_split_terms_keeps_known_slash_skills():
+    assert split_terms(["CI/CD", "PL/SQL, Java"]) == ["CI/CD", "PL/SQL", "Java"]
+
+
+def test_split_terms_skips_empty_values():
+    assert split_terms([None, "", " , Python"]) == ["Python"]
+
+
+def test_canonical_skill_resolves_aliases():
+    assert canonical_skill("GMAW") == "mig welding"
+    assert canonical_skill(" Node.JS ") == canonical_skill("nodejs")
@@ -0,0 +1,50 @@
+import json
+
+from src import projections
+from src.projections import PROJECTION_MAX_ITEMS, jd_for_scoring, profile_for_scoring, project
+
+
+def test_project_keeps_spec_fields_and_caps_strings():
+    value = {"summary": "word " * 100, "secret": "x", "skills": ["Python"]}
+    projected = project(value, {"summary": 20, "skills": True})
+    assert set(projected) == {"summary", "skills"}
+    assert projected["summary"].endswith("...") and len(projected["summary"]) <= 23
+
+
+def test_project_drops_empty_values():
+    assert project({"a": "", "b": [], "c": {}, "d": None, "e": 0}) == {"e": 0}
+
+
+def test_scoring_lists_are_never_item_capped():
+    count = PROJECTION_MAX_ITEMS + 5
+    state = {
+        "int_profile_data_json": {
+            "skills": [f"skill {i}" for i in range(count)],
+            "certifications": [{"name": f"cert {i}"} for i in range(count)],
+            "experience": [{"job_title": f"role {i}"} for i in range(count)],
+        },
+        "jd_json": {"requirements": [f"requirement {i}" for i in range(count)], "perks": list(range(count))},
+    }
+    profile = json.loads(profile_for_scoring(state))
+    assert len(profile["skills"]) == count
+    assert len(profile["certifications"]) == count
+    assert len(profile["experience"]) == count
+    jd = json.loads(jd_for_scoring(state))
+    assert len(jd["requirements"]) == count
+    assert len(jd["perks"]) == PROJECTION_MAX_ITEMS
+
+
+def test_item_limit_override(monkeypatch):
+    monkeypatch.setattr(projections, "ITEM_LIMITS", {"profile_for_scoring.skills": 2})
+    state = {"int_profile_data_json": {"skills": ["a", "b", "c"]}}
+    assert json.loads(profile_for_scoring(state))["skills"] == ["a", "b"]
+
+
+def test_parse_limits():
+    limits, item_limits = projections._parse_limits("a.b=0, c[]=3, bad=x")
+    assert limits == {"a.b": 0}
+    assert item_limits == {"c": 3}
+
+
+def test_unparseable_view_passes_text_through():
+    assert profile_for_scoring({"int_profile_data_json": "not json"}) == "not json"
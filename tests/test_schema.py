@@ -0,0 +1,15 @@
+import pytest
+from pydantic import ValidationError
+
+from src.schema import Batch_Inputs
+
+
+@pytest.mark.parametrize("value", [0, -1, 65])
+def test_batch_max_concurrency_out_of_range_is_rejected(value):
+    with pytest.raises(ValidationError):
+        Batch_Inputs(job_description={}, max_concurrency=value)
+
+
+def test_batch_max_concurrency_defaults_to_none():
+    assert Batch_Inputs(job_description={}).max_concurrency is None
+    assert Batch_Inputs(job_description={}, max_concurrency=4).max_concurrency == 4
@@ -0,0 +1,50 @@
+from src.scoring import candidate_facts, jd_requirements, score_profile
+
+WELDER_PROFILE = {
+    "skills": "MIG welding, TIG welding; Blueprint reading",
+    "education": [{"degree": "B.S. Welding Engineering"}],
+    "experience": [{"job_title": "Welder", "start_year": "2015", "end_year": "2023"}],
+    "certifications": [{"name": "AWS Certified Welder"}],
+}
+
+
+def test_jd_requirements_splits_delimited_skill_strings():
+    requirements = jd_requirements({"skills": "MIG welding, TIG welding / Stick welding"})
+    assert set(requirements["skills"]) == {"mig welding", "tig welding", "stick welding"}
+    assert requirements["unparsed"] == []
+
+
+def test_jd_requirements_years_and_education():
+    requirements = jd_requirements({"experience": "3+ years of welding", "education": "Bachelor's degree"})
+    assert requirements["min_years"] == 3
+    assert requirements["education_level"] == 3
+
+
+def test_candidate_facts_splits_skill_string():
+    facts = candidate_facts(WELDER_PROFILE)
+    assert {"mig welding", "tig welding", "blueprint reading"} <= facts["skills"]
+    assert facts["education_level"] == 3
+    assert facts["years"] >= 8
+
+
+def test_score_profile_full_match():
+    jd = {"skills": ["MIG welding", "TIG welding"], "experience": "5 years", "education": "B.S."}
+    scores, details = score_profile(WELDER_PROFILE, jd)
+    assert scores["attribute_scores"]["skill_match"] == 100
+    assert scores["attribute_scores"]["overall_fit"] == 100
+    assert details["confident"]
+
+
+def test_score_profile_reports_missing_skills():
+    scores, details = score_profile(WELDER_PROFILE, {"skills": ["MIG welding", "Python"]})
+    assert scores["attribute_scores"]["skill_match"] == 50
+    assert details["missing"]["skills"] == ["python"]
+
+
+def test_score_profile_without_requirements_is_consistent():
+    scores, details = score_profile(WELDER_PROFILE, {})
+    attribute_scores = scores["attribute_scores"]
+    assert attribute_scores["overall_fit"] == 100
+    assert all(value == 100 for value in attribute_scores.values())
+    assert not details["confident"]
+    assert "no requirements recognised in the job description" in details["fallback_reasons"]
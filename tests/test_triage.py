@@ -0,0 +1,41 @@
+from src.triage import triage
+
+JD = {"title": "Welder", "skills": ["MIG welding", "TIG welding", "Blueprint reading"]}
+TEXTS = {
+    "strong.pdf": "Welder with 8 years of MIG welding, TIG welding and blueprint reading.",
+    "partial.pdf": "Fabricator experienced in MIG welding.",
+    "unrelated.pdf": "Accountant skilled in payroll and tax returns.",
+    "broken.pdf": "Error: EOF marker not found",
+}
+
+
+def test_triage_ranks_by_skill_coverage():
+    selected, report = triage(TEXTS, JD, top_k=0, min_score=0)
+    assert selected == ["strong.pdf", "partial.pdf", "unrelated.pdf"]
+    assert report["strong.pdf"]["rank"] == 1
+    assert report["strong.pdf"]["skill_coverage"] == 100.0
+    assert "tig welding" in report["partial.pdf"]["missing_skills"]
+
+
+def test_triage_filters_unreadable_text():
+    _selected, report = triage(TEXTS, JD, top_k=0, min_score=0)
+    assert report["broken.pdf"]["selected"] is False
+    assert report["broken.pdf"]["reason"] == "no text could be extracted"
+
+
+def test_triage_top_k_and_min_score():
+    selected, report = triage(TEXTS, JD, top_k=1, min_score=0)
+    assert selected == ["strong.pdf"]
+    assert "outside the top 1" in report["partial.pdf"]["reason"]
+
+    min_score = report["partial.pdf"]["triage_score"] + 0.1
+    selected, report = triage(TEXTS, JD, top_k=0, min_score=min_score)
+    assert selected == ["strong.pdf"]
+    assert "below threshold" in report["unrelated.pdf"]["reason"]
+
+
+def test_triage_skipped_without_jd_requirements(caplog):
+    selected, report = triage(TEXTS, {}, top_k=1, min_score=50)
+    assert selected == list(TEXTS)
+    assert report == {}
+    assert "Skipping triage" in caplog.text